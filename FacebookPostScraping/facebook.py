@@ -1,12 +1,37 @@
 import requests
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from jsonpath_ng import parse
 import json
 import os
+from utils import Paginator
+
+def _slice_iso_timestamp(timestamp):
+    """'d-m-Y H:M:S' for 'YYYY-MM-DDTHH:MM:SS' (optionally +00:00/+0000), sliced without parsing"""
+    if len(timestamp) < 19 or timestamp[19:] not in ("", "+00:00", "+0000"):
+        return None
+    if (timestamp[4] != "-" or timestamp[7] != "-" or timestamp[10] not in "T " or timestamp[13] != ":"
+            or timestamp[16] != ":"):
+        return None
+    year, month, day, clock = timestamp[0:4], timestamp[5:7], timestamp[8:10], timestamp[11:19]
+    digits = year + month + day + clock[0:2] + clock[3:5] + clock[6:8]
+    if (not (digits.isascii() and digits.isdigit()) or year < "1000" or clock > "23:59:59"
+            or clock[3] > "5" or clock[6] > "5"):
+        return None
+    try:
+        date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+    return f"{day}-{month}-{year} {clock}"
+
 
+@lru_cache(maxsize=4096)
 def convert_timestamp_to_datetime(timestamp):
     if isinstance(timestamp, str):
         # If the timestamp is in string format, assume it's in ISO 8601 format
+        formatted = _slice_iso_timestamp(timestamp)
+        if formatted:
+            return formatted
         try:
             dt_object = datetime.fromisoformat(timestamp)  # Adjust to your timestamp format if needed
             return dt_object.strftime("%d-%m-%Y %H:%M:%S")
@@ -43,6 +68,8 @@ headers = {
 }
 querystring = {"page_id": "100063581806550"}
 
+# Stops on repeated cursors and on pages with no (new) posts, not only on a missing cursor
+posts_pages = Paginator(150)
 for i in range(150):
     response = requests.get(posts_url, headers=headers, params=querystring)
 
@@ -85,6 +112,7 @@ for i in range(150):
             if post_id:
                 # Initialize the cursor for pagination
                 comments_cursor = None
+                comment_pages = Paginator(None)
 
                 # Fetch comments for the post, with pagination handling
                 while True:
@@ -128,8 +156,10 @@ for i in range(150):
                             document["news"][0]["comments"].append(comment_obj)
 
                         # Check if there is a next page of comments
-                        comments_cursor = comments_data.get("cursor")
+                        comments_cursor = comment_pages.advance(
+                            comments_data.get("cursor"), [comment.value.get("comment_id") for comment in matches])
                         if not comments_cursor:
+                            print(f"Comments for Post ID {post_id} stopped: {comment_pages.stop_reason}")
                             break  # No more comments to fetch
                     else:
                         print(f"Error fetching comments for Post ID {post_id}: {comment_response.status_code}")
@@ -140,11 +170,11 @@ for i in range(150):
             print(f"Processed Post ID: {d.get('post_id')}")
 
         # Check for the cursor to fetch the next set of data
-        cursor = json_data.get("cursor")
+        cursor = posts_pages.advance(json_data.get("cursor"), [d.get("post_id") for d in extracted_data])
         if cursor:
             querystring["cursor"] = cursor
         else:
-            print("No more data available.")
+            print(f"No more data available: {posts_pages.stop_reason}")
             break
 
     else:
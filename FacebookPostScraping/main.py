@@ -1,10 +1,12 @@
 import requests
 from jsonpath_ng import parse
 from datetime import datetime
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 load_dotenv()
 import csv
+from utils import Paginator
 url = "https://facebook-scraper3.p.rapidapi.com/page/posts"
 
 querystring = {"page_id": "100006654819971"}
@@ -14,12 +16,14 @@ headers = {
     "x-rapidapi-host": "facebook-scraper3.p.rapidapi.com",
 }
 
+@lru_cache(maxsize=4096)  # posts and comments often share a timestamp
 def convert_timestamp_to_datetime(timestamp):
     # Convert the timestamp to a datetime object
     dt_object = datetime.fromtimestamp(timestamp)
     # Format the datetime object into the desired format
     return dt_object.strftime("%d-%m-%Y %H:%M:%S")
 
+posts_pages = Paginator(5)
 for i in range(5):
     response = requests.get(url, headers=headers, params=querystring)
 
@@ -68,11 +72,11 @@ for i in range(5):
             # es.index(index="jharkhand_raw_data", id=d.get("post_id"), body=document, op_type='index')
 
         # Check for cursor to fetch the next set of data
-        cursor = json_data.get("cursor")
+        cursor = posts_pages.advance(json_data.get("cursor"), [d.get("post_id") for d in extracted_data])
         if cursor:
             querystring["cursor"] = cursor  # Add the cursor to the query for the next request
         else:
-            print("No more data available.")
+            print(f"No more data available: {posts_pages.stop_reason}")
             break
     else:
         print(f"Error: Received status code {response.status_code}")
@@ -0,0 +1,55 @@
+# tests/test_facebook_user_ids.py
+
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utils import ScrapingUtils
+
+USERS = {"someone": "1001"}
+
+
+def lookup(usernames):
+    requests = []
+
+    async def user(request):
+        username = request.query["username"]
+        requests.append(username)
+        if username.lower() not in USERS:
+            return web.json_response({"error": "Not Found"}, status=404)
+        return web.json_response({"result": {"data": {"user": {"result": {"rest_id": USERS[username.lower()]}}}}})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/user", user)
+        async with TestServer(app) as server:
+            async with ScrapingUtils() as utils:
+                utils.headers = {}
+                utils.user_lookup_url = str(server.make_url("/user"))
+                ids, sessions = [], []
+                for username in usernames:
+                    ids.append(await utils.get_user_id_from_twitter(username))
+                    sessions.append(utils._session)
+        return ids, requests, sessions
+
+    return asyncio.run(run())
+
+
+def test_lookups_are_cached_per_username():
+    ids, requests, _ = lookup(["someone", "SomeOne", "someone"])
+    assert ids == ["1001", "1001", "1001"]
+    assert requests == ["someone"]
+
+
+def test_failed_lookups_are_not_cached():
+    ids, requests, _ = lookup(["missing", "missing"])
+    assert ids == [None, None]
+    assert requests == ["missing", "missing"]
+
+
+def test_one_session_is_reused_and_closed():
+    _, requests, sessions = lookup(["someone", "missing"])
+    assert len(requests) == 2
+    assert sessions[0] is sessions[1]
+    assert sessions[0].closed
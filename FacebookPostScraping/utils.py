@@ -3,23 +3,90 @@ import re
 from datetime import datetime
 import aiohttp
 from jsonpath_ng import jsonpath, parse
-import requests
 from typing import Dict, Union, List
 
+class Paginator:
+    """
+    Stops a posts or comments cursor chain when the API keeps handing out a
+    cursor with nothing behind it. ``advance(cursor, ids)`` takes the cursor
+    and item ids of the page just fetched and returns the cursor to request
+    next, or None when there is no cursor, the cursor was seen before, two
+    pages in a row were empty or only repeated ids, or ``max_pages`` pages
+    were fetched (None for no limit). The reason is kept in ``stop_reason``.
+    """
+
+    def __init__(self, max_pages, max_empty_pages=2, max_stale_pages=2):
+        self.max_pages = max_pages
+        self.pages = 0
+        self.max_empty_pages = max(1, max_empty_pages)
+        self.max_stale_pages = max(1, max_stale_pages)
+        self.cursors = set()
+        self.ids = set()
+        self.empty_run = 0
+        self.stale_run = 0
+        self.stop_reason = None
+
+    def advance(self, cursor, ids):
+        if self.stop_reason:
+            return None
+        self.pages += 1
+        ids = list(ids)
+        if not ids:
+            self.empty_run += 1
+            if self.empty_run >= self.max_empty_pages:
+                return self.stop("empty_pages")
+        else:
+            self.empty_run = 0
+            new_ids = [item for item in ids if item is None or item not in self.ids]
+            self.ids.update(item for item in new_ids if item is not None)
+            self.stale_run = 0 if new_ids else self.stale_run + 1
+            if self.stale_run >= self.max_stale_pages:
+                return self.stop("no_new_ids")
+        if not cursor:
+            return self.stop("end_of_results")
+        if cursor in self.cursors:
+            return self.stop("repeated_cursor")
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return self.stop("max_pages")
+        self.cursors.add(cursor)
+        return cursor
+
+    def stop(self, reason):
+        if self.stop_reason is None:
+            self.stop_reason = reason
+        return None
+
+
 class ScrapingUtils:
+    user_lookup_url = "https://twitter241.p.rapidapi.com/user"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_session()
+
     async def make_async_requests(self, url, headers, params):
-        """Makes asynchronous requests to the provided URL."""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                try:
-                    response_text = await response.text()
-                    return await response.json()
-                except aiohttp.client_exceptions.ContentTypeError as e:
-                    print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
-                    return None
-                except Exception as e:
-                    print(f"Error: {e}")
-                    return None
+        """Makes asynchronous requests to the provided URL over one reused session."""
+        session = getattr(self, '_session', None)
+        if session is None or session.closed:
+            session = self._session = aiohttp.ClientSession()
+        async with session.get(url, headers=headers, params=params) as response:
+            try:
+                return await response.json()
+            except aiohttp.client_exceptions.ContentTypeError as e:
+                print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
+                return None
+            except Exception as e:
+                print(f"Error: {e}")
+                return None
+
+    async def close_session(self):
+        """Closes the session opened by make_async_requests."""
+        session = getattr(self, '_session', None)
+        if session is not None and not session.closed:
+            await session.close()
+        self._session = None
 
     @staticmethod
     def j_extract(json_data, path, default=None) -> List:
@@ -79,28 +146,28 @@ class ScrapingUtils:
         dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %z %Y")
         return dt.strftime("%d-%m-%Y %H:%M:%S")
 
-    def get_user_id_from_twitter(self, username):
+    async def get_user_id_from_twitter(self, username):
         """
         Retrieves the user ID from Twitter using a public API (e.g., RapidAPI).
+        Found IDs are cached per username for the lifetime of this object.
         :param username: The Twitter username.
         :return: The user ID or None if not found.
         """
-        url = "https://twitter241.p.rapidapi.com/user"
+        user_ids = getattr(self, '_user_ids', None)
+        if user_ids is None:
+            user_ids = self._user_ids = {}
+        if username.lower() in user_ids:
+            return user_ids[username.lower()]
         querystring = {"username": username}
-        response = requests.get(url, headers=self.headers, params=querystring)
-        if response.status_code == 200:
-            data = response.json()
-            try:
-                rest_id = data['result']['data']['user']['result']['rest_id']
-                print(f"User ID (rest_id) for {username}: {rest_id}")
-                return rest_id
-            except KeyError as e:
-                print(f"Key error: {e} - Expected key path was not found in the response.")
-                return None
-        else:
-            print(f"Failed to get user info for {username}, status code: {response.status_code}")
-            print(f"Response: {response.text}")
+        data = await self.make_async_requests(self.user_lookup_url, self.headers, querystring)
+        try:
+            rest_id = data['result']['data']['user']['result']['rest_id']
+        except (KeyError, TypeError) as e:
+            print(f"Failed to get user info for {username}: {e} - Expected key path was not found in the response.")
             return None
+        print(f"User ID (rest_id) for {username}: {rest_id}")
+        user_ids[username.lower()] = rest_id
+        return rest_id
 
     def remove_tags_and_links(self, text):
         """
@@ -1,12 +1,23 @@
 import csv
 from newsapi import NewsApiClient
 import jsonpath
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 
 newsapi = NewsApiClient(api_key='')
 
 
+@lru_cache(maxsize=4096)
 def convert_iso_to_custom_format(iso_date):
+    # NewsAPI's 'YYYY-MM-DDTHH:MM:SSZ' is sliced directly; anything else goes through fromisoformat
+    if (len(iso_date) == 20 and iso_date[19] == "Z" and iso_date[4] == "-" and iso_date[7] == "-"
+            and iso_date[10] == "T" and iso_date[13] == ":" and iso_date[16] == ":"):
+        year, month, day, clock = iso_date[0:4], iso_date[5:7], iso_date[8:10], iso_date[11:19]
+        digits = year + month + day + clock[0:2] + clock[3:5] + clock[6:8]
+        if (digits.isascii() and digits.isdigit() and year >= "1000" and clock <= "23:59:59"
+                and clock[3] <= "5" and clock[6] <= "5"):
+            date(int(year), int(month), int(day))  # raises ValueError for invalid dates, like fromisoformat
+            return f"{day}-{month}-{year} {clock}"
     dt = datetime.fromisoformat(iso_date.replace("Z", "+00:00"))
     return dt.strftime("%d-%m-%Y %H:%M:%S")
 
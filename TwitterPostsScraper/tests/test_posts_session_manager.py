@@ -0,0 +1,32 @@
+# tests/test_posts_session_manager.py
+
+import asyncio
+
+from utils import ScrapingUtils, SessionManager
+
+
+def test_one_session_until_closed():
+    async def run():
+        manager = SessionManager(limit=5, limit_per_host=2)
+        first = await manager.get_session()
+        assert await manager.get_session() is first
+        assert first.connector.limit == 5 and first.connector.limit_per_host == 2
+        await manager.close()
+        assert first.closed
+        second = await manager.get_session()
+        assert second is not first
+        await manager.close()
+        assert second.closed
+
+    asyncio.run(run())
+
+
+def test_scraping_utils_share_one_session():
+    async def run():
+        utils = ScrapingUtils()
+        first = await utils._get_session()
+        assert await utils._get_session() is first
+        await utils.close_session()
+        assert first.closed
+
+    asyncio.run(run())
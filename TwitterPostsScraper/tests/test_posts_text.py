@@ -0,0 +1,43 @@
+# tests/test_posts_text.py
+
+import re
+
+import pytest
+
+from updated_main import TwitterScraper
+from utils import clean_tweet_text
+
+TEXTS = [
+    "",
+    "   ",
+    "plain ascii text",
+    "RT @someone: Hello @user #tag https://t.co/abc world",
+    "email@example.com and @ alone",
+    "@user_1@user_2 @Ñandú",
+    "http://example.com/x https://t.co/q\nnext line https://t.co/end",
+    "https://t.co/ trailing link and https://t.co",
+    "tabs\tand\r\nnewlines\n\n  and\xa0nbsp\u3000ideographic",
+    "混合 текст 🙂 @ユーザー https://t.co/日本",
+]
+
+
+def old_remove_tags_and_links(text):
+    """TwitterScraper.remove_tags_and_links before the cached cleaner"""
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'https://t\.co/\S+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = text.replace("\n", " ").replace("\xa0", " ")
+    return text.strip()
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_the_old_cleaner(text):
+    assert clean_tweet_text(text) == old_remove_tags_and_links(text)
+    assert TwitterScraper("https://example.invalid", {}).remove_tags_and_links(text) == old_remove_tags_and_links(text)
+
+
+def test_non_strings_still_raise():
+    with pytest.raises(TypeError):
+        old_remove_tags_and_links(None)
+    with pytest.raises(TypeError):
+        clean_tweet_text(None)
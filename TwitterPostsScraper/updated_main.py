@@ -1,4 +1,3 @@
-import requests
 import json
 import asyncio
 from datetime import datetime
@@ -6,43 +5,25 @@ import aiohttp
 import os
 import csv
 import re
-from utils import ScrapingUtils
+from utils import Paginator, ScrapingUtils, TimelineResolver, UserIdResolver, clean_tweet_text
 
 class TwitterScraper(ScrapingUtils):
 
-    def __init__(self, base_url, headers):
+    def __init__(self, base_url, headers, max_concurrent_users=3):
         self.base_url = base_url
         self.headers = headers
+        self.timelines = TimelineResolver()  # remembers where the endpoint puts its entries
+        # username -> rest_id, cached on disk between runs
+        self.user_ids = UserIdResolver(lambda url, params: self.make_async_requests(url, self.headers, params))
+        self.max_concurrent_users = max(1, max_concurrent_users)  # profiles crawled at the same time
 
     def remove_tags_and_links(self, text):
-        text = re.sub(r'@\w+', '', text)
-        text = re.sub(r'https://t\.co/\S+', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        text = text.replace("\n", " ").replace("\xa0", " ")
-        return text.strip()
-
-    def get_user_id_from_twitter(self, username):
-        url = "https://twitter241.p.rapidapi.com/user"
-        querystring = {"username": username}
-
-        response = requests.get(url, headers=self.headers, params=querystring)
-        if response.status_code == 200:
-            # Print the JSON response
-            data = response.json()
-            # print(f"JSON response for {username}: {data}")  # Added print statement to show the entire JSON
-
-            try:
-                rest_id = data['result']['data']['user']['result']['rest_id']
-                print(f"User ID (rest_id) for {username}: {rest_id}")
-                return rest_id
-            except KeyError as e:
-                print(f"Key error: {e} - Expected key path was not found in the response.")
-                return None
-        else:
-            print(f"Failed to get user info for {username}, status code: {response.status_code}")
-            print(f"Response: {response.text}")
-            return None
+        return clean_tweet_text(text)
 
+    async def get_user_id_from_twitter(self, username):
+        rest_id = await self.user_ids.resolve(username)
+        self.user_ids.save()
+        return rest_id
 
     async def search_tweets(self, querystring, cursor=None):
         if cursor:
@@ -68,12 +49,13 @@ class TwitterScraper(ScrapingUtils):
     async def process_user(self, user_id, username):
         querystring = {"user": user_id, "count": "100"}
         cursor = None
+        paginator = Paginator(2)
         for k in range(2):
             content_json = await self.search_tweets(querystring, cursor)
-            cursor = self.j_extract_first(content_json, "cursor.bottom")
-            content_json_filtered = self.j_extract(content_json, "result.timeline.instructions[1].entries.*")
-            if not content_json_filtered:
-                content_json_filtered = self.j_extract_first(content_json, "result.timeline.instructions[0].entries")
+            content_json_filtered = self.timelines.entries("user_tweets", content_json)
+            cursor = paginator.advance(self.j_extract_first(content_json, "cursor.bottom"),
+                                       [entry.get("entryId") for entry in content_json_filtered or []
+                                        if not (entry.get("entryId") or "").startswith("cursor-")])
 
             if content_json_filtered:
                 for entry in content_json_filtered[:-1]:
@@ -99,10 +81,12 @@ class TwitterScraper(ScrapingUtils):
             else:
                 # If content_json_filtered is None, print a message and break the loop
                 print("No tweets found or issue with content structure.")
+                paginator.stop("no_entries")
                 break
 
             if cursor is None:
                 break
+        print(f"User {username} stopped after {paginator.pages} pages: {paginator.stop_reason}")
 
 
     def extract_tweet_data(self, entry):
@@ -133,10 +117,28 @@ class TwitterScraper(ScrapingUtils):
         return None
 
     async def main(self, usernames):
-        for username in usernames:
-            user_id = self.get_user_id_from_twitter(username)
-            if user_id:
-                await self.process_user(user_id, username)
+        """Look every username up concurrently and crawl each profile as soon as its id resolves"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_users)
+
+        async def crawl(user_id, username):
+            async with semaphore:
+                try:
+                    await self.process_user(user_id, username)
+                except Exception as e:
+                    print(f"Error processing user {username}: {e}")
+
+        tasks = []
+        try:
+            async for username, user_id in self.user_ids.resolve_many(usernames):
+                if user_id:
+                    tasks.append(asyncio.create_task(crawl(user_id, username)))
+                else:
+                    print(f"Failed to get user ID for {username}")
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.close_session()
 
 if __name__ == "__main__":
     headers = {
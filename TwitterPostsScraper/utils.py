@@ -1,29 +1,427 @@
+import asyncio
 import html
+import json
+import os
 import re
-from datetime import datetime
+import time
+from datetime import date, datetime
+from functools import lru_cache
 import aiohttp
 from jsonpath_ng import jsonpath, parse
 # import hjson
-from jsonpath import jsonpath
+from jsonpath import jsonpath, normalize
 from typing import Dict, Union, List
+
+
+# j_extract / j_extract_first are called for every field of every tweet, so
+# each path is compiled once: plain keys and indexes become dict/list
+# lookups, "*" and ".." become generators yielding what jsonpath would, in
+# the same order. Other syntax is handed to jsonpath unchanged.
+_PATH_SEGMENT_RE = re.compile(r"^(?:\*|\.\.|[A-Za-z0-9_\-]+)$")
+_NO_MATCH = object()
+
+
+def _lookup(obj, steps):
+    for key, index in steps:
+        if isinstance(obj, dict):
+            if key not in obj:
+                return _NO_MATCH
+            obj = obj[key]
+        elif isinstance(obj, list) and index is not None and index < len(obj):
+            obj = obj[index]
+        else:
+            return _NO_MATCH
+    return obj
+
+
+def _children(obj):
+    if isinstance(obj, dict):
+        return obj.values()
+    if isinstance(obj, list):
+        return obj
+    return ()
+
+
+def _path_steps(segments):
+    return tuple((key, int(key) if key.isdigit() else None) for key in segments)
+
+
+def _chain(segments):
+    if not segments:
+        return lambda obj: iter((obj,))
+
+    head = segments[0]
+    if head == "*":
+        rest = _chain(segments[1:])
+
+        def wildcard(obj):
+            for child in _children(obj):
+                yield from rest(child)
+        return wildcard
+
+    if head == "..":
+        rest = _chain(segments[1:])
+
+        def descend(obj):
+            yield from rest(obj)
+            for child in _children(obj):
+                yield from descend(child)
+        return descend
+
+    run = 0
+    while run < len(segments) and segments[run] not in ("*", ".."):
+        run += 1
+    steps = _path_steps(segments[:run])
+    rest = _chain(segments[run:])
+
+    def lookup(obj):
+        value = _lookup(obj, steps)
+        if value is not _NO_MATCH:
+            yield from rest(value)
+    return lookup
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path):
+    """(direct lookup steps or None, match generator), or None if jsonpath must handle it"""
+    cleaned = normalize(path)
+    if cleaned.startswith("$;"):
+        cleaned = cleaned[2:]
+    segments = cleaned.split(";")
+    if not all(_PATH_SEGMENT_RE.match(segment) for segment in segments):
+        return None
+    plain = all(segment not in ("*", "..") for segment in segments)
+    return (_path_steps(segments) if plain else None), _chain(segments)
+
+
+def find_all(obj, path, first_only=False):
+    """Same result as jsonpath(obj, path): a list of matches or False"""
+    if not path:
+        return False
+    compiled = compile_path(path)
+    if compiled is None:
+        result = jsonpath(obj, path)
+        return result[:1] if first_only and result else result
+    if not obj:
+        return False
+    steps, matches = compiled
+    if steps is not None:
+        value = _lookup(obj, steps)
+        return False if value is _NO_MATCH else [value]
+    if first_only:
+        for value in matches(obj):
+            return [value]
+        return False
+    return list(matches(obj)) or False
+
+
+# The user-tweets response keeps its entries in the TimelineAddEntries
+# instruction, which is not always at the same index (pinned tweets add one).
+_INSTRUCTION_ROOTS = (
+    "result.timeline.instructions",
+    "result.instructions",
+)
+
+
+def _is_add_entries(instruction):
+    if not isinstance(instruction, dict):
+        return False
+    kind = instruction.get("type")
+    return kind == "TimelineAddEntries" or (kind is None and isinstance(instruction.get("entries"), list))
+
+
+def _entries_of(instruction):
+    entries = instruction.get("entries")
+    return entries if isinstance(entries, list) else []
+
+
+class TimelineResolver:
+    """
+    Finds the TimelineAddEntries instruction by type and remembers, per
+    endpoint, which (root, index) held it, so later pages check only that
+    one. A different layout is reported as schema drift and replaces it.
+    """
+
+    def __init__(self, roots=_INSTRUCTION_ROOTS):
+        self.roots = roots
+        self.layouts = {}
+        self.drift_events = {}
+
+    @staticmethod
+    def _instructions(response, root):
+        found = find_all(response, root, first_only=True)
+        return found[0] if found and isinstance(found[0], list) else None
+
+    def _discover(self, response):
+        for root in self.roots:
+            instructions = self._instructions(response, root)
+            if not instructions:
+                continue
+            untyped = None
+            for index, instruction in enumerate(instructions):
+                if isinstance(instruction, dict) and instruction.get("type") == "TimelineAddEntries":
+                    return (root, index), instructions
+                if untyped is None and _is_add_entries(instruction):
+                    untyped = index
+            if untyped is not None:
+                return (root, untyped), instructions
+        return None
+
+    def entries(self, endpoint, response):
+        """Entries of the TimelineAddEntries instruction, [] if there is none"""
+        cached = self.layouts.get(endpoint)
+        if cached is not None:
+            instructions = self._instructions(response, cached[0])
+            if instructions and cached[1] < len(instructions) and _is_add_entries(instructions[cached[1]]):
+                return _entries_of(instructions[cached[1]])
+        found = self._discover(response)
+        if found is None:
+            return []
+        layout, instructions = found
+        if cached is not None and layout != cached:
+            self.drift_events[endpoint] = self.drift_events.get(endpoint, 0) + 1
+            print(f"Schema drift on {endpoint}: entries moved from {cached[0]}[{cached[1]}] "
+                  f"to {layout[0]}[{layout[1]}]")
+        self.layouts[endpoint] = layout
+        return _entries_of(instructions[layout[1]])
+
+
+# convert_timestamp only reformats 'Tue Aug 06 02:54:02 +0000 2024' as
+# '06-08-2024 02:54:02', so well-formed values are rearranged by position
+# and only the rest go through strptime.
+_WEEKDAYS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+_MONTHS = {name: f"{number:02d}" for number, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)}
+
+
+@lru_cache(maxsize=4096)
+def format_created_at(value):
+    """'d-m-Y H:M:S' for a created_at string; raises ValueError if invalid"""
+    month = _MONTHS.get(value[4:7])
+    if (len(value) == 30 and month and value[0:3] in _WEEKDAYS and value[3] == " " and value[7] == " "
+            and value[10] == " " and value[13] == ":" and value[16] == ":" and value[19] == " "
+            and value[25] == " " and value[20] in "+-"):
+        day, clock, zone, year = value[8:10], value[11:19], value[20:25], value[26:30]
+        digits = day + clock[0:2] + clock[3:5] + clock[6:8] + zone[1:] + year
+        if (digits.isascii() and digits.isdigit() and clock <= "23:59:59" and clock[3] <= "5"
+                and clock[6] <= "5" and zone[1:3] <= "23" and zone[3] <= "5" and year >= "1000"):
+            date(int(year), int(month), int(day))  # rejects 31 Feb like strptime
+            return f"{day}-{month}-{year} {clock}"
+    return datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y").strftime("%d-%m-%Y %H:%M:%S")
+
+
+# remove_tags_and_links runs on every tweet of every timeline page, and
+# retweets and reply spam repeat the same text, so results are cached.
+_TCO_RE = re.compile(r'https://t\.co/\S+')
+_MENTION_RE = re.compile(r'@\w+')
+
+
+@lru_cache(maxsize=4096)
+def clean_tweet_text(text):
+    """TwitterScraper.remove_tags_and_links, with the regexes skipped when they cannot match"""
+    if '@' in text:
+        text = _MENTION_RE.sub('', text)
+    if 'https://t.co/' in text:
+        text = _TCO_RE.sub('', text)
+    return ' '.join(text.split())
+
+
+class SessionManager:
+    """Keeps one keep-alive aiohttp session (with DNS cache) open for the whole scraper run."""
+
+    def __init__(self, limit=100, limit_per_host=20, keepalive_timeout=30, dns_cache_ttl=300,
+                 connect_timeout=10, read_timeout=60):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self._session = None
+
+    async def get_session(self):
+        """Return the shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        """Close the session and every pooled connection"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class Paginator:
+    """
+    Ends a user's timeline when the bottom cursor stops leading anywhere:
+    ``advance(cursor, ids)`` returns the cursor of the next page, or None
+    when there is none, it was requested before, ``max_empty_pages`` pages in
+    a row had no tweets, ``max_stale_pages`` pages in a row had only tweets
+    already seen, or ``max_pages`` pages were fetched. ``stop(reason)`` ends
+    it from outside; ``stop_reason`` says why it ended.
+    """
+
+    def __init__(self, max_pages, max_empty_pages=2, max_stale_pages=2):
+        self.max_pages = max_pages
+        self.pages = 0
+        self.max_empty_pages = max(1, max_empty_pages)
+        self.max_stale_pages = max(1, max_stale_pages)
+        self.cursors = set()
+        self.ids = set()
+        self.empty_run = 0
+        self.stale_run = 0
+        self.stop_reason = None
+
+    def advance(self, cursor, ids):
+        if self.stop_reason:
+            return None
+        self.pages += 1
+        ids = list(ids)
+        if not ids:
+            self.empty_run += 1
+            if self.empty_run >= self.max_empty_pages:
+                return self.stop("empty_pages")
+        else:
+            self.empty_run = 0
+            new_ids = [item for item in ids if item is None or item not in self.ids]
+            self.ids.update(item for item in new_ids if item is not None)
+            self.stale_run = 0 if new_ids else self.stale_run + 1
+            if self.stale_run >= self.max_stale_pages:
+                return self.stop("no_new_ids")
+        if not cursor:
+            return self.stop("end_of_results")
+        if cursor in self.cursors:
+            return self.stop("repeated_cursor")
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return self.stop("max_pages")
+        self.cursors.add(cursor)
+        return cursor
+
+    def stop(self, reason):
+        if self.stop_reason is None:
+            self.stop_reason = reason
+        return None
+
+
+class UserIdResolver:
+    """
+    username -> rest_id lookups through the /user endpoint, kept in a JSON
+    cache file for ``ttl`` seconds so later runs skip them. ``request(url,
+    params)`` is the scraper's async request function (which applies its rate
+    limiting). ``resolve_many`` looks a whole list up concurrently, at most
+    ``max_concurrency`` at a time, and yields (username, rest_id) pairs as
+    each one completes; rest_id is None when the lookup failed.
+    """
+    url = "https://twitter241.p.rapidapi.com/user"
+
+    def __init__(self, request, cache_file="user_ids.json", ttl=7 * 24 * 3600, max_concurrency=5):
+        self.request = request
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = {}
+        self._unsaved = False
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error reading {cache_file}: {e}. Starting fresh.")
+
+    def cached(self, username):
+        """Cached rest_id of ``username`` if it has not expired"""
+        entry = self.cache.get(username.lower())
+        if entry and time.time() - entry["resolved_at"] < self.ttl:
+            return entry["rest_id"]
+        return None
+
+    async def resolve(self, username):
+        rest_id = self.cached(username)
+        if rest_id:
+            return rest_id
+        try:
+            data = await self.request(self.url, {"username": username})
+        except Exception as e:
+            print(f"Error getting user info for {username}: {e}")
+            return None
+        try:
+            rest_id = data['result']['data']['user']['result']['rest_id']
+        except (KeyError, TypeError) as e:
+            print(f"Key error: {e} - Expected key path was not found in the response for {username}.")
+            return None
+        print(f"User ID (rest_id) for {username}: {rest_id}")
+        self.cache[username.lower()] = {"rest_id": rest_id, "resolved_at": time.time()}
+        self._unsaved = True
+        return rest_id
+
+    async def resolve_many(self, usernames):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def lookup(username):
+            async with semaphore:
+                return username, await self.resolve(username)
+
+        tasks = [asyncio.create_task(lookup(username)) for username in dict.fromkeys(usernames) if username]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.save()
+
+    def save(self):
+        if not self.cache_file or not self._unsaved:
+            return
+        temp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.cache_file)
+            self._unsaved = False
+        except Exception as e:
+            print(f"Error writing to {self.cache_file}: {e}")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
 class ScrapingUtils:
+    async def _get_session(self):
+        """Shared pooled session, created on first use if none was injected"""
+        if getattr(self, 'session_manager', None) is None:
+            self.session_manager = SessionManager()
+        return await self.session_manager.get_session()
+
+    async def close_session(self):
+        """Close the pooled session"""
+        if getattr(self, 'session_manager', None) is not None:
+            await self.session_manager.close()
+
     async def make_async_requests(self, url, headers, params):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                try:
-                    response_text = await response.text()
-                    return await response.json()
-                except aiohttp.client_exceptions.ContentTypeError as e:
-                    print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
-                    return None
-                except Exception as e:
-                    print(f"Error: {e}")
-                    return None
+        session = await self._get_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            try:
+                return await response.json()
+            except aiohttp.client_exceptions.ContentTypeError as e:
+                print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
+                return None
+            except Exception as e:
+                print(f"Error: {e}")
+                return None
 
     @staticmethod
     def j_extract(json_data, path, default=None) -> List:
         """j_extract"""
-        _x = jsonpath(json_data, path)
+        _x = find_all(json_data, path)
         # print(json_data)
         
         return _x if _x else default
@@ -36,7 +434,7 @@ class ScrapingUtils:
 
     def j_extract_first(self, json_data, path, default=None):
         """j_extract_first"""
-        for _x in self.j_extract(json_data, path, default=default) or []:
+        for _x in find_all(json_data, path, first_only=True) or default or []:
             return _x
         return default
 
@@ -68,11 +466,7 @@ class ScrapingUtils:
         :param timestamp: The input timestamp string.
         :return: A string in the format 'd-m-y h:m:s'.
         """
-        # Parse the input timestamp string into a datetime object
-        dt = datetime.strptime(timestamp, "%a %b %d %H:%M:%S %z %Y")
-
-        # Format the datetime object into the desired format
-        return dt.strftime("%d-%m-%Y %H:%M:%S")
+        return format_created_at(timestamp)
 
     def contains_keywords(self, text, keywords):
         return any(keyword.lower() in text.lower() for keyword in keywords)
@@ -87,5 +481,3 @@ class ScrapingUtils:
         dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %z %Y")
         # Format the datetime object into 'd-m-y h:m:s' format
         return dt.strftime("%d-%m-%Y %H:%M:%S")
-
-
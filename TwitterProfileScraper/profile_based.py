@@ -8,8 +8,10 @@ import time
 import random
 from functools import wraps
 from dotenv import load_dotenv
-from utils import ScrapingUtils
+from utils import (CheckpointStore, CursorPrefetcher, Paginator, ScrapingUtils, SessionManager, TimelineResolver,
+                   UserIdResolver, find_all, get_normalizer)
 import re
+from collections import namedtuple
 
 
 
@@ -34,36 +36,135 @@ def retry_with_backoff(retries=3, backoff_in_seconds=1):
     return decorator
 
 
-class RateLimiter:
-    def __init__(self, calls_per_second=10):
-        self.calls_per_second = calls_per_second
-        self.last_reset = time.time()
-        self.calls = 0
+# Field specs read relative to an entry's tweet ``result`` node. ``coerce`` (a
+# callable or a TwitterScraper method name) only runs on truthy values; a
+# missing value, or a falsy one when ``default`` is set, becomes ``default``
+# (called if callable). ``many`` keeps every match instead of the first.
+FieldSpec = namedtuple("FieldSpec", "name path coerce default many", defaults=(None, None, False))
+
+
+def mention_list(mentions):
+    return [{"name": m["name"], "screen_name": m["screen_name"]}
+            for m in mentions if isinstance(m, dict) and "name" in m and "screen_name" in m]
+
+
+TWEET_RESULT_PATH = "content.itemContent.tweet_results.result"
+COMMENT_RESULT_PATH = "content.items[0].item.itemContent.tweet_results.result"
+
+TWEET_FIELDS = (
+    FieldSpec("id", "legacy.id_str"),
+    FieldSpec("content", "legacy.full_text", "remove_tags_and_links"),
+    FieldSpec("datetime", "legacy.created_at", "convert_timestamp"),
+    FieldSpec("likes", "legacy.favorite_count", int, 0),
+    FieldSpec("shares", "legacy.retweet_count", int, 0),
+    FieldSpec("views", "views.count", int),
+    FieldSpec("source", "", default="TWITTER"),
+    FieldSpec("media", "legacy.entities.media[*].media_url_https", many=True),
+    FieldSpec("username", "core.user_results.result.legacy.screen_name"),
+    FieldSpec("is_blueTick", "core.user_results.result.is_blue_verified"),
+    FieldSpec("followers", "core.user_results.result.legacy.followers_count", int, 0),
+    FieldSpec("hashtags", "legacy.entities.hashtags[*].text", many=True),
+    FieldSpec("user_mentions", "legacy.entities.user_mentions.*", mention_list, list, many=True),
+)
+
+COMMENT_FIELDS = (
+    FieldSpec("content", "legacy.full_text", "clean_comment_text"),
+    FieldSpec("likes", "legacy.favorite_count", int, 0),
+    FieldSpec("shares", "legacy.retweet_count", int, 0),
+    FieldSpec("views", "views.count", int),
+    FieldSpec("is_blueTick", "core.user_results.result.is_blue_verified"),
+    FieldSpec("followers", "core.user_results.result.legacy.followers_count", int, 0),
+)
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at ``rate`` tokens per second up to ``burst``.
+
+    Each caller reserves its token under the lock and then sleeps outside of
+    it, so waiters are served in arrival (FIFO) order without blocking each
+    other while they wait. The bucket may go negative: that is the backlog
+    of reservations already handed out.
+    """
+
+    def __init__(self, rate, burst):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
         self._lock = asyncio.Lock()
 
-    async def acquire(self):
+    async def acquire(self, tokens=1):
+        """Take ``tokens`` tokens, waiting if needed. Returns the time waited."""
         async with self._lock:
-            current_time = time.time()
-            if current_time - self.last_reset >= 1:
-                self.calls = 0
-                self.last_reset = current_time
-
-            if self.calls >= self.calls_per_second:
-                wait_time = 1 - (current_time - self.last_reset)
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                self.calls = 0
-                self.last_reset = time.time()
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait_time > 0:
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # Hand the reservation back so later waiters are not delayed
+                self._tokens += tokens
+                raise
+        return wait_time
 
-            self.calls += 1
+
+class RateLimiter:
+    """
+    Shared token bucket plus optional per-endpoint buckets.
+
+    ``calls_per_second``/``burst`` bound the total request rate (the account
+    quota); ``endpoint_limits`` maps an endpoint name such as "search",
+    "comments" or "user" to its own ``(calls_per_second, burst)``.
+    """
+
+    def __init__(self, calls_per_second=10, burst=None,
+                 endpoint_limits=None):
+        self.calls_per_second = calls_per_second
+        self.burst = burst or max(1, int(calls_per_second))
+        self._shared = TokenBucket(calls_per_second, self.burst)
+        self._buckets = {
+            endpoint: TokenBucket(rate, endpoint_burst)
+            for endpoint, (rate, endpoint_burst) in (endpoint_limits or {}).items()
+        }
+
+    async def acquire(self, endpoint="default"):
+        """Control the rate of API calls. Returns the time spent waiting."""
+        wait_time = 0.0
+        bucket = self._buckets.get(endpoint)
+        if bucket is not None:
+            wait_time += await bucket.acquire()
+        wait_time += await self._shared.acquire()
+        return wait_time
 
 
 class TwitterScraper(ScrapingUtils):
-    def __init__(self, base_url, headers, output_file="ReheSamay.csv"):
+    def __init__(self, base_url, headers, output_file="ReheSamay.csv", prefetch_depth=2, checkpoints=None,
+                 max_concurrent_users=3):
         self.base_url = base_url
         self.headers = headers
         self.output_file = output_file
-        self.rate_limiter = RateLimiter(calls_per_second=10)
+        self.prefetch_depth = prefetch_depth  # timeline pages fetched ahead of the one being processed
+        self.max_concurrent_users = max(1, max_concurrent_users)  # profiles crawled at the same time
+        self.rate_limiter = RateLimiter(calls_per_second=10, endpoint_limits={
+            "search": (10, 10),
+            "comments": (10, 10),
+            "user": (5, 5),
+        })
+        self.session_manager = SessionManager()
+        self.checkpoints = checkpoints or CheckpointStore()  # resumes interrupted timelines and comment threads
+        self.timelines = TimelineResolver()  # remembers where each endpoint puts its entries
+        # username -> rest_id, cached on disk between runs; lookups go through the "user" rate limit
+        self.user_ids = UserIdResolver(
+            lambda url, params: self.make_api_request(url, self.headers, params, endpoint="user"))
+        self._tweet_fields = self._bind(TWEET_FIELDS)
+        self._comment_fields = self._bind(COMMENT_FIELDS)
         self.initialize_csv()
 
     def save_to_json(self, data: dict, filepath: str = "ReheSamay.json") -> None:
@@ -108,33 +209,8 @@ class TwitterScraper(ScrapingUtils):
     import re
 
     def clean_text(self, text: str) -> str:
-        if not isinstance(text, str):
-            return str(text) if text is not None else ""
-        try:
-            text = bytes(text, "latin-1").decode("utf-8", "replace")
-        except (UnicodeEncodeError, UnicodeDecodeError):
-            pass
-        html_entities = {
-            '&amp;': '&',
-            '&lt;': '<',
-            '&gt;': '>',
-            '&quot;': '"',
-            '&#39;': "'",
-            '&nbsp;': ' '
-        }
-        for entity, char in html_entities.items():
-            text = text.replace(entity, char)
-
-        # Remove hashtags (words starting with #)
-        text = re.sub(r'#\S+', '', text)
+        return get_normalizer("clean_text").clean(text)
 
-        # Additional cleanup
-        text = text.replace('\\', '')
-        text = text.replace('\x00', '')
-        text = text.replace('\\"', '"')
-        text = ' '.join(text.split())
-
-        return text.strip()
     def initialize_csv(self):
         headers = [
             'district', 'uuid', 'tweet_id', 'content', 'datetime',
@@ -146,37 +222,25 @@ class TwitterScraper(ScrapingUtils):
             writer.writeheader()
 
     @retry_with_backoff(retries=3)
-    async def make_api_request(self, url, headers, params):
-        await self.rate_limiter.acquire()
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status == 429:
-                    raise Exception("Rate limit exceeded")
-                return await response.json()
+    async def make_api_request(self, url, headers, params, endpoint="default"):
+        await self.rate_limiter.acquire(endpoint)
+        session = await self._get_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            if response.status == 429:
+                raise Exception("Rate limit exceeded")
+            return await response.json()
 
     async def get_user_id_from_twitter(self, username):
-        url = "https://twitter241.p.rapidapi.com/user"
-        querystring = {"username": username}
-        try:
-            response = await self.make_api_request(url, self.headers, querystring)
-            if response:
-                try:
-                    rest_id = response['result']['data']['user']['result']['rest_id']
-                    print(f"User ID (rest_id) for {username}: {rest_id}")
-                    return rest_id
-                except KeyError as e:
-                    print(f"Key error: {e}")
-                    return None
-        except Exception as e:
-            print(f"Error getting user info: {e}")
-            return None
+        rest_id = await self.user_ids.resolve(username)
+        self.user_ids.save()
+        return rest_id
 
     async def search_tweets(self, querystring, cursor=None):
         if cursor:
             querystring['cursor'] = cursor
             print(querystring)
         try:
-            content_json = await self.make_api_request(self.base_url, self.headers, querystring)
+            content_json = await self.make_api_request(self.base_url, self.headers, querystring, endpoint="search")
             if content_json is None:
                 print("Failed to fetch tweets")
             return content_json
@@ -189,223 +253,233 @@ class TwitterScraper(ScrapingUtils):
             querystring['cursor'] = cursor
         comments_url = "https://twitter241.p.rapidapi.com/comments"
         try:
-            return await self.make_api_request(comments_url, self.headers, querystring)
+            return await self.make_api_request(comments_url, self.headers, querystring, endpoint="comments")
         except Exception as e:
             print(f"Error fetching comments: {e}")
             return None
 
+    async def fetch_user_page(self, querystring, cursor, max_retries=3):
+        """One timeline page, retried on empty responses"""
+        for attempt in range(max_retries):
+            try:
+                # search_tweets sets the cursor on the querystring, so each page gets its own copy
+                content_json = await self.search_tweets(dict(querystring), cursor)
+                if content_json:
+                    return content_json
+            except Exception as e:
+                print(f"Error fetching page, attempt {attempt + 1}: {e}")
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(1)
+        return None
+
+    def timeline_entries(self, content_json):
+        return self.timelines.entries("user_tweets", content_json)
+
+    @staticmethod
+    def entry_ids(entries):
+        """entryIds of the non-cursor entries of a page"""
+        ids = []
+        for entry in entries or []:
+            entry_id = entry.get("entryId") if isinstance(entry, dict) else None
+            if not (entry_id or "").startswith("cursor-"):
+                ids.append(entry_id)
+        return ids
+
     async def process_user(self, user_id, index, tenant_id, district, is_comp, comp_id=None):
         if not user_id:
             print("Invalid user_id")
             return
 
         querystring = {"user": user_id, "count": "200"}
-        cursor1 = None
-        retry_count = 0
-        max_retries = 3
-
-        for k in range(2):
-            while retry_count < max_retries:
-                try:
-                    content_json = await self.search_tweets(querystring, cursor1)
-                    if not content_json:
-                        retry_count += 1
-                        await asyncio.sleep(1)
-                        continue
-
-                    cursor1 = self.j_extract_first(content_json, "cursor.bottom")
-                    content_json_filtered = self.j_extract(content_json, "result.timeline.instructions[1].entries.*")
-
-                    if not content_json_filtered:
-                        content_json_filtered = self.j_extract_first(content_json,
-                                                                     "result.timeline.instructions[0].entries")
-                    if not content_json_filtered:
-                        content_json_filtered = self.j_extract_first(content_json,
-                                                                     "result.timeline.instructions[2].entries")
-
-                    if content_json_filtered:
-                        for entry in content_json_filtered[:-1]:
-                            try:
-                                tweet_data = await self.extract_tweet_data(entry)
-                                if tweet_data:
-                                    print(f"Tweet {tweet_data['id']} crawled")
-                                    comm = []
-                                    tweet_id = tweet_data['id']
-
-                                    if tweet_id:
-                                        querystring2 = {"pid": tweet_id, "count": "100", "rankingMode": "Relevance"}
-                                        cursor2 = None
-
-                                        for _ in range(500):
-                                            try:
-                                                comments = await self.fetch_comments(querystring2, cursor2)
-                                                cursor2 = self.j_extract_first(comments, "cursor.bottom")
-
-                                                if _ == 3 and cursor2 is None:
-                                                    break
-
-                                                comments = self.j_extract(comments, "result.instructions[0].entries.*")
-                                                if not comments:
-                                                    print("No comments found")
-                                                    break
-
-                                                if comments:
-                                                    for c in comments[1:-1]:
-                                                        try:
-                                                            result = await self.extract_comment_data(c)
-                                                            if result:
-                                                                comm.append(result)
-                                                                print(f"Comment on Tweet {tweet_id} crawled")
-                                                        except Exception as e:
-                                                            print(f"Error processing comment: {str(e)}")
-                                                            continue
-
-                                            except Exception as e:
-                                                print(f"Error fetching comments for Tweet {tweet_id}: {e}")
-                                                continue
-
-                                    csv_data = {
-                                        'tweet_id': tweet_data["id"],
-                                        'content': self.clean_text(tweet_data["content"]),
-                                        'datetime': tweet_data["datetime"],
-                                        'likes': tweet_data["likes"],
-                                        'shares': tweet_data["shares"],
-                                        'views': tweet_data["views"],
-                                        'source': tweet_data["source"],
-                                        'isBlue': tweet_data['is_blueTick'],
-                                        "followers": tweet_data["followers"],
-                                        "hashtags": tweet_data["hashtags"],
-                                        "user_mentions": tweet_data["user_mentions"],
-                                        'media': tweet_data["media"],
-                                        'username': tweet_data["username"],
-                                        'url': f"https://x.com/{tweet_data['username']}/status/{tweet_data['id']}",
-                                        'comments': comm
-                                    }
-                                    self.save_to_json(data=csv_data, filepath="ReheSamay.json")
-
-                            except Exception as e:
-                                print(f"Error processing tweet: {e}")
-                                continue
-
-                    print(f"Batch complete - 20 tweets - {k}")
-                    if cursor1 is None:
+        key = f"user:{user_id}"
+        first_cursor, pages_done, _ = self.checkpoints.get(key)
+        if first_cursor:
+            print(f"Resuming user {user_id} after {pages_done} pages")
+        paginator = Paginator(2, first_cursor, pages_done)
+        # The next page is requested as soon as this page's cursor is known
+        pages = CursorPrefetcher(
+            lambda cursor: self.fetch_user_page(querystring, cursor),
+            lambda content_json: paginator.advance(self.j_extract_first(content_json, "cursor.bottom"),
+                                                   self.entry_ids(self.timeline_entries(content_json))),
+            max_pages=2 - pages_done,
+            depth=self.prefetch_depth,
+            first_cursor=first_cursor
+        )
+
+        finished = True
+        async for k, content_json in pages:
+            k += pages_done
+            if not content_json:
+                print(f"No response for batch {k}")
+                paginator.stop("no_response")
+                finished = False
+                break
+            try:
+                content_json_filtered = self.timeline_entries(content_json)
+
+                if content_json_filtered:
+                    for entry in content_json_filtered[:-1]:
+                        try:
+                            await self.process_entry(entry)
+                        except Exception as e:
+                            print(f"Error processing tweet: {e}")
+                            continue
+
+                print(f"Batch complete - 20 tweets - {k}")
+            except Exception as e:
+                print(f"Error in batch {k}: {e}")
+            cursor = self.j_extract_first(content_json, "cursor.bottom")
+            if cursor:
+                self.checkpoints.update(key, cursor, k + 1)
+
+        print(f"User {user_id} stopped after {paginator.pages} pages: {paginator.stop_reason}")
+        if finished:
+            self.checkpoints.finish(key)
+        self.checkpoints.save()
+
+    async def process_entry(self, entry):
+        """Extract one timeline tweet, fetch its comments and save it"""
+        tweet_data = await self.extract_tweet_data(entry)
+        if tweet_data:
+            print(f"Tweet {tweet_data['id']} crawled")
+            comm = []
+            tweet_id = tweet_data['id']
+
+            if tweet_id:
+                querystring2 = {"pid": tweet_id, "count": "100", "rankingMode": "Relevance"}
+                thread_key = f"thread:{tweet_id}"
+                cursor2, first_page, comm = self.checkpoints.get(thread_key)
+                paginator = Paginator(500, cursor2, first_page)
+
+                for _ in range(first_page, 500):
+                    if _ > first_page and cursor2 is None:
                         break
+                    try:
+                        comments = await self.fetch_comments(querystring2, cursor2)
+                        next_cursor = self.j_extract_first(comments, "cursor.bottom")
+
+                        comments = self.timelines.entries("comments", comments)
+                        if not comments:
+                            print("No comments found")
+                            paginator.stop("no_comments")
+                            break
+                        cursor2 = paginator.advance(next_cursor, self.entry_ids(comments))
+
+                        page_comments = self.extract_comments(comments[1:-1])
+                        for result in page_comments:
+                            comm.append(result)
+                            print(f"Comment on Tweet {tweet_id} crawled")
+                        if cursor2:
+                            self.checkpoints.update(thread_key, cursor2, _ + 1, page_comments)
+
+                    except Exception as e:
+                        print(f"Error fetching comments for Tweet {tweet_id}: {e}")
+                        continue
+                print(f"Comments for Tweet {tweet_id} stopped: {paginator.stop_reason}")
+                self.checkpoints.finish(thread_key)
+
+            csv_data = {
+                'tweet_id': tweet_data["id"],
+                'content': self.clean_text(tweet_data["content"]),
+                'datetime': tweet_data["datetime"],
+                'likes': tweet_data["likes"],
+                'shares': tweet_data["shares"],
+                'views': tweet_data["views"],
+                'source': tweet_data["source"],
+                'isBlue': tweet_data['is_blueTick'],
+                "followers": tweet_data["followers"],
+                "hashtags": tweet_data["hashtags"],
+                "user_mentions": tweet_data["user_mentions"],
+                'media': tweet_data["media"],
+                'username': tweet_data["username"],
+                'url': f"https://x.com/{tweet_data['username']}/status/{tweet_data['id']}",
+                'comments': comm
+            }
+            self.save_to_json(data=csv_data, filepath="ReheSamay.json")
+
+    def _bind(self, fields):
+        return tuple((spec.name, spec.path, spec.many,
+                      getattr(self, spec.coerce) if isinstance(spec.coerce, str) else spec.coerce,
+                      spec.default) for spec in fields)
+
+    @staticmethod
+    def _fill(node, fields):
+        record = {}
+        for name, path, many, coerce, default in fields:
+            matches = find_all(node, path, first_only=not many) if path else False
+            value = (matches if many else matches[0]) if matches else None
+            if value:
+                record[name] = coerce(value) if coerce else value
+            elif matches and default is None:
+                record[name] = value
+            else:
+                record[name] = default() if callable(default) else default
+        return record
 
-                    break  # Break the retry loop if successful
-                except Exception as e:
-                    print(f"Error in batch {k}, attempt {retry_count + 1}: {e}")
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        await asyncio.sleep(1)
-                    continue
-
+    def clean_comment_text(self, text):
+        return self.clean_text(self.remove_tags_and_links(text))
 
-    async def extract_tweet_data(self, c):
+    def parse_tweet(self, c):
+        """Tweet record of one timeline entry, located once and filled from TWEET_FIELDS"""
         try:
-            content = self.j_extract_first(c, "content.itemContent.tweet_results.result.legacy.full_text")
-            content = self.remove_tags_and_links(content) if content else None
-            idd = self.j_extract_first(c, "content.itemContent.tweet_results.result.legacy.id_str")
-
-            if not (content and idd):
+            node = self.j_extract_first(c, TWEET_RESULT_PATH)
+            if not node:
                 return None
-
-            tweet_datetime = self.j_extract_first(c, "content.itemContent.tweet_results.result.legacy.created_at")
-            if tweet_datetime:
-                tweet_datetime = self.convert_timestamp(tweet_datetime)
-
-            username = self.j_extract_first(c,
-                                            "content.itemContent.tweet_results.result.core.user_results.result.legacy.screen_name")
-            source = "TWITTER"
-
-            media = self.j_extract(c,
-                                   "content.itemContent.tweet_results.result.legacy.entities.media[*].media_url_https")
-            likes = int(self.j_extract_first(c, "content.itemContent.tweet_results.result.legacy.favorite_count") or 0)
-            shares = int(self.j_extract_first(c, "content.itemContent.tweet_results.result.legacy.retweet_count") or 0)
-            views = self.j_extract_first(c, "content.itemContent.tweet_results.result.views.count")
-            is_blue = self.j_extract_first(c,
-                                           "content.itemContent.tweet_results.result.core.user_results.result.is_blue_verified")
-            followers = int(self.j_extract_first(c,
-                                                 "content.itemContent.tweet_results.result.core.user_results.result.legacy.followers_count") or 0)
-
-            if views:
-                views = int(views)
-
-            hashtags = self.j_extract(c, "content.itemContent.tweet_results.result.legacy.entities.hashtags[*].text")
-            user_mentions = self.j_extract(c,
-                                           "content.itemContent.tweet_results.result.legacy.entities.user_mentions.*")
-            user_mention_list = []
-
-            if user_mentions:
-                for mention in user_mentions:
-                    try:
-                        name = mention["name"]
-                        screen_name = mention["screen_name"]
-                        user_mention_list.append({"name": name, "screen_name": screen_name})
-                    except KeyError:
-                        continue
-
-            return {
-                "id": idd,
-                "content": content,
-                "datetime": tweet_datetime,
-                "likes": likes,
-                "shares": shares,
-                "views": views,
-                "source": source,
-                "media": media,
-                "username": username,
-                "is_blueTick": is_blue,
-                "followers": followers,
-                "hashtags": hashtags,
-                "user_mentions": user_mention_list
-            }
+            record = self._fill(node, self._tweet_fields)
+            return record if record["content"] and record["id"] else None
         except Exception as e:
             print(f"Error in extract_tweet_data: {e}")
             return None
 
-    async def extract_comment_data(self, c):
+    def parse_comment(self, c):
+        """Comment record of one conversation entry, filled from COMMENT_FIELDS; None without text"""
         try:
-            content = self.j_extract_first(c, "content.items[0].item.itemContent.tweet_results.result.legacy.full_text")
-            if not content:
+            node = self.j_extract_first(c, COMMENT_RESULT_PATH)
+            if not node or not self.j_extract_first(node, "legacy.full_text"):
                 return None
-
-            content = self.remove_tags_and_links(content)
-            media = self.j_extract(c,
-                                   "content.items[0].item.itemContent.tweet_results.result.legacy.entities.media[*].media_url_https")
-            likes = int(self.j_extract_first(c,
-                                             "content.items[0].item.itemContent.tweet_results.result.legacy.favorite_count") or 0)
-            shares = int(self.j_extract_first(c,
-                                              "content.items[0].item.itemContent.tweet_results.result.legacy.retweet_count") or 0)
-            views = self.j_extract_first(c, "content.items[0].item.itemContent.tweet_results.result.views.count")
-            is_blue = self.j_extract_first(c,
-                                           "content.items[0].item.itemContent.tweet_results.result.core.user_results.result.is_blue_verified")
-            followers = int(self.j_extract_first(c,
-                                                 "content.items[0].item.itemContent.tweet_results.result.core.user_results.result.legacy.followers_count") or 0)
-
-            if views:
-                views = int(views)
-
-            return {
-                "content": self.clean_text(content),
-                "likes": likes,
-                "shares": shares,
-                "views": views,
-                "is_blueTick": is_blue,
-                "followers": followers
-            }
+            return self._fill(node, self._comment_fields)
         except Exception as e:
             print(f"Error in extract_comment_data: {e}")
             return None
 
-    async def main(self):
+    def extract_tweets(self, entries):
+        return [record for record in map(self.parse_tweet, entries) if record]
+
+    def extract_comments(self, entries):
+        return [record for record in map(self.parse_comment, entries) if record]
+
+    async def extract_tweet_data(self, c):
+        return self.parse_tweet(c)
+
+    async def extract_comment_data(self, c):
+        return self.parse_comment(c)
+
+    async def main(self, usernames=("ReheSamay",)):
+        """Look the usernames up concurrently and crawl each profile as soon as its id resolves"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_users)
+
+        async def crawl(user_id, username):
+            async with semaphore:
+                try:
+                    await self.process_user(user_id, "1", "1", "1", "1", "1")
+                except Exception as e:
+                    print(f"Error processing user {username}: {e}")
+
+        tasks = []
         try:
-            user_id = await self.get_user_id_from_twitter("ReheSamay")
-            if user_id:
-                await self.process_user(user_id, "1", "1", "1", "1", "1")
-            else:
-                print("Failed to get user ID")
+            async for username, user_id in self.user_ids.resolve_many(usernames):
+                if user_id:
+                    tasks.append(asyncio.create_task(crawl(user_id, username)))
+                else:
+                    print(f"Failed to get user ID for {username}")
+            await asyncio.gather(*tasks)
         except Exception as e:
             print(f"Error in main: {e}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.checkpoints.save()
+            await self.close_session()
 
 
 if __name__ == "__main__":
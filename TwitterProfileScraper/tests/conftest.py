@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# The scraper's modules import each other as top-level modules (utils), as when run from TwitterProfileScraper
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,163 @@
+# tests/test_profile_checkpoint.py
+
+import asyncio
+import json
+import os
+
+from profile_based import TwitterScraper
+from utils import CheckpointStore
+
+
+def reopen(store):
+    """A new store over the same files, as after the process exits without saving"""
+    while store._spill_files:
+        store._spill_files.popitem()[1].close()
+    return CheckpointStore(store.filepath, save_every=store.save_every)
+
+
+def comments(page):
+    return [{"content": f"reply {page}.{n}", "likes": n} for n in range(2)]
+
+
+def test_timeline_resume(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    assert store.get("user:1") == (None, 0, [])
+    store.update("user:1", "c2", 2)
+    assert reopen(store).get("user:1") == ("c2", 2, [])
+
+    store.finish("user:1")
+    assert reopen(store).get("user:1") == (None, 0, [])
+
+
+def test_thread_resume_from_spill(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    store = CheckpointStore(str(path), save_every=1)
+    for page in range(3):
+        store.update("thread:7", f"c{page + 1}", page + 1, comments(page))
+        size = os.path.getsize(path)
+        assert size < 100  # the checkpoint only holds the cursor and the page count
+
+    assert reopen(store).get("thread:7") == ("c3", 3, comments(0) + comments(1) + comments(2))
+    assert json.loads(path.read_text()) == {"thread:7": {"cursor": "c3", "pages": 3, "spilled": True}}
+
+
+def test_pages_spilled_after_the_checkpoint_are_ignored(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=2)
+    store.update("thread:7", "c1", 1, comments(0))
+    store.update("thread:7", "c2", 2, comments(1))  # saved here
+    store.update("thread:7", "c3", 3, comments(2))  # spilled, not yet counted
+    assert reopen(store).get("thread:7") == ("c2", 2, comments(0) + comments(1))
+
+
+def test_page_spilled_twice_counts_once(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=2)
+    store.update("thread:7", "c1", 1, comments(0))
+    store.update("thread:7", "c2", 2, comments(1))
+    store.update("thread:7", "c3", 3, comments(2))
+    resumed = reopen(store)
+    assert resumed.get("thread:7")[1] == 2
+    resumed.update("thread:7", "c3", 3, comments(2))  # page 2 fetched again after the restart
+    resumed.save()
+    assert reopen(resumed).get("thread:7") == ("c3", 3, comments(0) + comments(1) + comments(2))
+
+
+def test_incomplete_spill_restarts_the_thread(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    store.update("thread:7", "c1", 1, comments(0))
+    store.update("thread:7", "c2", 2, comments(1))
+    spill = store._spill_path("thread:7")
+    resumed = reopen(store)
+    with open(spill, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"page": 1, "items": comments(1)}) + '\n')
+
+    assert resumed.get("thread:7") == (None, 0, [])
+    assert "thread:7" not in resumed.state
+    assert not os.path.exists(spill)
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    store.update("thread:7", "c1", 1, comments(0))
+    spill = store._spill_path("thread:7")
+    resumed = reopen(store)
+    with open(spill, 'a', encoding='utf-8') as f:
+        f.write('{"page": 1, "ite')
+
+    assert resumed.get("thread:7") == ("c1", 1, comments(0))
+    resumed.update("thread:7", "c2", 2, comments(1))
+    assert reopen(resumed).get("thread:7") == ("c2", 2, comments(0) + comments(1))
+
+
+def test_legacy_inline_items(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    path.write_text(json.dumps({"thread:7": {"cursor": "c1", "pages": 1, "items": comments(0)}}))
+    assert CheckpointStore(str(path)).get("thread:7") == ("c1", 1, comments(0))
+
+
+def test_finish_removes_the_spill(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    store.update("thread:7", "c1", 1, comments(0))
+    spill = store._spill_path("thread:7")
+    assert os.path.exists(spill)
+    store.finish("thread:7")
+    assert not os.path.exists(spill)
+    assert reopen(store).get("thread:7") == (None, 0, [])
+
+
+def test_in_memory_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = CheckpointStore(None)
+    store.update("thread:7", "c1", 1, comments(0))
+    store.update("thread:7", "c2", 2, comments(1))
+    assert store.get("thread:7") == ("c2", 2, comments(0) + comments(1))
+    store.save()
+    store.finish("thread:7")
+    assert store.get("thread:7") == (None, 0, [])
+    assert os.listdir(tmp_path) == []
+
+
+def tweet_entry(tweet_id):
+    return {"entryId": f"tweet-{tweet_id}", "content": {"itemContent": {"tweet_results": {"result": {
+        "legacy": {"full_text": f"tweet {tweet_id}", "id_str": str(tweet_id),
+                   "created_at": "Tue Aug 06 02:54:02 +0000 2024"}}}}}}
+
+
+def comment_page(page, pages):
+    replies = [{"entryId": f"conversationthread-{page}{n}", "content": {"items": [{"item": {"itemContent": {
+        "tweet_results": {"result": {"legacy": {"full_text": f"reply {page}.{n}"}}}}}}]}} for n in range(2)]
+    cursor = {"entryId": "cursor-bottom", "content": {"value": "bottom"}}
+    return {"cursor": {"bottom": str(page + 1) if page + 1 < pages else None},
+            "result": {"instructions": [{"type": "TimelineAddEntries",
+                                         "entries": [{"entryId": "cursor-top"}] + replies + [cursor]}]}}
+
+
+def test_interrupted_thread_resumes_with_every_comment(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def run(interrupt_at=None):
+        scraper = TwitterScraper("https://example.invalid/user-tweets", {},
+                                 checkpoints=CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1))
+        requested = []
+
+        async def fetch_comments(querystring, cursor=None):
+            page = int(cursor or 0)
+            requested.append(page)
+            if page == interrupt_at:
+                raise asyncio.CancelledError  # as when the run is stopped
+            return comment_page(page, 4)
+
+        scraper.fetch_comments = fetch_comments
+        try:
+            asyncio.run(scraper.process_entry(tweet_entry(5)))
+        except asyncio.CancelledError:
+            reopen(scraper.checkpoints)
+        return requested
+
+    assert run(interrupt_at=2) == [0, 1, 2]
+    assert not (tmp_path / "ReheSamay.json").exists()
+    assert run() == [2, 3]
+    with open(tmp_path / "ReheSamay.json", 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    assert [c["content"] for c in records[0]["comments"]] == [f"reply {p}.{n}" for p in range(4) for n in range(2)]
+    assert CheckpointStore(str(tmp_path / "checkpoints.json")).state == {}
+    assert os.listdir(tmp_path / "checkpoints_items") == []
@@ -0,0 +1,168 @@
+# tests/test_profile_extraction.py
+
+import asyncio
+
+import pytest
+from jsonpath import jsonpath
+
+from profile_based import TwitterScraper
+
+TWEET = "content.itemContent.tweet_results.result."
+
+
+def result(tweet_id=1, text="Hello #tag @user https://t.co/x world", **legacy):
+    node = {
+        "rest_id": str(tweet_id),
+        "legacy": {
+            "full_text": text, "id_str": str(tweet_id), "created_at": "Tue Aug 06 02:54:02 +0000 2024",
+            "favorite_count": 7, "retweet_count": "2",
+            "entities": {"media": [{"media_url_https": "https://pbs/1.jpg"}, {"media_url_https": "https://pbs/2.jpg"}],
+                         "hashtags": [{"text": "tag"}],
+                         "user_mentions": [{"name": "U", "screen_name": "user"}, {"screen_name": "no_name"}]}
+        },
+        "views": {"count": "10"},
+        "core": {"user_results": {"result": {"is_blue_verified": True,
+                                             "legacy": {"screen_name": "someone", "followers_count": 5}}}}
+    }
+    node["legacy"].update(legacy)
+    return node
+
+
+def entry(node):
+    return {"entryId": "tweet-1", "content": {"itemContent": {"tweet_results": {"result": node}}}}
+
+
+def bare(node):
+    node["legacy"].pop("entities")
+    node.pop("views")
+    node["core"]["user_results"]["result"].pop("legacy")
+    node["legacy"]["favorite_count"] = 0
+    return node
+
+
+ENTRIES = [
+    entry(result()),
+    entry(result(2, text="plain text", favorite_count=None, retweet_count=0)),
+    entry(bare(result(3))),
+    entry(result(4, text="")),
+    entry(result(5, id_str=None)),
+    entry(result(6, text="@only https://t.co/mentions")),
+    {"entryId": "cursor-bottom", "content": {"value": "c"}},
+    {},
+]
+
+
+def old_extract_tweet_data(scraper, c):
+    """extract_tweet_data as it was, one jsonpath search per field"""
+    def first(path):
+        found = jsonpath(c, TWEET + path)
+        return found[0] if found else None
+
+    def every(path):
+        return jsonpath(c, TWEET + path) or None
+
+    content = first("legacy.full_text")
+    content = scraper.remove_tags_and_links(content) if content else None
+    idd = first("legacy.id_str")
+    if not (content and idd):
+        return None
+    tweet_datetime = first("legacy.created_at")
+    if tweet_datetime:
+        tweet_datetime = scraper.convert_to_timestamp(tweet_datetime)
+    views = first("views.count")
+    mentions = []
+    for mention in every("legacy.entities.user_mentions.*") or []:
+        try:
+            mentions.append({"name": mention["name"], "screen_name": mention["screen_name"]})
+        except KeyError:
+            continue
+    return {
+        "id": idd,
+        "content": content,
+        "datetime": tweet_datetime,
+        "likes": int(first("legacy.favorite_count") or 0),
+        "shares": int(first("legacy.retweet_count") or 0),
+        "views": int(views) if views else views,
+        "source": "TWITTER",
+        "media": every("legacy.entities.media[*].media_url_https"),
+        "username": first("core.user_results.result.legacy.screen_name"),
+        "is_blueTick": first("core.user_results.result.is_blue_verified"),
+        "followers": int(first("core.user_results.result.legacy.followers_count") or 0),
+        "hashtags": every("legacy.entities.hashtags[*].text"),
+        "user_mentions": mentions
+    }
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the scraper writes its CSV header to the working directory
+    return TwitterScraper("https://example.invalid/user-tweets", {})
+
+
+@pytest.mark.parametrize("index", range(len(ENTRIES)))
+def test_parse_tweet_matches_the_old_extraction(scraper, index):
+    assert scraper.parse_tweet(ENTRIES[index]) == old_extract_tweet_data(scraper, ENTRIES[index])
+
+
+def test_batch_and_async_wrappers(scraper):
+    expected = [record for record in (old_extract_tweet_data(scraper, c) for c in ENTRIES) if record]
+    assert [record["id"] for record in expected] == ["1", "2", "3"]  # 6 has no text left after cleaning
+    assert scraper.extract_tweets(ENTRIES) == expected
+    assert asyncio.run(scraper.extract_tweet_data(ENTRIES[0])) == expected[0]
+
+
+def test_fields_without_a_value(scraper):
+    record = scraper.parse_tweet(ENTRIES[2])
+    assert record["views"] is None and record["media"] is None and record["hashtags"] is None
+    assert record["user_mentions"] == [] and record["likes"] == 0 and record["followers"] == 0
+
+
+COMMENT = "content.items[0].item.itemContent.tweet_results.result."
+
+
+def comment_entry(node):
+    return {"entryId": "conversationthread-1", "content": {"items": [{"item": {"itemContent": {
+        "tweet_results": {"result": node}}}}]}}
+
+
+COMMENTS = [
+    comment_entry(result(10, text="Nice one @user #tag https://t.co/x &amp; more")),
+    comment_entry(result(11, text="")),
+    comment_entry(result(12, text=None)),
+    comment_entry(result(13, text="@only https://t.co/mentions")),
+    comment_entry(bare(result(14, text="bare reply"))),
+    {"entryId": "cursor-top", "content": {"value": "c"}},
+]
+
+
+def old_extract_comment_data(scraper, c):
+    """extract_comment_data as it was, one jsonpath search per field"""
+    def first(path):
+        found = jsonpath(c, COMMENT + path)
+        return found[0] if found else None
+
+    content = first("legacy.full_text")
+    if not content:
+        return None
+    content = scraper.remove_tags_and_links(content)
+    views = first("views.count")
+    return {
+        "content": scraper.clean_text(content),
+        "likes": int(first("legacy.favorite_count") or 0),
+        "shares": int(first("legacy.retweet_count") or 0),
+        "views": int(views) if views else views,
+        "is_blueTick": first("core.user_results.result.is_blue_verified"),
+        "followers": int(first("core.user_results.result.legacy.followers_count") or 0)
+    }
+
+
+@pytest.mark.parametrize("index", range(len(COMMENTS)))
+def test_parse_comment_matches_the_old_extraction(scraper, index):
+    assert scraper.parse_comment(COMMENTS[index]) == old_extract_comment_data(scraper, COMMENTS[index])
+
+
+def test_comments_without_text_are_dropped(scraper):
+    assert scraper.parse_comment(COMMENTS[1]) is None
+    assert scraper.parse_comment(COMMENTS[3])["content"] == ""  # text that cleans to nothing is kept
+    assert [record["content"] for record in scraper.extract_comments(COMMENTS)] == ["Nice one & more", "",
+                                                                                    "bare reply"]
@@ -0,0 +1,90 @@
+# tests/test_profile_paginator.py
+
+from utils import Paginator
+
+END_OF_RESULTS = "end_of_results"
+REPEATED_CURSOR = "repeated_cursor"
+EMPTY_PAGES = "empty_pages"
+NO_NEW_IDS = "no_new_ids"
+MAX_PAGES = "max_pages"
+
+
+def test_end_of_results():
+    paginator = Paginator(None)
+    assert paginator.advance("c1", ["1", "2"]) == "c1"
+    assert paginator.advance(None, ["3"]) is None
+    assert paginator.stop_reason == END_OF_RESULTS
+
+
+def test_repeated_cursor():
+    paginator = Paginator(None)
+    assert paginator.advance("c1", ["1"]) == "c1"
+    assert paginator.advance("c2", ["2"]) == "c2"
+    assert paginator.advance("c1", ["3"]) is None
+    assert paginator.stop_reason == REPEATED_CURSOR
+
+
+def test_empty_pages_in_a_row():
+    paginator = Paginator(None, max_empty_pages=2)
+    assert paginator.advance("c1", []) == "c1"
+    assert paginator.advance("c2", ["1"]) == "c2"  # an item resets the run
+    assert paginator.advance("c3", []) == "c3"
+    assert paginator.advance("c4", []) is None
+    assert paginator.stop_reason == EMPTY_PAGES
+
+
+def test_pages_without_new_ids():
+    paginator = Paginator(None, max_stale_pages=2)
+    assert paginator.advance("c1", ["1", "2"]) == "c1"
+    assert paginator.advance("c2", ["2", "1"]) == "c2"
+    assert paginator.advance("c3", ["3", "1"]) == "c3"  # a new ID resets the run
+    assert paginator.advance("c4", ["3"]) == "c4"
+    assert paginator.advance("c5", ["1", "2", "3"]) is None
+    assert paginator.stop_reason == NO_NEW_IDS
+
+
+def test_items_without_an_id_count_as_new():
+    paginator = Paginator(None, max_stale_pages=1)
+    assert paginator.advance("c1", [None]) == "c1"
+    assert paginator.advance("c2", [None, None]) == "c2"
+    assert paginator.ids == set()
+
+
+def test_max_pages():
+    paginator = Paginator(2)
+    assert paginator.advance("c1", ["1"]) == "c1"
+    assert paginator.advance("c2", ["2"]) is None
+    assert paginator.stop_reason == MAX_PAGES
+    assert Paginator(0).advance("c1", ["1"]) is None
+
+
+def test_exhausted_listing_wins_over_the_page_limit():
+    paginator = Paginator(1)
+    assert paginator.advance(None, ["1"]) is None
+    assert paginator.stop_reason == END_OF_RESULTS
+
+
+def test_first_reason_wins():
+    paginator = Paginator(None)
+    assert paginator.stop("no_response") is None
+    assert paginator.advance("c1", ["1"]) is None
+    paginator.stop("error")
+    assert paginator.stop_reason == "no_response"
+    assert paginator.pages == 0
+
+
+def test_resume_from_a_checkpoint():
+    paginator = Paginator(5, first_cursor="c3", pages_done=3)
+    assert paginator.advance("c3", ["1"]) is None  # the cursor the crawl resumed from
+    assert paginator.stop_reason == REPEATED_CURSOR
+
+    paginator = Paginator(5, first_cursor="c3", pages_done=3)
+    assert paginator.advance("c4", ["1"]) == "c4"
+    assert paginator.advance("c5", ["2"]) is None
+    assert paginator.stop_reason == MAX_PAGES
+
+
+def test_run_limits_are_at_least_one():
+    paginator = Paginator(None, max_empty_pages=0, max_stale_pages=0)
+    assert paginator.advance("c1", []) is None
+    assert paginator.stop_reason == EMPTY_PAGES
@@ -0,0 +1,95 @@
+# tests/test_profile_prefetch.py
+
+import asyncio
+
+import pytest
+
+from utils import CursorPrefetcher
+
+
+class FakeTimeline:
+    """Pages 0..n-1; page k's bottom cursor is "k+1" and the last has none"""
+
+    def __init__(self, pages, fail_at=None, empty_at=None):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.empty_at = empty_at
+        self.requested = []
+
+    async def fetch(self, cursor):
+        page = int(cursor or 0)
+        self.requested.append(page)
+        await asyncio.sleep(0.001)
+        if page == self.fail_at:
+            raise RuntimeError("boom")
+        if page == self.empty_at:
+            return None
+        return {"page": page, "cursor": str(page + 1) if page + 1 < self.pages else None}
+
+    @staticmethod
+    def next_cursor(response):
+        return response["cursor"]
+
+
+def collect(prefetcher, stop_after=None):
+    async def run():
+        seen = []
+        async for number, response in prefetcher:
+            seen.append((number, response and response["page"]))
+            if stop_after is not None and len(seen) == stop_after:
+                break
+        return seen
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_pages_come_in_order_until_the_cursor_runs_out(depth):
+    timeline = FakeTimeline(4)
+    pages = collect(CursorPrefetcher(timeline.fetch, timeline.next_cursor, max_pages=10, depth=depth))
+    assert pages == [(0, 0), (1, 1), (2, 2), (3, 3)]
+    assert timeline.requested == [0, 1, 2, 3]
+
+
+def test_max_pages_and_first_cursor():
+    timeline = FakeTimeline(10)
+    prefetcher = CursorPrefetcher(timeline.fetch, timeline.next_cursor, max_pages=2, depth=2, first_cursor="5")
+    assert collect(prefetcher) == [(0, 5), (1, 6)]
+    assert timeline.requested == [5, 6]
+
+
+def test_empty_response_is_yielded_and_ends_the_chain():
+    timeline = FakeTimeline(5, empty_at=2)
+    prefetcher = CursorPrefetcher(timeline.fetch, timeline.next_cursor, max_pages=10, depth=2)
+    assert collect(prefetcher) == [(0, 0), (1, 1), (2, None)]
+
+
+def test_fetch_error_is_raised_after_the_earlier_pages():
+    timeline = FakeTimeline(5, fail_at=2)
+    prefetcher = CursorPrefetcher(timeline.fetch, timeline.next_cursor, max_pages=10, depth=2)
+    seen = []
+
+    async def run():
+        async for number, _ in prefetcher:
+            seen.append(number)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert seen == [0, 1]
+
+
+def test_read_ahead_is_bounded_by_depth():
+    timeline = FakeTimeline(50)
+    prefetcher = CursorPrefetcher(timeline.fetch, timeline.next_cursor, max_pages=50, depth=2)
+
+    async def run():
+        async for number, _ in prefetcher:
+            await asyncio.sleep(0.02)
+            # Consumed pages + queued pages + the one being fetched
+            assert len(timeline.requested) <= number + 1 + 2 + 1
+            if number == 3:
+                break
+
+    asyncio.run(run())
+    assert len(timeline.requested) <= 7
+
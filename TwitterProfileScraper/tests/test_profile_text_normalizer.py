@@ -0,0 +1,90 @@
+# tests/test_profile_text_normalizer.py
+
+import html
+import re
+
+import pytest
+
+from utils import ScrapingUtils, TextNormalizer, get_normalizer
+
+TEXTS = [
+    "",
+    "   ",
+    "plain ascii text",
+    "RT @someone: Hello @user #tag https://t.co/abc world",
+    "RT @a:RT @b: nested retweet markers",
+    "email@example.com and @ alone and # alone and #",
+    "@user_1@user_2 ##double #ümlaut @Ñandú",
+    "http://example.com/x?y=1 https://t.co/q\nnext line https://t.co/end",
+    "&amp; &lt;tag&gt; &quot;quoted&quot; &#39;single&#39; &nbsp;space &amp;lt; &#64;escaped",
+    "zero\u200bwidth\u200f marks\u2028and\u202f\u2060joiner\u206f end",
+    "tabs\tand\r\nnewlines\n\n  and\xa0nbsp\u3000ideographic",
+    "back\\slash \\\"quoted\\\" nul\x00byte",
+    "Ã© mojibake and café and 混合 \U0001f642 #日本",
+    "trailing link https://t.co/",
+]
+
+
+def old_remove_tags_and_links(text):
+    """ScrapingUtils.remove_tags_and_links before the normalizer"""
+    if not isinstance(text, str):
+        return ""
+    text = html.unescape(text)
+    try:
+        text = bytes(text, "latin-1").decode("utf-8", "replace")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        pass
+    text = re.sub(r'RT @\w+:', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'https?://\S+', '', text)
+    text = text.replace('\n', ' ')
+    text = text.replace('\r', ' ')
+    text = text.replace('\t', ' ')
+    text = re.sub(r'[\u200b-\u200f\u2028-\u202f\u205f-\u206f]', '', text)
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def old_clean_text(text):
+    """TwitterScraper.clean_text before the normalizer"""
+    if not isinstance(text, str):
+        return str(text) if text is not None else ""
+    try:
+        text = bytes(text, "latin-1").decode("utf-8", "replace")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        pass
+    for entity, char in {'&amp;': '&', '&lt;': '<', '&gt;': '>', '&quot;': '"', '&#39;': "'", '&nbsp;': ' '}.items():
+        text = text.replace(entity, char)
+    text = re.sub(r'#\S+', '', text)
+    text = text.replace('\\', '')
+    text = text.replace('\x00', '')
+    text = text.replace('\\"', '"')
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+@pytest.mark.parametrize("text", TEXTS + [None, 12, b"bytes"])
+def test_tweet_profile_matches_the_old_cleaner(text):
+    assert TextNormalizer("tweet").clean(text) == old_remove_tags_and_links(text)
+    assert ScrapingUtils().remove_tags_and_links(text) == old_remove_tags_and_links(text)
+
+
+@pytest.mark.parametrize("text", TEXTS + [None, 12, b"bytes"])
+def test_clean_text_profile_matches_the_old_cleaner(text):
+    assert TextNormalizer("clean_text").clean(text) == old_clean_text(text)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_comment_cleaning_matches_the_old_chain(text):
+    assert get_normalizer("clean_text").clean(get_normalizer("tweet").clean(text)) == \
+        old_clean_text(old_remove_tags_and_links(text))
+
+
+def test_cache_and_shared_normalizers():
+    normalizer = TextNormalizer("tweet", cache_size=2)
+    assert normalizer.clean(TEXTS[3]) == normalizer.clean(TEXTS[3])
+    assert normalizer._cached.cache_info().hits == 1
+    assert TextNormalizer("tweet", cache_size=0).clean(TEXTS[3]) == old_remove_tags_and_links(TEXTS[3])
+    assert get_normalizer("tweet") is get_normalizer("tweet")
+    with pytest.raises(ValueError):
+        TextNormalizer("unknown")
@@ -0,0 +1,68 @@
+# tests/test_profile_timeline.py
+
+from utils import TimelineResolver
+
+ENTRIES = [{"entryId": "tweet-1"}, {"entryId": "tweet-2"}]
+
+
+def timeline(instructions, root="result.timeline.instructions"):
+    document = instructions
+    for key in reversed(root.split(".")):
+        document = {key: document}
+    return document
+
+
+def add_entries(entries=ENTRIES):
+    return {"type": "TimelineAddEntries", "entries": entries}
+
+
+def test_entries_are_found_by_instruction_type():
+    resolver = TimelineResolver()
+    response = timeline([{"type": "TimelineClearCache"}, {"type": "TimelinePinEntry", "entries": ["pinned"]},
+                         add_entries()])
+    assert resolver.entries("user_tweets", response) == ENTRIES
+    assert resolver.layouts["user_tweets"] == ("result.timeline.instructions", 2)
+
+
+def test_comments_layout():
+    resolver = TimelineResolver()
+    assert resolver.entries("comments", timeline([add_entries()], "result.instructions")) == ENTRIES
+    assert resolver.layouts["comments"] == ("result.instructions", 0)
+
+
+def test_untyped_instruction_with_entries():
+    resolver = TimelineResolver()
+    response = timeline([{"other": 1}, {"entries": ENTRIES}], "result.instructions")
+    assert resolver.entries("comments", response) == ENTRIES
+    assert resolver.layouts["comments"] == ("result.instructions", 1)
+
+
+def test_cached_layout_skips_the_scan(monkeypatch):
+    resolver = TimelineResolver()
+    resolver.entries("user_tweets", timeline([add_entries()]))
+    monkeypatch.setattr(resolver, "_discover", lambda response: None)
+    assert resolver.entries("user_tweets", timeline([add_entries([{"entryId": "tweet-3"}])])) == [
+        {"entryId": "tweet-3"}]
+
+
+def test_schema_drift_is_counted_and_relearned():
+    resolver = TimelineResolver()
+    resolver.entries("user_tweets", timeline([add_entries()]))
+    moved = timeline([{"type": "TimelineClearCache"}, add_entries()], "result.instructions")
+
+    assert resolver.entries("user_tweets", moved) == ENTRIES
+    assert resolver.drift_events == {"user_tweets": 1}
+    assert resolver.layouts["user_tweets"] == ("result.instructions", 1)
+
+    assert resolver.entries("user_tweets", moved) == ENTRIES
+    assert resolver.drift_events == {"user_tweets": 1}
+
+
+def test_responses_without_entries():
+    resolver = TimelineResolver()
+    assert resolver.entries("user_tweets", {}) == []
+    assert resolver.entries("user_tweets", None) == []
+    assert resolver.entries("user_tweets", timeline([{"type": "TimelineClearCache"}])) == []
+    assert resolver.entries("user_tweets", timeline([{"type": "TimelineAddEntries", "entries": "bad"}])) == []
+    assert resolver.entries("user_tweets", {"result": {"timeline": {"instructions": "bad"}}}) == []
+    assert resolver.entries("user_tweets", timeline([add_entries()], "data.elsewhere.instructions")) == []
@@ -0,0 +1,64 @@
+# tests/test_profile_timestamps.py
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils import ScrapingUtils, format_created_at
+
+TWITTER_TIME_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def reference(value):
+    """convert_timestamp as it was, through strptime"""
+    return datetime.strptime(value, TWITTER_TIME_FORMAT).strftime("%d-%m-%Y %H:%M:%S")
+
+
+def sample_timestamps(count=500):
+    rng = random.Random(7)
+    start = datetime(1990, 1, 1, tzinfo=timezone.utc)
+    for _ in range(count):
+        zone = timezone(timedelta(minutes=rng.randrange(-23 * 60 - 59, 23 * 60 + 60)))
+        moment = (start + timedelta(seconds=rng.randrange(50 * 365 * 86400))).astimezone(zone)
+        yield moment.strftime(TWITTER_TIME_FORMAT)
+
+
+@pytest.mark.parametrize("value", [
+    "Tue Aug 06 02:54:02 +0000 2024",
+    "Thu Jan 01 00:00:00 +0000 1970",
+    "Thu Feb 29 12:00:00 +0530 2024",
+    "Mon Mar 10 23:59:59 -2359 2025",
+    "Sun Jan 01 00:00:00 +2359 1000",
+    # strptime accepts an unpadded day and a colon in the offset; the sliced layout leaves them to it
+    "Tue Aug 6 02:54:02 +0000 2024",
+    "Tue Aug 06 02:54:02 +05:30 2024",
+])
+def test_matches_strptime(value):
+    assert format_created_at(value) == reference(value)
+    assert ScrapingUtils().convert_timestamp(value) == reference(value)
+
+
+def test_matches_strptime_across_offsets_and_years():
+    for value in sample_timestamps():
+        assert format_created_at(value) == reference(value), value
+
+
+@pytest.mark.parametrize("value", [
+    "Fri Feb 30 00:00:00 +0000 2024",
+    "Tue Feb 29 00:00:00 +0000 2023",
+    "Tue Aug 06 24:00:00 +0000 2024",
+    "Tue Aug 06 02:60:02 +0000 2024",
+    "Tue Aug 06 02:54:02 +2400 2024",
+    "Tue Foo 06 02:54:02 +0000 2024",
+    "Tue Aug 0x 02:54:02 +0000 2024",
+    "Tue Aug 06 02:54:02 0000 2024",
+    "Tue Aug 06 02:54:02 +0000 2024 ",
+    "2024-08-06T02:54:02Z",
+    "",
+])
+def test_invalid_timestamps_raise_like_strptime(value):
+    with pytest.raises(ValueError):
+        reference(value)
+    with pytest.raises(ValueError):
+        format_created_at(value)
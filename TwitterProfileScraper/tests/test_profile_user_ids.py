@@ -0,0 +1,146 @@
+# tests/test_profile_user_ids.py
+
+import asyncio
+import json
+
+import pytest
+
+from profile_based import TwitterScraper
+from utils import UserIdResolver
+
+IDS = {"someone": "1", "other": "2", "third": "3", "fourth": "4", "fifth": "5", "boom": RuntimeError}
+
+
+class FakeLookup:
+    """The /user endpoint: rest_ids from IDS, an error body for unknown names"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.events = []
+
+    async def __call__(self, url, params):
+        username = params["username"]
+        self.calls.append(username)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(username, 0.001))
+        finally:
+            self.in_flight -= 1
+            self.events.append(("resolved", username))
+        rest_id = IDS.get(username.lower())
+        if rest_id is RuntimeError:
+            raise RuntimeError("connection reset")
+        if rest_id is None:
+            return {"errors": [{"message": "Not Found"}]}
+        return {"result": {"data": {"user": {"result": {"rest_id": rest_id}}}}}
+
+
+def test_ids_are_cached_on_disk_until_they_expire(tmp_path):
+    path = str(tmp_path / "user_ids.json")
+    lookup = FakeLookup()
+    resolver = UserIdResolver(lookup, cache_file=path, ttl=100)
+    assert asyncio.run(resolver.resolve("Someone")) == "1"
+    assert asyncio.run(resolver.resolve("someone")) == "1"
+    assert lookup.calls == ["Someone"]
+    resolver.save()
+
+    reloaded = UserIdResolver(lookup, cache_file=path, ttl=100)
+    assert reloaded.cached("SOMEONE") == "1"
+    reloaded.cache["someone"]["resolved_at"] -= 101
+    assert reloaded.cached("someone") is None
+    assert asyncio.run(reloaded.resolve("someone")) == "1"
+    assert lookup.calls == ["Someone", "someone"]
+
+
+def test_failed_lookups_are_not_cached(tmp_path):
+    path = tmp_path / "user_ids.json"
+    lookup = FakeLookup()
+    resolver = UserIdResolver(lookup, cache_file=str(path))
+    assert asyncio.run(resolver.resolve("missing")) is None
+    assert asyncio.run(resolver.resolve("boom")) is None
+    assert asyncio.run(resolver.resolve("missing")) is None
+    assert lookup.calls == ["missing", "boom", "missing"]
+    resolver.save()
+    assert resolver.cache == {} and not path.exists()
+
+
+def test_unreadable_cache_file_starts_fresh(tmp_path):
+    path = tmp_path / "user_ids.json"
+    path.write_text("{not json")
+    assert UserIdResolver(FakeLookup(), cache_file=str(path)).cache == {}
+
+
+def test_resolve_many_is_bounded_and_saves(tmp_path):
+    path = tmp_path / "user_ids.json"
+    lookup = FakeLookup(delays={"someone": 0.03})
+    resolver = UserIdResolver(lookup, cache_file=str(path), max_concurrency=2)
+
+    async def run():
+        return [pair async for pair in resolver.resolve_many(
+            ["someone", "other", "third", "other", "", "missing", "fourth"])]
+
+    pairs = asyncio.run(run())
+    assert sorted(pairs, key=str) == sorted([("someone", "1"), ("other", "2"), ("third", "3"), ("missing", None),
+                                             ("fourth", "4")], key=str)
+    assert pairs[-1] == ("someone", "1")  # yielded as each lookup completes
+    assert sorted(lookup.calls) == ["fourth", "missing", "other", "someone", "third"]
+    assert lookup.max_in_flight == 2
+    assert sorted(json.loads(path.read_text())) == ["fourth", "other", "someone", "third"]
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scraper = TwitterScraper("https://example.invalid/user-tweets", {}, max_concurrent_users=2)
+    scraper.closed = False
+
+    async def close_session():
+        scraper.closed = True
+
+    scraper.close_session = close_session
+    return scraper
+
+
+def test_main_crawls_each_profile_as_its_id_resolves(scraper):
+    lookup = scraper.user_ids.request = FakeLookup(delays={"fifth": 0.05})
+    crawling = []
+    crawled = []
+    most_at_once = []
+
+    names = {rest_id: name for name, rest_id in IDS.items()}
+
+    async def process_user(user_id, index, tenant_id, district, is_comp, comp_id=None):
+        username = names[user_id]
+        crawling.append(username)
+        most_at_once.append(len(crawling))
+        lookup.events.append(("crawl", username))
+        await asyncio.sleep(0.01)
+        crawling.remove(username)
+        if username == "third":
+            raise RuntimeError("timeline failed")
+        crawled.append((username, user_id))
+
+    scraper.process_user = process_user
+    asyncio.run(scraper.main(["someone", "other", "third", "missing", "boom", "fifth"]))
+
+    assert sorted(crawled) == [("fifth", "5"), ("other", "2"), ("someone", "1")]  # third failed on its own
+    assert max(most_at_once) == 2
+    assert lookup.events.index(("crawl", "someone")) < lookup.events.index(("resolved", "fifth"))
+    assert scraper.closed
+    assert scraper.user_ids.cached("fifth") == "5"
+
+
+def test_main_saves_and_closes_when_the_lookup_fails(scraper):
+    async def broken(usernames):
+        raise RuntimeError("no network")
+        yield
+
+    scraper.user_ids.resolve_many = broken
+    scraper.checkpoints.update("user:1", "c1", 1)
+    asyncio.run(scraper.main(["someone"]))  # reported, not raised
+    assert scraper.closed
+    assert scraper.checkpoints._unsaved == 0
@@ -1,35 +1,705 @@
+import asyncio
 import html
+import json
+import os
 import re
-from datetime import datetime
+import time
+from datetime import date, datetime
+from functools import lru_cache
 import aiohttp
 from jsonpath_ng import jsonpath, parse
 import hjson
 import requests
-from jsonpath import jsonpath
+from jsonpath import jsonpath, normalize
 from typing import Dict, Union, List
+
+
+# Every FieldSpec path is looked up once per tweet and comment. Paths are
+# compiled on first use: a chain of plain keys and indexes turns into direct
+# dict/list access, and "*" / ".." into generators producing jsonpath's
+# matches in jsonpath's order. Filters, slices and quoted keys are left to
+# jsonpath itself.
+_PATH_SEGMENT_RE = re.compile(r"^(?:\*|\.\.|[A-Za-z0-9_\-]+)$")
+_NO_MATCH = object()
+
+
+def _lookup(obj, steps):
+    for key, index in steps:
+        if isinstance(obj, dict):
+            if key not in obj:
+                return _NO_MATCH
+            obj = obj[key]
+        elif isinstance(obj, list) and index is not None and index < len(obj):
+            obj = obj[index]
+        else:
+            return _NO_MATCH
+    return obj
+
+
+def _children(obj):
+    if isinstance(obj, dict):
+        return obj.values()
+    if isinstance(obj, list):
+        return obj
+    return ()
+
+
+def _path_steps(segments):
+    return tuple((key, int(key) if key.isdigit() else None) for key in segments)
+
+
+def _chain(segments):
+    if not segments:
+        return lambda obj: iter((obj,))
+
+    head = segments[0]
+    if head == "*":
+        rest = _chain(segments[1:])
+
+        def wildcard(obj):
+            for child in _children(obj):
+                yield from rest(child)
+        return wildcard
+
+    if head == "..":
+        rest = _chain(segments[1:])
+
+        def descend(obj):
+            yield from rest(obj)
+            for child in _children(obj):
+                yield from descend(child)
+        return descend
+
+    run = 0
+    while run < len(segments) and segments[run] not in ("*", ".."):
+        run += 1
+    steps = _path_steps(segments[:run])
+    rest = _chain(segments[run:])
+
+    def lookup(obj):
+        value = _lookup(obj, steps)
+        if value is not _NO_MATCH:
+            yield from rest(value)
+    return lookup
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path):
+    """(direct lookup steps or None, match generator), or None if jsonpath must handle it"""
+    cleaned = normalize(path)
+    if cleaned.startswith("$;"):
+        cleaned = cleaned[2:]
+    segments = cleaned.split(";")
+    if not all(_PATH_SEGMENT_RE.match(segment) for segment in segments):
+        return None
+    plain = all(segment not in ("*", "..") for segment in segments)
+    return (_path_steps(segments) if plain else None), _chain(segments)
+
+
+def find_all(obj, path, first_only=False):
+    """Same result as jsonpath(obj, path): a list of matches or False"""
+    if not path:
+        return False
+    compiled = compile_path(path)
+    if compiled is None:
+        result = jsonpath(obj, path)
+        return result[:1] if first_only and result else result
+    if not obj:
+        return False
+    steps, matches = compiled
+    if steps is not None:
+        value = _lookup(obj, steps)
+        return False if value is _NO_MATCH else [value]
+    if first_only:
+        for value in matches(obj):
+            return [value]
+        return False
+    return list(matches(obj)) or False
+
+
+# user-tweets and comments pages nest their instructions differently, and
+# the TimelineAddEntries instruction is not at a fixed index in either.
+_INSTRUCTION_ROOTS = (
+    "result.timeline.instructions",
+    "result.instructions",
+)
+
+
+def _is_add_entries(instruction):
+    if not isinstance(instruction, dict):
+        return False
+    kind = instruction.get("type")
+    return kind == "TimelineAddEntries" or (kind is None and isinstance(instruction.get("entries"), list))
+
+
+def _entries_of(instruction):
+    entries = instruction.get("entries")
+    return entries if isinstance(entries, list) else []
+
+
+class TimelineResolver:
+    """
+    Finds the TimelineAddEntries instruction by type and remembers, per
+    endpoint, which (root, index) held it, so later pages check only that
+    one. A different layout is reported as schema drift and replaces it.
+    """
+
+    def __init__(self, roots=_INSTRUCTION_ROOTS):
+        self.roots = roots
+        self.layouts = {}
+        self.drift_events = {}
+
+    @staticmethod
+    def _instructions(response, root):
+        found = find_all(response, root, first_only=True)
+        return found[0] if found and isinstance(found[0], list) else None
+
+    def _discover(self, response):
+        for root in self.roots:
+            instructions = self._instructions(response, root)
+            if not instructions:
+                continue
+            untyped = None
+            for index, instruction in enumerate(instructions):
+                if isinstance(instruction, dict) and instruction.get("type") == "TimelineAddEntries":
+                    return (root, index), instructions
+                if untyped is None and _is_add_entries(instruction):
+                    untyped = index
+            if untyped is not None:
+                return (root, untyped), instructions
+        return None
+
+    def entries(self, endpoint, response):
+        """Entries of the TimelineAddEntries instruction, [] if there is none"""
+        cached = self.layouts.get(endpoint)
+        if cached is not None:
+            instructions = self._instructions(response, cached[0])
+            if instructions and cached[1] < len(instructions) and _is_add_entries(instructions[cached[1]]):
+                return _entries_of(instructions[cached[1]])
+        found = self._discover(response)
+        if found is None:
+            return []
+        layout, instructions = found
+        if cached is not None and layout != cached:
+            self.drift_events[endpoint] = self.drift_events.get(endpoint, 0) + 1
+            print(f"Schema drift on {endpoint}: entries moved from {cached[0]}[{cached[1]}] "
+                  f"to {layout[0]}[{layout[1]}]")
+        self.layouts[endpoint] = layout
+        return _entries_of(instructions[layout[1]])
+
+
+# created_at values ('Tue Aug 06 02:54:02 +0000 2024') keep their fields at
+# fixed offsets, so convert_timestamp can reorder them without strptime;
+# strptime still decides anything that does not look exactly like that.
+_WEEKDAYS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+_MONTHS = {name: f"{number:02d}" for number, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)}
+
+
+@lru_cache(maxsize=4096)
+def format_created_at(value):
+    """created_at as 'd-m-Y H:M:S'; ValueError for anything strptime rejects"""
+    month = _MONTHS.get(value[4:7])
+    if (len(value) == 30 and month and value[0:3] in _WEEKDAYS and value[3] == " " and value[7] == " "
+            and value[10] == " " and value[13] == ":" and value[16] == ":" and value[19] == " "
+            and value[25] == " " and value[20] in "+-"):
+        day, clock, zone, year = value[8:10], value[11:19], value[20:25], value[26:30]
+        digits = day + clock[0:2] + clock[3:5] + clock[6:8] + zone[1:] + year
+        if (digits.isascii() and digits.isdigit() and clock <= "23:59:59" and clock[3] <= "5"
+                and clock[6] <= "5" and zone[1:3] <= "23" and zone[3] <= "5" and year >= "1000"):
+            date(int(year), int(month), int(day))  # day must exist in that month
+            return f"{day}-{month}-{year} {clock}"
+    return datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y").strftime("%d-%m-%Y %H:%M:%S")
+
+
+# The two cleaners every tweet and comment goes through. Each returns exactly
+# what the scraper's original method did; a pattern is only run when the
+# text contains something it could match, and a result is cached because
+# reply threads are full of identical texts.
+TEXT_CACHE_SIZE = 4096
+
+_RETWEET_RE = re.compile(r'RT @\w+:')
+_MENTION_RE = re.compile(r'@\w+')
+_URL_RE = re.compile(r'https?://\S+')
+_HASHTAG_RE = re.compile(r'#\S+')
+_INVISIBLE_RE = re.compile(r'[\u200b-\u200f\u2028-\u202f\u205f-\u206f]')
+_BACKSLASH_NUL = str.maketrans('', '', '\\\x00')
+_HTML_ENTITIES = (
+    ('&amp;', '&'),
+    ('&lt;', '<'),
+    ('&gt;', '>'),
+    ('&quot;', '"'),
+    ('&#39;', "'"),
+    ('&nbsp;', ' ')
+)
+
+
+def _latin1_to_utf8(text):
+    # Identity for ASCII text, so the round trip is skipped there
+    if text.isascii():
+        return text
+    try:
+        return bytes(text, "latin-1").decode("utf-8", "replace")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return text
+
+
+def _clean_tweet(text):
+    if not isinstance(text, str):
+        return ""
+    text = _latin1_to_utf8(html.unescape(text))
+    if 'RT @' in text:
+        text = _RETWEET_RE.sub('', text)
+    if '@' in text:
+        text = _MENTION_RE.sub('', text)
+    if 'http' in text:
+        text = _URL_RE.sub('', text)
+    if not text.isascii():
+        text = _INVISIBLE_RE.sub('', text)
+    return ' '.join(text.split())
+
+
+def _clean_text(text):
+    if not isinstance(text, str):
+        return str(text) if text is not None else ""
+    text = _latin1_to_utf8(text)
+    if '&' in text:
+        # In order, so "&amp;lt;" still becomes "<"
+        for entity, char in _HTML_ENTITIES:
+            text = text.replace(entity, char)
+    if '#' in text:
+        text = _HASHTAG_RE.sub('', text)
+    if '\\' in text or '\x00' in text:
+        text = text.translate(_BACKSLASH_NUL)
+    return ' '.join(text.split())
+
+
+PROFILES = {
+    "tweet": _clean_tweet,  # ScrapingUtils.remove_tags_and_links
+    "clean_text": _clean_text,  # TwitterScraper.clean_text
+}
+
+
+class TextNormalizer:
+    """Cleaner for one profile in PROFILES with a bounded LRU cache for strings"""
+
+    def __init__(self, profile, cache_size=TEXT_CACHE_SIZE):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown text profile: {profile}")
+        self.profile = profile
+        self._clean = PROFILES[profile]
+        self._cached = lru_cache(maxsize=cache_size)(self._clean) if cache_size else self._clean
+
+    def clean(self, text):
+        if isinstance(text, str):
+            return self._cached(text)
+        return self._clean(text)
+
+
+_normalizers = {}
+
+
+def get_normalizer(profile):
+    """Shared normalizer (and cache) for ``profile``"""
+    if profile not in _normalizers:
+        _normalizers[profile] = TextNormalizer(profile)
+    return _normalizers[profile]
+
+
+class SessionManager:
+    """Keeps one keep-alive aiohttp session (with DNS cache) open for the whole scraper run."""
+
+    def __init__(self, limit=100, limit_per_host=20, keepalive_timeout=30, dns_cache_ttl=300,
+                 connect_timeout=10, read_timeout=60):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self._session = None
+
+    async def get_session(self):
+        """Return the shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        """Close the session and every pooled connection"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_END = object()
+
+
+class CursorPrefetcher:
+    """
+    Iterates cursor-paginated pages as (page_number, response), fetching up to
+    ``depth`` pages ahead of the caller in a background task (0 = no read-ahead).
+    Stops after the page without a next cursor, after ``max_pages``, or after a
+    falsy response, which is still yielded.
+    """
+
+    def __init__(self, fetch_page, next_cursor, max_pages, depth=2, first_cursor=None):
+        self.fetch_page = fetch_page
+        self.next_cursor = next_cursor
+        self.max_pages = max_pages
+        self.depth = max(0, depth)
+        self.first_cursor = first_cursor
+
+    async def _pages(self):
+        cursor = self.first_cursor
+        for page in range(self.max_pages):
+            if page > 0 and not cursor:
+                return
+            response = await self.fetch_page(cursor)
+            if not response:
+                yield page, response
+                return
+            cursor = self.next_cursor(response)
+            yield page, response
+
+    async def _produce(self, queue):
+        try:
+            async for item in self._pages():
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_END)
+
+    async def __aiter__(self):
+        if self.depth == 0:
+            async for item in self._pages():
+                yield item
+            return
+
+        queue = asyncio.Queue(maxsize=self.depth)
+        producer = asyncio.create_task(self._produce(queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+
+
+class Paginator:
+    """
+    Stop rules for a timeline or comment thread, so a bottom cursor that keeps
+    coming back without new tweets does not burn requests. ``advance(cursor,
+    ids)`` is called with each fetched page and gives the cursor to fetch
+    next, or None once the cursor is missing or repeated, ``max_empty_pages``
+    pages in a row were empty, ``max_stale_pages`` pages in a row held only
+    known ids, or ``max_pages`` (None: unbounded) pages are done. A resumed
+    chain passes its checkpointed ``first_cursor`` and ``pages_done``.
+    ``stop(reason)`` ends it early; the first reason wins in ``stop_reason``.
+    """
+
+    def __init__(self, max_pages, first_cursor=None, pages_done=0, max_empty_pages=2, max_stale_pages=2):
+        self.max_pages = max_pages
+        self.pages = pages_done
+        self.max_empty_pages = max(1, max_empty_pages)
+        self.max_stale_pages = max(1, max_stale_pages)
+        self.cursors = {first_cursor} if first_cursor else set()
+        self.ids = set()
+        self.empty_run = 0
+        self.stale_run = 0
+        self.stop_reason = None
+
+    def advance(self, cursor, ids):
+        if self.stop_reason:
+            return None
+        self.pages += 1
+        ids = list(ids)
+        if not ids:
+            self.empty_run += 1
+            if self.empty_run >= self.max_empty_pages:
+                return self.stop("empty_pages")
+        else:
+            self.empty_run = 0
+            new_ids = [item for item in ids if item is None or item not in self.ids]
+            self.ids.update(item for item in new_ids if item is not None)
+            self.stale_run = 0 if new_ids else self.stale_run + 1
+            if self.stale_run >= self.max_stale_pages:
+                return self.stop("no_new_ids")
+        if not cursor:
+            return self.stop("end_of_results")
+        if cursor in self.cursors:
+            return self.stop("repeated_cursor")
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return self.stop("max_pages")
+        self.cursors.add(cursor)
+        return cursor
+
+    def stop(self, reason):
+        if self.stop_reason is None:
+            self.stop_reason = reason
+        return None
+
+
+class CheckpointStore:
+    """
+    Pagination progress per key ("user:<id>", "thread:<tweet id>"): the next
+    cursor and the pages done, so an interrupted run resumes instead of
+    refetching. Written atomically (temp file + fsync + replace) every
+    ``save_every`` updates and on ``save()``.
+
+    Items collected along the way (a thread's comments) are not part of that
+    file: each page's items are appended to the key's spill file
+    (``<checkpoint>_items/<key>.jsonl``), which is fsynced before the
+    checkpoint that counts the page is written. A save therefore costs the
+    same however many comments a thread holds.
+    """
+
+    def __init__(self, filepath="checkpoints.json", save_every=5):
+        self.filepath = filepath
+        self.save_every = max(1, save_every)
+        self.state = {}
+        self.spill_dir = f"{os.path.splitext(filepath)[0]}_items" if filepath else None
+        self._spill_files = {}
+        self._spilled = {}  # without a file: pages kept in memory
+        self._unsaved = 0
+        if filepath and os.path.exists(filepath):
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error reading {filepath}: {e}. Starting fresh.")
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, f"{key.replace(':', '_')}.jsonl")
+
+    def _read_spill(self, key):
+        if not self.spill_dir:
+            return list(self._spilled.get(key, []))
+        pages = []
+        try:
+            with open(self._spill_path(key), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # a torn last line, written after the last checkpoint
+                    pages.append((record["page"], record["items"]))
+        except FileNotFoundError:
+            pass
+        return pages
+
+    def _open_spill(self, key):
+        """Open a spill file for appending, dropping a line torn by an earlier crash"""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = self._spill_path(key)
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+        return open(path, 'a', encoding='utf-8')
+
+    def get(self, key):
+        """(cursor, pages done, items) for ``key``; (None, 0, []) to start from the top"""
+        progress = self.state.get(key)
+        if not progress:
+            return None, 0, []
+        if "items" in progress:  # written before items were spilled
+            return progress["cursor"], progress["pages"], progress["items"]
+        if not progress.get("spilled"):
+            return progress["cursor"], progress["pages"], []
+        # Pages spilled after the last checkpoint are fetched again; a page spilled twice counts once
+        by_page = {page: items for page, items in self._read_spill(key) if page < progress["pages"]}
+        if len(by_page) != progress["pages"]:
+            print(f"Items of {key} are incomplete, starting it again")
+            self.finish(key)
+            return None, 0, []
+        items = []
+        for page in sorted(by_page):
+            items.extend(by_page[page])
+        return progress["cursor"], progress["pages"], items
+
+    def update(self, key, cursor, pages, items=None):
+        """Record that ``pages`` pages of ``key`` are done, the last of them holding ``items``"""
+        progress = {"cursor": cursor, "pages": pages}
+        if items is not None:
+            if self.spill_dir:
+                spill = self._spill_files.get(key)
+                if spill is None:
+                    spill = self._spill_files[key] = self._open_spill(key)
+                spill.write(json.dumps({"page": pages - 1, "items": items}, ensure_ascii=False, default=str) + '\n')
+            else:
+                self._spilled.setdefault(key, []).append((pages - 1, items))
+            progress["spilled"] = True
+        self.state[key] = progress
+        self._changed()
+
+    def finish(self, key):
+        spill = self._spill_files.pop(key, None)
+        if spill is not None:
+            spill.close()
+        self._spilled.pop(key, None)
+        if self.spill_dir and os.path.exists(self._spill_path(key)):
+            os.remove(self._spill_path(key))
+        if self.state.pop(key, None) is not None:
+            self._changed()
+
+    def _changed(self):
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        if not self.filepath or not self._unsaved:
+            return
+        # The checkpoint must never count a spilled page that is not on disk yet
+        for spill in self._spill_files.values():
+            spill.flush()
+            os.fsync(spill.fileno())
+        temp_file = f"{self.filepath}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.filepath)
+            self._unsaved = 0
+        except Exception as e:
+            print(f"Error writing to {self.filepath}: {e}")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
+class UserIdResolver:
+    """
+    username -> rest_id lookups through the /user endpoint, kept in a JSON
+    cache file for ``ttl`` seconds so later runs skip them. ``request(url,
+    params)`` is the scraper's async request function (which applies its rate
+    limiting). ``resolve_many`` looks a whole list up concurrently, at most
+    ``max_concurrency`` at a time, and yields (username, rest_id) pairs as
+    each one completes; rest_id is None when the lookup failed.
+    """
+    url = "https://twitter241.p.rapidapi.com/user"
+
+    def __init__(self, request, cache_file="user_ids.json", ttl=7 * 24 * 3600, max_concurrency=5):
+        self.request = request
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = {}
+        self._unsaved = False
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error reading {cache_file}: {e}. Starting fresh.")
+
+    def cached(self, username):
+        """Cached rest_id of ``username`` if it has not expired"""
+        entry = self.cache.get(username.lower())
+        if entry and time.time() - entry["resolved_at"] < self.ttl:
+            return entry["rest_id"]
+        return None
+
+    async def resolve(self, username):
+        rest_id = self.cached(username)
+        if rest_id:
+            return rest_id
+        try:
+            data = await self.request(self.url, {"username": username})
+        except Exception as e:
+            print(f"Error getting user info for {username}: {e}")
+            return None
+        try:
+            rest_id = data['result']['data']['user']['result']['rest_id']
+        except (KeyError, TypeError) as e:
+            print(f"Key error: {e} - Expected key path was not found in the response for {username}.")
+            return None
+        print(f"User ID (rest_id) for {username}: {rest_id}")
+        self.cache[username.lower()] = {"rest_id": rest_id, "resolved_at": time.time()}
+        self._unsaved = True
+        return rest_id
+
+    async def resolve_many(self, usernames):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def lookup(username):
+            async with semaphore:
+                return username, await self.resolve(username)
+
+        tasks = [asyncio.create_task(lookup(username)) for username in dict.fromkeys(usernames) if username]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.save()
+
+    def save(self):
+        if not self.cache_file or not self._unsaved:
+            return
+        temp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.cache_file)
+            self._unsaved = False
+        except Exception as e:
+            print(f"Error writing to {self.cache_file}: {e}")
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+
 class ScrapingUtils:
+    async def _get_session(self):
+        """Shared pooled session, created on first use if none was injected"""
+        if getattr(self, 'session_manager', None) is None:
+            self.session_manager = SessionManager()
+        return await self.session_manager.get_session()
+
+    async def close_session(self):
+        """Close the pooled session"""
+        if getattr(self, 'session_manager', None) is not None:
+            await self.session_manager.close()
+
     async def make_async_requests(self, url, headers, params):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                try:
-                    response_text = await response.text()
-                    return await response.json()
-                except aiohttp.client_exceptions.ContentTypeError as e:
-                    print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
-                    return None
-                except Exception as e:
-                    print(f"Error: {e}")
-                    return None
+        session = await self._get_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            try:
+                return await response.json()
+            except aiohttp.client_exceptions.ContentTypeError as e:
+                print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
+                return None
+            except Exception as e:
+                print(f"Error: {e}")
+                return None
 
     @staticmethod
     def j_extract(json_data, path, default=None) -> List:
         """j_extract"""
-        _x = jsonpath(json_data, path)
+        _x = find_all(json_data, path)
         return _x if _x else default
 
     def j_extract_first(self, json_data, path, default=None):
         """j_extract_first"""
-        for _x in self.j_extract(json_data, path, default=default) or []:
+        for _x in find_all(json_data, path, first_only=True) or default or []:
             return _x
         return default
 
@@ -61,12 +731,7 @@ class ScrapingUtils:
         :param timestamp: The input timestamp string.
         :return: A string in the format 'd-m-y h:m:s'.
         """
-        # Parse the input timestamp string into a datetime object
-
-        dt = datetime.strptime(timestamp, "%a %b %d %H:%M:%S %z %Y")
-
-        # Format the datetime object into the desired format
-        return dt.strftime("%d-%m-%Y %H:%M:%S")
+        return format_created_at(timestamp)
 
     def contains_keywords(self, text, keywords):
         return any(keyword.lower() in text.lower() for keyword in keywords)
@@ -83,35 +748,7 @@ class ScrapingUtils:
         return dt.strftime("%d-%m-%Y %H:%M:%S")
 
     def remove_tags_and_links(self, text):
-        if not isinstance(text, str):
-            return ""
-
-        # First unescape any HTML entities
-        text = html.unescape(text)
-
-        # Handle unicode escape sequences
-        try:
-            text = bytes(text, "latin-1").decode("utf-8", "replace")
-        except (UnicodeEncodeError, UnicodeDecodeError):
-            pass
-
-        # Basic cleanups
-        text = re.sub(r'RT @\w+:', '', text)
-        text = re.sub(r'@\w+', '', text)
-        text = re.sub(r'https?://\S+', '', text)
-
-        # Handle other special characters
-        text = text.replace('\n', ' ')
-        text = text.replace('\r', ' ')
-        text = text.replace('\t', ' ')
-
-        # Remove zero-width characters
-        text = re.sub(r'[\u200b-\u200f\u2028-\u202f\u205f-\u206f]', '', text)
-
-        # Normalize whitespace
-        text = ' '.join(text.split())
-
-        return text.strip()
+        return get_normalizer("tweet").clean(text)
 
     def extract_usernames_from_queries(self,queries):
         usernames = []
@@ -10,20 +10,101 @@ COMMENTS_URL = "https://twitter241.p.rapidapi.com/comments"  # Changed from TWIT
 
 # API Headers
 HEADERS = {
-    "x-rapidapi-key": os.getenv("RAPID_API_KEY"),
+    "x-rapidapi-key": os.getenv("RAPID_API_KEY", ""),
     "x-rapidapi-host": "twitter241.p.rapidapi.com"
 }
 
+# API Key Pool: comma-separated RAPID_API_KEYS, falling back to the single RAPID_API_KEY
+RAPID_API_KEYS = [key.strip() for key in (os.getenv("RAPID_API_KEYS") or os.getenv("RAPID_API_KEY") or "").split(",")
+                  if key.strip()]
+KEY_RATE_PER_SECOND = 10
+KEY_BURST = 10
+KEY_DAILY_QUOTA = 10000  # requests per key per UTC day, None for unlimited
+KEY_QUARANTINE_SECONDS = 30  # without Retry-After; doubled for every consecutive 429/403
+
 # API Rate Limits
 RATE_LIMIT_PER_SECOND = 10
+RATE_LIMIT_BURST = 10  # requests allowed back-to-back before the rate applies
+# Per-endpoint token buckets: endpoint -> (calls per second, burst)
+ENDPOINT_RATE_LIMITS = {
+    "search": (10, 10),
+    "comments": (10, 10),
+    "user": (5, 5),
+}
 MAX_RETRIES = 3
 BACKOFF_TIME = 1  # seconds
 
+# Adaptive (AIMD) throttling: RATE_LIMIT_PER_SECOND is the starting rate
+ADAPTIVE_MIN_RATE = 1
+ADAPTIVE_MAX_RATE = 50
+ADAPTIVE_INITIAL_CONCURRENCY = 10
+ADAPTIVE_MIN_CONCURRENCY = 1
+ADAPTIVE_MAX_CONCURRENCY = 50
+ADAPTIVE_DECREASE_FACTOR = 0.5
+ADAPTIVE_LATENCY_TOLERANCE = 2.0  # back off when latency exceeds baseline by this factor
+
+# HTTP Connection Pool
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTIONS_PER_HOST = 20
+HTTP_KEEPALIVE_TIMEOUT = 30  # seconds an idle connection is kept open
+HTTP_DNS_CACHE_TTL = 300  # seconds
+HTTP_CONNECT_TIMEOUT = 10  # seconds
+HTTP_READ_TIMEOUT = 60  # seconds
+
 # Data Storage
 DEFAULT_OUTPUT_DIR = "twitter_data"
-DEFAULT_FILENAME = "tweets.json"
+DEFAULT_FILENAME = "tweets.jsonl"
+KEY_STATE_FILE = os.path.join(DEFAULT_OUTPUT_DIR, "key_state.json")
+STORAGE_BACKEND = "jsonl"  # "jsonl" (append-only log) or "sqlite"
+STORAGE_FSYNC_POLICY = "batch"  # "always", "batch" or "never"
+STORAGE_FSYNC_BATCH_SIZE = 100  # records between fsyncs in "batch" mode
+ID_INDEX_MERGE_THRESHOLD = 10000  # unsorted tweet IDs kept before merging the ID index
+CHECKPOINT_FILE = os.path.join(DEFAULT_OUTPUT_DIR, "checkpoints.json")  # crawl cursors for resuming
+CHECKPOINT_EVERY_PAGES = 5  # search/comment pages recorded between checkpoint writes
+WATERMARK_FILE = os.path.join(DEFAULT_OUTPUT_DIR, "watermarks.json")  # newest tweet seen per query
 
 # Crawling Settings
 MAX_COMMENT_PAGES = 5
+MAX_CONCURRENT_TWEETS = 10  # tweets (with their comment threads) processed in parallel; 1 = sequential
+PREFETCH_DEPTH = 2  # search pages fetched ahead of the one being processed; 0 = no read-ahead
+TEXT_CACHE_SIZE = 4096  # cleaned texts remembered per normalizer profile (repeated spam replies); 0 = no cache
+PARSE_WORKERS = 0  # processes that decode and extract pages in TwitterCrawler.crawl; 0 = on the event loop
+STREAM_PAGES = True  # without parse workers, decode entries from the response stream as they arrive
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read from the response per step when streaming
+INCREMENTAL_CRAWL = True  # stop a query at the first page of tweets already seen by an earlier complete crawl
+SINCE_OPERATOR = None  # None, "since_id" or "since": narrow incremental searches with a query operator
+# Tweets already in the output file are skipped by later runs too, so their stored records (likes,
+# views, comments) are never refreshed. False: only tweets stored earlier in the same run are skipped;
+# re-runs, and pages fetched again after a resume, append new copies of tweets already stored.
+DEDUP_ACROSS_RUNS = True
+
+# Comment fetch policy: checked from the raw tweet payload before any comment request
+COMMENT_POLICY = {
+    "skip_retweets": True,  # replies belong to the original tweet, not the retweet
+    "skip_quotes": False,  # quote tweets have replies of their own
+    "min_replies": 1,  # tweets reporting fewer replies are skipped; tweets without a count are fetched
+    "min_engagement": 0,  # likes + shares + replies below this are skipped
+}
+COMMENTS_PER_PAGE = 100  # comments requested per comment page, used to estimate saved calls
+
+# Pagination: a cursor chain stops after this many pages in a row without items
+# (only cursor entries) or without any ID not seen earlier in the chain
+PAGINATION_MAX_EMPTY_PAGES = 2
+PAGINATION_MAX_STALE_PAGES = 2
+
+# Staged pipeline (main.py): workers and bounded queue size per stage
+USE_PIPELINE = True
+PIPELINE_WORKERS = {
+    "search": 2,
+    "extract": 1,
+    "comments": 10,  # comment threads fetched at the same time
+    "write": 1,
+}
+PIPELINE_QUEUE_SIZES = {
+    "pages": 2,  # parsed search pages (up to 1000 tweets each)
+    "threads": 100,  # tweets waiting for their comment thread
+    "records": 100,  # finished tweets waiting to be written
+}
+PIPELINE_STATS_INTERVAL = 10  # seconds between stage statistics log lines
 TWEETS_PER_REQUEST = "1000"
 DEFAULT_SEARCH_TYPE = "Latest"
\ No newline at end of file
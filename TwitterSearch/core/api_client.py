@@ -1,29 +1,91 @@
+import asyncio
+import time
 import aiohttp
-from typing import Dict, Optional, Any
-from config.settings import BASE_URL, COMMENTS_URL, HEADERS
+from typing import Callable, Dict, Optional, Any, Union
+from config.settings import (
+    BASE_URL, COMMENTS_URL, HEADERS, ENDPOINT_RATE_LIMITS,
+    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, MAX_RETRIES
+)
+from utils.adaptive_controller import AdaptiveController
+from utils.key_pool import KeyPool
 from utils.rate_limiter import RateLimiter
+from utils.session_manager import SessionManager
 from .scraping_utils import ScrapingUtils
 
 class TwitterAPIClient(ScrapingUtils):
-    def __init__(self, headers: Dict[str, str]):
+    def __init__(self, headers: Dict[str, str], session_manager: Optional[SessionManager] = None,
+                 key_pool: Optional[KeyPool] = None):
         self.headers = headers
+        self.key_pool = key_pool
+        self.session_manager = session_manager or SessionManager()
         self.base_url = BASE_URL
         self.comments_url = COMMENTS_URL
-        self.rate_limiter = RateLimiter(calls_per_second=1000)
+        # With a key pool each key has its own bucket; this one bounds the total rate
+        self.rate_limiter = RateLimiter(calls_per_second=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST,
+                                        endpoint_limits=ENDPOINT_RATE_LIMITS)
+        self.controller = AdaptiveController(self.rate_limiter)
 
 
-    async def _make_request(self, url: str, params: Dict[str, Any]) -> Optional[Dict]:
+    async def _make_request(self, url: str, params: Dict[str, Any], endpoint: str = "default",
+                            raw: bool = False,
+                            on_entry: Optional[Callable[[int, Dict], None]] = None) -> Union[Dict, bytes, None]:
         """
-        Make API request with rate limiting
+        Make API request with adaptive rate limiting.
+        Throttled (429) and server error (5xx) responses are retried up to
+        MAX_RETRIES times, honoring Retry-After. An error response is never
+        returned as data: other error statuses, and a last retry that fails
+        too, return None. With raw=True the response
+        body is returned as bytes, undecoded; with on_entry the timeline
+        entries are streamed to it (see make_async_request_with_status).
         """
-        await self.rate_limiter.acquire()
-        return await self.make_async_requests(url, self.headers, params)
+        for attempt in range(MAX_RETRIES + 1):
+            request_headers = self.headers
+            api_key = None
+            if self.key_pool is not None:
+                api_key = await self.key_pool.acquire()
+                request_headers = {**self.headers, "x-rapidapi-key": api_key.key}
+
+            await self.controller.acquire()
+            start = time.monotonic()
+            try:
+                await self.rate_limiter.acquire(endpoint)
+                start = time.monotonic()
+                status, headers, data = await self.make_async_request_with_status(
+                    url, request_headers, params, raw=raw, on_entry=on_entry)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.controller.record(None, time.monotonic() - start, attempt=attempt, endpoint=endpoint)
+                raise
+            finally:
+                await self.controller.release()
+
+            retry_after = headers.get("Retry-After")
+            # A rejected key is quarantined when another key can take over; the retry then
+            # goes out straight away, without pausing requests on the other keys
+            rotated = api_key is not None and self.key_pool.report(api_key, status, retry_after)
+            delay = self.controller.record(status, time.monotonic() - start, retry_after,
+                                           attempt=attempt, endpoint=endpoint, pause=not rotated)
+            if rotated and attempt < MAX_RETRIES:
+                continue
+            if status != 429 and status < 500:
+                if status >= 400:
+                    print(f"HTTP {status} from {endpoint}")
+                    return None
+                return data
+            if attempt < MAX_RETRIES:
+                print(f"HTTP {status} from {endpoint}, retrying in {delay:.2f}s "
+                      f"(limit {self.controller.limit}, rate {self.controller.rate:.1f}/s)")
+                await asyncio.sleep(delay)
+        print(f"HTTP {status} from {endpoint}, giving up after {MAX_RETRIES} retries")
+        return None
 
 
     async def search_tweets(self, query: str, count: str = "1000",
-                            search_type: str = "Latest", cursor: Optional[str] = None) -> Optional[Dict]:
+                            search_type: str = "Latest", cursor: Optional[str] = None,
+                            raw: bool = False,
+                            on_entry: Optional[Callable[[int, Dict], None]] = None) -> Union[Dict, bytes, None]:
         """
-        Search tweets using the Twitter API
+        Search tweets using the Twitter API (raw=True returns the body bytes,
+        on_entry receives the entries while the body is streamed)
         """
         querystring = {
             "type": search_type,
@@ -34,15 +96,18 @@ class TwitterAPIClient(ScrapingUtils):
             querystring['cursor'] = cursor
 
         try:
-            return await self._make_request(self.base_url, querystring)
+            return await self._make_request(self.base_url, querystring, endpoint="search", raw=raw,
+                                            on_entry=on_entry)
         except Exception as e:
             print(f"Error in search_tweets: {e}")
             return None
 
     async def fetch_comments(self, tweet_id: str, count: str = "100",
-                             cursor: Optional[str] = None) -> Optional[Dict]:
+                             cursor: Optional[str] = None, raw: bool = False,
+                             on_entry: Optional[Callable[[int, Dict], None]] = None) -> Union[Dict, bytes, None]:
         """
-        Fetch comments for a specific tweet
+        Fetch comments for a specific tweet (raw=True returns the body bytes,
+        on_entry receives the entries while the body is streamed)
         """
         querystring = {
             "pid": tweet_id,
@@ -53,7 +118,8 @@ class TwitterAPIClient(ScrapingUtils):
             querystring['cursor'] = cursor
 
         try:
-            return await self._make_request(self.comments_url, querystring)
+            return await self._make_request(self.comments_url, querystring, endpoint="comments", raw=raw,
+                                            on_entry=on_entry)
         except Exception as e:
             print(f"Error fetching comments: {e}")
             return None
\ No newline at end of file
@@ -0,0 +1,148 @@
+# core/checkpoint.py
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, IO, List, Optional, Tuple
+
+from config.settings import CHECKPOINT_FILE, CHECKPOINT_EVERY_PAGES
+from utils.state_file import load_json_state, save_json_state
+from .records import Comment, record_default
+
+
+class CheckpointStore:
+    """
+    Durable pagination progress, so an interrupted crawl resumes where it
+    stopped instead of paying again for every page already fetched.
+
+    For each query it keeps the cursor of the next search page and the number
+    of pages done; for each comment thread in progress, the next cursor and
+    the pages done. Finished queries and threads are dropped. The file is
+    rewritten atomically (temp file + fsync + replace) after every
+    ``save_every`` recorded pages and on ``save()``.
+
+    The comments of a thread in progress are not part of that file: each
+    page is appended to the thread's spill file (``<checkpoint>_threads/<tweet_id>.jsonl``),
+    which is fsynced before the checkpoint that counts it is written. A
+    checkpoint write therefore costs the same however many comments are held.
+    """
+
+    def __init__(self, filepath: Optional[str] = CHECKPOINT_FILE, save_every: int = CHECKPOINT_EVERY_PAGES):
+        self.filepath = filepath
+        self.save_every = max(1, save_every)
+        self.queries: Dict[str, Dict] = {}
+        self.threads: Dict[str, Dict] = {}
+        self.spill_dir = f"{os.path.splitext(filepath)[0]}_threads" if filepath else None
+        self._spill_files: Dict[str, IO] = {}
+        self._spilled: Dict[str, List[Tuple[int, List[Comment]]]] = {}  # without a file: pages kept in memory
+        self._unsaved = 0
+        if filepath:
+            state = load_json_state(filepath, default={})
+            self.queries = state.get("queries", {})
+            self.threads = state.get("threads", {})
+
+    def query(self, query: str) -> Tuple[Optional[str], int]:
+        """(cursor of the next page, pages done) for ``query``; (None, 0) to start from the top"""
+        progress = self.queries.get(query)
+        if not progress:
+            return None, 0
+        return progress["cursor"], progress["pages"]
+
+    def update_query(self, query: str, cursor: str, pages: int) -> None:
+        self.queries[query] = {"cursor": cursor, "pages": pages, "updated_at": datetime.now().isoformat()}
+        self._changed()
+
+    def finish_query(self, query: str) -> None:
+        if self.queries.pop(query, None) is not None:
+            self._changed()
+
+    def _spill_path(self, tweet_id: str) -> str:
+        return os.path.join(self.spill_dir, f"{tweet_id}.jsonl")
+
+    def _read_spill(self, tweet_id: str) -> List[Tuple[int, List[Comment]]]:
+        if not self.spill_dir:
+            return list(self._spilled.get(tweet_id, []))
+        pages = []
+        try:
+            with open(self._spill_path(tweet_id), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # a torn last line, written after the last checkpoint
+                    pages.append((record["page"], [Comment.from_dict(comment) for comment in record["comments"]]))
+        except FileNotFoundError:
+            pass
+        return pages
+
+    def _open_spill(self, tweet_id: str) -> IO:
+        """Open a spill file for appending, dropping a line torn by an earlier crash"""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = self._spill_path(tweet_id)
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+        return open(path, 'a', encoding='utf-8')
+
+    def thread(self, tweet_id: str) -> Tuple[Optional[str], int, List[Comment]]:
+        """(next cursor, pages done, comments so far) of a comment thread"""
+        progress = self.threads.get(tweet_id)
+        if not progress:
+            return None, 0, []
+        if "comments" in progress:  # written before comments were spilled
+            comments = [Comment.from_dict(comment) if isinstance(comment, dict) else comment
+                        for comment in progress["comments"]]
+            return progress["cursor"], progress["pages"], comments
+        # Pages spilled after the last checkpoint are fetched again; a page spilled twice counts once
+        by_page = {page: comments for page, comments in self._read_spill(tweet_id) if page < progress["pages"]}
+        if len(by_page) != progress["pages"]:
+            print(f"Comments of tweet {tweet_id} are incomplete, fetching the thread again")
+            self.finish_thread(tweet_id)
+            return None, 0, []
+        comments = []
+        for page in sorted(by_page):
+            comments.extend(by_page[page])
+        return progress["cursor"], progress["pages"], comments
+
+    def update_thread(self, tweet_id: str, cursor: str, pages: int, comments: List[Comment]) -> None:
+        """Record that ``pages`` pages of a thread are done, the last of them holding ``comments``"""
+        if self.spill_dir:
+            spill = self._spill_files.get(tweet_id)
+            if spill is None:
+                spill = self._spill_files[tweet_id] = self._open_spill(tweet_id)
+            spill.write(json.dumps({"page": pages - 1, "comments": comments},
+                                   ensure_ascii=False, default=record_default) + '\n')
+        else:
+            self._spilled.setdefault(tweet_id, []).append((pages - 1, comments))
+        self.threads[tweet_id] = {"cursor": cursor, "pages": pages}
+        self._changed()
+
+    def finish_thread(self, tweet_id: str) -> None:
+        spill = self._spill_files.pop(tweet_id, None)
+        if spill is not None:
+            spill.close()
+        self._spilled.pop(tweet_id, None)
+        if self.spill_dir and os.path.exists(self._spill_path(tweet_id)):
+            os.remove(self._spill_path(tweet_id))
+        if self.threads.pop(tweet_id, None) is not None:
+            self._changed()
+
+    def _changed(self) -> None:
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self) -> bool:
+        """Write the checkpoint file atomically; True if it is up to date"""
+        if not self.filepath or not self._unsaved:
+            return True
+        # The checkpoint must never count a spilled page that is not on disk yet
+        for spill in self._spill_files.values():
+            spill.flush()
+            os.fsync(spill.fileno())
+        if not save_json_state(self.filepath, {"queries": self.queries, "threads": self.threads}):
+            return False
+        self._unsaved = 0
+        return True
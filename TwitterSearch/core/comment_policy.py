@@ -0,0 +1,69 @@
+# core/comment_policy.py
+
+import math
+from typing import Any, Dict, Optional
+
+from config.settings import COMMENT_POLICY, COMMENTS_PER_PAGE
+from .records import Tweet
+
+
+class CommentFetchPolicy:
+    """
+    Decides from a tweet's raw payload signals (retweeted_status_result,
+    is_quote_status, reply_count and engagement) whether its comment thread
+    is worth fetching, before any comment request is made.
+
+    Every skipped thread is counted with its reason, along with an estimate
+    of the comment requests it saved: the pages its reply count would take
+    (at least the first one), up to ``max_pages``.
+    """
+
+    def __init__(self, skip_retweets: bool = True, skip_quotes: bool = False, min_replies: int = 1,
+                 min_engagement: int = 0, max_pages: int = 50, comments_per_page: int = COMMENTS_PER_PAGE):
+        self.skip_retweets = skip_retweets
+        self.skip_quotes = skip_quotes
+        self.min_replies = min_replies
+        self.min_engagement = min_engagement
+        self.max_pages = max_pages
+        self.comments_per_page = max(1, comments_per_page)
+        self.checked = 0
+        self.skipped: Dict[str, int] = {}
+        self.calls_saved = 0
+
+    @classmethod
+    def from_settings(cls, max_pages: int = 50) -> "CommentFetchPolicy":
+        return cls(max_pages=max_pages, **COMMENT_POLICY)
+
+    def skip_reason(self, tweet: Tweet) -> Optional[str]:
+        """Why the thread of ``tweet`` should not be fetched, None to fetch it"""
+        if not tweet.id:
+            return "no_id"
+        if self.skip_retweets and tweet.is_retweet:
+            return "retweet"
+        if self.skip_quotes and tweet.is_quote:
+            return "quote"
+        replies = tweet.reply_count
+        if replies is not None and replies < self.min_replies:
+            return "no_replies"
+        if self.min_engagement and tweet.likes + tweet.shares + (replies or 0) < self.min_engagement:
+            return "low_engagement"
+        return None
+
+    def should_fetch(self, tweet: Tweet) -> bool:
+        """True to fetch the comment thread of ``tweet``; skips are counted"""
+        self.checked += 1
+        reason = self.skip_reason(tweet)
+        if reason is None:
+            return True
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+        pages = math.ceil((tweet.reply_count or 0) / self.comments_per_page)
+        self.calls_saved += min(self.max_pages, max(1, pages))
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checked": self.checked,
+            "fetched": self.checked - sum(self.skipped.values()),
+            "skipped": dict(self.skipped),
+            "calls_saved": self.calls_saved
+        }
@@ -2,18 +2,48 @@
 
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
+from config.settings import STORAGE_BACKEND, STORAGE_FSYNC_POLICY, STORAGE_FSYNC_BATCH_SIZE
+from .id_index import TweetIdIndex
+from .records import record_default
+from .sqlite_handler import SQLiteDataHandler
+
+FSYNC_POLICIES = ("always", "batch", "never")
+
 
 class TwitterDataHandler:
-    def __init__(self, output_dir: str = "data"):
+    """
+    Append-only tweet store.
+
+    Every write appends one JSON record per line to ``tweets.jsonl``:
+
+        {"op": "tweet", "tweet": {...}}
+        {"op": "comments", "tweet_id": "...", "comments": [...], "updated_at": "..."}
+
+    Saving a tweet therefore costs the same no matter how large the file is.
+    Readers fold later ``comments`` records into their tweets; ``compact()``
+    rewrites the log with the folded state.
+    """
+
+    def __init__(self, output_dir: str = "data", fsync_policy: str = STORAGE_FSYNC_POLICY,
+                 fsync_batch_size: int = STORAGE_FSYNC_BATCH_SIZE):
         """
         Initialize data handler with output directory and load existing IDs
+
+        fsync_policy: "always" fsyncs after every record, "batch" after every
+        ``fsync_batch_size`` records, "never" only flushes to the OS.
         """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
         self.output_dir = output_dir
+        self.fsync_policy = fsync_policy
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self._unsynced_writes = 0
+        self._log = None
         self._ensure_output_dir()
-        self._processed_ids = set()  # Track processed tweet IDs
+        self._processed_ids = None  # On-disk index of processed tweet IDs
         self._initialize_files()
 
     def _ensure_output_dir(self) -> None:
@@ -23,37 +53,112 @@ class TwitterDataHandler:
 
     def _initialize_files(self) -> None:
         """Initialize files and load processed IDs"""
-        self.tweet_file = os.path.join(self.output_dir, "tweets.json")
+        self.tweet_file = os.path.join(self.output_dir, "tweets.jsonl")
+        self.legacy_tweet_file = os.path.join(self.output_dir, "tweets.json")
+
+        # Carry over data written by the old read-modify-write format
+        if not os.path.exists(self.tweet_file) and os.path.exists(self.legacy_tweet_file):
+            self._migrate_legacy_file()
 
         # Create files if they don't exist
         if not os.path.exists(self.tweet_file):
             self._safe_write(self.tweet_file, [])
 
-        # Load processed IDs
-        existing_data = self._safe_read(self.tweet_file)
-        self._processed_ids = {tweet.get('tweet_id') for tweet in existing_data
-                               if tweet.get('tweet_id')}
+        self._recover_log()
+
+        # Open the ID index; only rebuild it from the log when it is missing or out of date
+        self._processed_ids = TweetIdIndex(self.output_dir, self.tweet_file)
+        if self._processed_ids.is_stale():
+            if os.path.getsize(self.tweet_file):
+                print(f"Rebuilding tweet ID index for {self.tweet_file}")
+            self._processed_ids.rebuild(record['tweet'].get('tweet_id') for record in self._iter_records()
+                                        if record.get('op') == 'tweet' and record['tweet'].get('tweet_id'))
+        else:
+            # Records appended after the last index sync may be missing from its tail
+            for record in self._iter_records(start=self._processed_ids.covered_size()):
+                if record.get('op') == 'tweet' and record['tweet'].get('tweet_id'):
+                    self._processed_ids.add(record['tweet']['tweet_id'])
+
+        self._log = open(self.tweet_file, 'a', encoding='utf-8')
 
-    def _safe_read(self, filepath: str) -> List[Dict]:
-        """Safely read JSON file"""
+    def _migrate_legacy_file(self) -> None:
+        """Convert an existing tweets.json array into the append-only log"""
         try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            with open(self.legacy_tweet_file, 'r', encoding='utf-8') as f:
+                legacy_data = json.load(f)
         except json.JSONDecodeError as e:
-            print(f"Error reading {filepath}: {e}. Starting fresh.")
-        return []
+            print(f"Error reading {self.legacy_tweet_file}: {e}. Starting fresh.")
+            return
+        self._safe_write(self.tweet_file, [{'op': 'tweet', 'tweet': tweet} for tweet in legacy_data])
 
-    def _safe_write(self, filepath: str, data: List[Dict]) -> bool:
+    def _recover_log(self) -> None:
+        """Drop a partially written last line left behind by a crash"""
+        with open(self.tweet_file, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+
+            # Walk back to the end of the last complete record
+            position = size
+            while position > 0:
+                step = min(4096, position)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b'\n')
+                if newline != -1:
+                    position += newline + 1
+                    break
+            print(f"Discarding {size - position} bytes of incomplete record in {self.tweet_file}")
+            f.truncate(position)
+
+    def _iter_records(self, start: int = 0) -> Iterator[Dict]:
+        """Yield every record of the log in write order, from byte offset ``start``"""
+        if self._log and not self._log.closed:
+            self._log.flush()
+        with open(self.tweet_file, 'rb') as f:
+            f.seek(start)
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    print(f"Skipping corrupt record at {self.tweet_file}:{f.tell()}: {e}")
+
+    @staticmethod
+    def _fold(records: Iterator[Dict], tweet_id: Optional[str] = None) -> List[Dict]:
+        """Apply comment updates to their tweets, keeping insertion order"""
+        tweets = {}
+        for record in records:
+            op = record.get('op')
+            if op == 'tweet':
+                tweet = record['tweet']
+                if tweet_id is None or tweet.get('tweet_id') == tweet_id:
+                    tweets.setdefault(tweet.get('tweet_id'), tweet)
+            elif op == 'comments':
+                tweet = tweets.get(record.get('tweet_id'))
+                if tweet is not None:
+                    tweet['comments'] = record['comments']
+                    tweet['updated_at'] = record['updated_at']
+        return list(tweets.values())
+
+    def _safe_write(self, filepath: str, records: List[Dict]) -> bool:
         """
-        Safely write data to file using atomic operation
+        Safely write records to file using atomic operation
         Returns True if successful, False otherwise
         """
         temp_file = f"{filepath}.tmp"
         try:
             # Write to temporary file first
             with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=record_default) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
             # Atomic replace
             os.replace(temp_file, filepath)
             return True
@@ -63,6 +168,41 @@ class TwitterDataHandler:
                 os.remove(temp_file)
             return False
 
+    def _append(self, record: Dict) -> bool:
+        """
+        Append a single record as one line
+        Returns True if successful, False otherwise
+        """
+        line = json.dumps(record, ensure_ascii=False, default=record_default) + '\n'
+        try:
+            # A single write of the whole line; a crash can only leave a
+            # truncated last line, which _recover_log discards on next start
+            self._log.write(line)
+            self._log.flush()
+            self._unsynced_writes += 1
+            if self.fsync_policy == 'always' or (
+                    self.fsync_policy == 'batch' and self._unsynced_writes >= self.fsync_batch_size):
+                self.sync()
+            return True
+        except Exception as e:
+            print(f"Error appending to {self.tweet_file}: {e}")
+            return False
+
+    def sync(self) -> None:
+        """Force buffered records to disk"""
+        if self._log and not self._log.closed:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._processed_ids.sync()
+        self._unsynced_writes = 0
+
+    def close(self) -> None:
+        """Flush pending records and close the log"""
+        if self._log and not self._log.closed:
+            self.sync()
+            self._log.close()
+            self._processed_ids.close()
+
     def save_tweet(self, tweet_data: Dict) -> bool:
         """
         Save a single tweet if it's not a duplicate
@@ -72,15 +212,27 @@ class TwitterDataHandler:
         if not tweet_id or tweet_id in self._processed_ids:
             return False
 
-        existing_data = self._safe_read(self.tweet_file)
         tweet_data['crawled_at'] = datetime.now().isoformat()
-        existing_data.append(tweet_data)
 
-        if self._safe_write(self.tweet_file, existing_data):
+        if self._append({'op': 'tweet', 'tweet': tweet_data}):
             self._processed_ids.add(tweet_id)
             return True
         return False
 
+    def save_tweets(self, tweets: List[Dict]) -> int:
+        """
+        Save a batch of tweets, skipping duplicates
+        Returns the number of tweets saved
+        """
+        policy, self.fsync_policy = self.fsync_policy, 'never'
+        try:
+            saved = sum(1 for tweet_data in tweets if self.save_tweet(tweet_data))
+        finally:
+            self.fsync_policy = policy
+        if saved and policy == 'always':
+            self.sync()
+        return saved
+
     def update_tweet_comments(self, tweet_id: str, comments: List[Dict]) -> bool:
         """
         Update existing tweet with comments
@@ -89,39 +241,62 @@ class TwitterDataHandler:
         if not tweet_id or tweet_id not in self._processed_ids:
             return False
 
-        existing_data = self._safe_read(self.tweet_file)
-        updated = False
-
-        for tweet in existing_data:
-            if tweet.get('tweet_id') == tweet_id:
-                tweet['comments'] = comments
-                tweet['updated_at'] = datetime.now().isoformat()
-                updated = True
-                break
+        return self._append({
+            'op': 'comments',
+            'tweet_id': tweet_id,
+            'comments': comments,
+            'updated_at': datetime.now().isoformat()
+        })
 
-        if updated:
-            return self._safe_write(self.tweet_file, existing_data)
-        return False
+    def compact(self) -> bool:
+        """
+        Rewrite the log with comment updates folded into their tweets
+        Returns True if successful, False otherwise
+        """
+        tweets = self._fold(self._iter_records())
+        self.close()
+        try:
+            return self._safe_write(self.tweet_file, [{'op': 'tweet', 'tweet': tweet} for tweet in tweets])
+        finally:
+            self._log = open(self.tweet_file, 'a', encoding='utf-8')
+            self._processed_ids = TweetIdIndex(self.output_dir, self.tweet_file)
+            self._processed_ids.mark_log_rewritten()
 
     def get_tweet(self, tweet_id: str) -> Optional[Dict]:
         """Get single tweet by ID"""
-        existing_data = self._safe_read(self.tweet_file)
-        for tweet in existing_data:
-            if tweet.get('tweet_id') == tweet_id:
-                return tweet
+        if tweet_id not in self._processed_ids:
+            return None
+        for tweet in self._fold(self._iter_records(), tweet_id=tweet_id):
+            return tweet
         return None
 
     def get_all_tweets(self) -> List[Dict]:
         """Get all stored tweets"""
-        return self._safe_read(self.tweet_file)
+        return self._fold(self._iter_records())
 
     def get_tweet_count(self) -> int:
         """Get total number of stored tweets"""
         return len(self._processed_ids)
 
+    def has_tweet(self, tweet_id: str) -> bool:
+        """Check whether a tweet is already stored"""
+        return tweet_id in self._processed_ids
+
     def clear_all_data(self) -> None:
         """Clear all stored data"""
+        self.close()
         if os.path.exists(self.tweet_file):
             os.remove(self.tweet_file)
-        self._processed_ids.clear()
-        self._initialize_files()
\ No newline at end of file
+        if os.path.exists(self.legacy_tweet_file):
+            os.remove(self.legacy_tweet_file)
+        self._initialize_files()
+        self._processed_ids.rebuild(())
+
+
+def create_data_handler(output_dir: str = "data", backend: str = STORAGE_BACKEND):
+    """Create the tweet store for the configured backend ("jsonl" or "sqlite")"""
+    if backend == "jsonl":
+        return TwitterDataHandler(output_dir)
+    if backend == "sqlite":
+        return SQLiteDataHandler(output_dir)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -1,95 +1,148 @@
 # core/extractors.py
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable, NamedTuple, Tuple, Type, Union
+from .records import Comment, Record, Tweet, intern_str, user_refs
 from .scraping_utils import ScrapingUtils
+from utils.json_path import find_all, find_first
+
+
+class FieldSpec(NamedTuple):
+    """
+    One record field read relative to a tweet's ``result`` node.
+
+    ``coerce`` is a callable or the name of a ScrapingUtils method; it is only
+    applied to truthy values. A missing value becomes ``default`` (called if it
+    is callable, so list defaults are not shared), as does a falsy one unless
+    ``default`` is None. ``many`` collects every match instead of the first
+    one. An empty ``path`` gives a constant field.
+    """
+    name: str
+    path: str
+    coerce: Union[Callable, str, None] = None
+    default: Any = None
+    many: bool = False
+
+
+def _intern_all(values: List[str]) -> List[str]:
+    return [intern_str(value) for value in values]
+
+
+TWEET_RESULT_PATH = "$..content.itemContent.tweet_results.result"
+COMMENT_RESULT_PATH = "$..content.items[0].item.itemContent.tweet_results.result"
+
+TWEET_FIELDS = (
+    FieldSpec("id", "legacy.id_str"),
+    FieldSpec("content", "legacy.full_text", "remove_tags_and_links"),
+    FieldSpec("datetime", "legacy.created_at", "convert_timestamp"),
+    FieldSpec("likes", "legacy.favorite_count", int, 0),
+    FieldSpec("shares", "legacy.retweet_count", int, 0),
+    FieldSpec("views", "views.count", int),
+    FieldSpec("source", "", default="TWITTER"),
+    FieldSpec("media", "legacy.entities.media[*].media_url_https", many=True),
+    FieldSpec("username", "core.user_results.result.legacy.screen_name", intern_str),
+    FieldSpec("is_blueTick", "core.user_results.result.is_blue_verified"),
+    FieldSpec("followers", "core.user_results.result.legacy.followers_count", int, 0),
+    FieldSpec("hashtags", "legacy.entities.hashtags[*].text", _intern_all, many=True),
+    FieldSpec("user_mentions", "legacy.entities.user_mentions.*", user_refs, list, many=True),
+    FieldSpec("created_at", "legacy.created_at", "timestamp_to_epoch"),  # epoch seconds, not stored
+    # Comment fetch policy signals read from the raw payload, not stored
+    FieldSpec("reply_count", "legacy.reply_count", int),  # None when the payload has no count
+    FieldSpec("is_retweet", "legacy.retweeted_status_result", bool, False),
+    FieldSpec("is_quote", "legacy.is_quote_status", bool, False),
+)
+
+COMMENT_FIELDS = (
+    FieldSpec("content", "legacy.full_text", "remove_tags_and_links"),
+    FieldSpec("likes", "legacy.favorite_count", int, 0),
+    FieldSpec("shares", "legacy.retweet_count", int, 0),
+    FieldSpec("views", "views.count", int),
+    FieldSpec("media", "legacy.entities.media[*].media_url_https", many=True),
+    FieldSpec("is_blueTick", "core.user_results.result.is_blue_verified"),
+    FieldSpec("followers", "core.user_results.result.legacy.followers_count"),
+)
+
+# (path, many, coerce, default) with coerce resolved to a callable
+BoundField = Tuple[str, bool, Optional[Callable], Any]
+
 
 class TwitterDataExtractor(ScrapingUtils):
-    async def extract_tweet_data(self, c: Dict) -> Optional[Dict]:
-        """Extract tweet data using custom json extraction"""
+    """
+    Schema-driven extraction: the ``result`` node of an entry is located once
+    and every field of TWEET_FIELDS / COMMENT_FIELDS is read relative to it
+    into a Tweet / Comment record.
+    """
+
+    def __init__(self):
+        self._tweet_fields = self._bind(TWEET_FIELDS, Tweet)
+        self._comment_fields = self._bind(COMMENT_FIELDS, Comment)
+
+    def _bind(self, fields: Tuple[FieldSpec, ...], record_type: Type[Record]) -> Tuple[BoundField, ...]:
+        if tuple(spec.name for spec in fields) != record_type.__slots__:
+            raise ValueError(f"Fields do not match the {record_type.__name__} record")
+        bound = []
+        for spec in fields:
+            coerce = getattr(self, spec.coerce) if isinstance(spec.coerce, str) else spec.coerce
+            bound.append((spec.path, spec.many, coerce, spec.default))
+        return tuple(bound)
+
+    @staticmethod
+    def _fill(node: Dict, fields: Tuple[BoundField, ...]) -> List[Any]:
+        """Field values in record order"""
+        values = []
+        for path, many, coerce, default in fields:
+            matches = (find_all(node, path) if many else find_first(node, path)) if path else False
+            value = (matches if many else matches[0]) if matches else None
+            if value:
+                values.append(coerce(value) if coerce else value)
+            elif matches and default is None:
+                values.append(value)
+            else:
+                values.append(default() if callable(default) else default)
+        return values
+
+    def parse_tweet(self, c: Dict) -> Optional[Tweet]:
+        """Extract one search/timeline entry; None if it has no tweet text and id"""
         try:
-            content = self.j_extract_first(c, "$..content.itemContent.tweet_results.result.legacy.full_text")
-            content = self.remove_tags_and_links(content) if content else None
-            idd = self.j_extract_first(c, "$..content.itemContent.tweet_results.result.legacy.id_str")
-
-            tweet_datetime = self.j_extract_first(c, "$..content.itemContent.tweet_results.result.legacy.created_at")
-            if tweet_datetime:
-                tweet_datetime = self.convert_timestamp(tweet_datetime)
-
-            username = self.j_extract_first(c, "$..content.itemContent.tweet_results.result.core.user_results.result.legacy.screen_name")
-            source = "TWITTER"
-
-            media = self.j_extract(c, "$..content.itemContent.tweet_results.result.legacy.entities.media[*].media_url_https")
-            likes = int(self.j_extract_first(c, "$..content.itemContent.tweet_results.result.legacy.favorite_count") or 0)
-            shares = int(self.j_extract_first(c, "$..content.itemContent.tweet_results.result.legacy.retweet_count") or 0)
-            views = self.j_extract_first(c, "$..content.itemContent.tweet_results.result.views.count")
-            is_blue = self.j_extract_first(c, "$..content.itemContent.tweet_results.result.core.user_results.result.is_blue_verified")
-            followers = int(self.j_extract_first(c, "$..content.itemContent.tweet_results.result.core.user_results.result.legacy.followers_count") or 0)
-
-            if views:
-                views = int(views)
-
-            hashtags = self.j_extract(c, "$..content.itemContent.tweet_results.result.legacy.entities.hashtags[*].text")
-            user_mentions = self.j_extract(c, "$..content.itemContent.tweet_results.result.legacy.entities.user_mentions.*")
-            user_mention_list = []
-
-            if user_mentions:
-                for mention in user_mentions:
-                    name = mention["name"]
-                    screen_name = mention["screen_name"]
-                    user_mention_list.append({"name": name, "screen_name": screen_name})
-
-            if content and idd:
-                return {
-                    "id": idd,
-                    "content": content,
-                    "datetime": tweet_datetime,
-                    "likes": likes,
-                    "shares": shares,
-                    "views": views,
-                    "source": source,
-                    "media": media,
-                    "username": username,
-                    "is_blueTick": is_blue,
-                    "followers": followers,
-                    "hashtags": hashtags,
-                    "user_mentions": user_mention_list
-                }
+            node = find_first(c, TWEET_RESULT_PATH)
+            if not node:
+                return None
+            record = Tweet(*self._fill(node[0], self._tweet_fields))
+            if record.content and record.id:
+                return record
             return None
 
         except Exception as e:
             print(f"Error extracting tweet data: {e}")
             return None
 
-    async def extract_comment_data(self, c: Dict) -> Optional[Dict]:
-        """Extract comment data using custom json extraction"""
+    def parse_comment(self, c: Dict) -> Optional[Comment]:
+        """Extract one conversation entry; None if it has no text"""
         try:
+            node = find_first(c, COMMENT_RESULT_PATH)
+            if not node:
+                return None
+            record = Comment(*self._fill(node[0], self._comment_fields))
+            if record.content:
+                return record
+            return None
 
-            content = self.j_extract_first(c, "$..content.items[0].item.itemContent.tweet_results.result.legacy.full_text")
-            content = self.remove_tags_and_links(content) if content else None
-
-            media = self.j_extract(c, "$..content.itemContent.tweet_results.result.legacy.entities.media[*].media_url_https")
-
-            likes = int(self.j_extract_first(c, "$..content.items[0].item.itemContent.tweet_results.result.legacy.favorite_count") or 0)
-            shares = int(self.j_extract_first(c, "$..content.items[0].item.itemContent.tweet_results.result.legacy.retweet_count") or 0)
-            views = self.j_extract_first(c, "$..content.itemContent.tweet_results.result.views.count")
+        except Exception as e:
+            print(f"Error extracting comment data: {e}")
+            return None
 
-            is_blue = self.j_extract_first(c, "$..content.items[0].item.itemContent.tweet_results.result.core.user_results.result.is_blue_verified")
-            followers = self.j_extract_first(c, "$..content.items[0].item.itemContent.tweet_results.result.core.user_results.result.legacy.followers_count")
+    def extract_tweets(self, entries: List[Dict]) -> List[Tweet]:
+        """Extract every tweet of a page of entries, skipping non-tweet entries"""
+        parse = self.parse_tweet
+        return [record for record in map(parse, entries) if record]
 
-            if views:
-                views = int(views)
+    def extract_comments(self, entries: List[Dict]) -> List[Comment]:
+        """Extract every comment of a page of conversation entries"""
+        parse = self.parse_comment
+        return [record for record in map(parse, entries) if record]
 
-            if content:
-                return {
-                    "content": content,
-                    "likes": likes,
-                    "shares": shares,
-                    "views": views,
-                    "media": media,
-                    "is_blueTick": is_blue,
-                    "followers": followers
-                }
-            return None
+    async def extract_tweet_data(self, c: Dict) -> Optional[Tweet]:
+        """Extract tweet data using custom json extraction"""
+        return self.parse_tweet(c)
 
-        except Exception as e:
-            print(f"Error extracting comment data: {e}")
-            return None
\ No newline at end of file
+    async def extract_comment_data(self, c: Dict) -> Optional[Comment]:
+        """Extract comment data using custom json extraction"""
+        return self.parse_comment(c)
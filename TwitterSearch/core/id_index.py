@@ -0,0 +1,203 @@
+# core/id_index.py
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+from array import array
+from typing import Iterable, Optional
+
+from config.settings import ID_INDEX_MERGE_THRESHOLD
+
+
+class TweetIdIndex:
+    """
+    On-disk set of stored tweet IDs.
+
+    ``tweet_ids.idx`` holds sorted fixed-width (uint64) IDs and is memory-mapped,
+    so opening it is constant time and membership is a binary search.
+    New IDs are appended to ``tweet_ids.tail`` and merged into the sorted file
+    once the tail reaches ``merge_threshold`` entries.
+    ``tweet_ids.meta`` records how much of the log the index is known to
+    cover (written on every merge and sync) together with the log's inode
+    and a hash of the record ending there. A log that was truncated,
+    replaced or rewritten, whatever its size, no longer matches and the
+    owner rebuilds; records past the covered size are re-read on startup.
+    """
+
+    ITEM_SIZE = array('Q').itemsize
+
+    def __init__(self, index_dir: str, log_file: str, merge_threshold: int = ID_INDEX_MERGE_THRESHOLD):
+        self.log_file = log_file
+        self.merge_threshold = max(1, merge_threshold)
+        self.index_file = os.path.join(index_dir, "tweet_ids.idx")
+        self.tail_file = os.path.join(index_dir, "tweet_ids.tail")
+        self.meta_file = os.path.join(index_dir, "tweet_ids.meta")
+        self._map = None
+        self._ids = ()
+        self._tail = set()
+        self._tail_log = None
+        self._load()
+
+    def _load(self) -> None:
+        """Map the sorted IDs and read the (bounded) tail"""
+        self._close_files()
+        if os.path.exists(self.index_file) and os.path.getsize(self.index_file) >= self.ITEM_SIZE:
+            with open(self.index_file, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            usable = len(self._map) - len(self._map) % self.ITEM_SIZE
+            self._ids = memoryview(self._map)[:usable].cast('Q')
+
+        self._tail = set()
+        if os.path.exists(self.tail_file):
+            tail = array('Q')
+            with open(self.tail_file, 'rb') as f:
+                data = f.read()
+            tail.frombytes(data[:len(data) - len(data) % self.ITEM_SIZE])
+            self._tail = {tweet_id for tweet_id in tail if not self._in_sorted(tweet_id)}
+        self._tail_log = open(self.tail_file, 'ab')
+
+    def _close_files(self) -> None:
+        if self._tail_log and not self._tail_log.closed:
+            self._tail_log.close()
+        if isinstance(self._ids, memoryview):
+            self._ids.release()
+        if self._map is not None:
+            self._map.close()
+        self._map = None
+        self._ids = ()
+
+    def _in_sorted(self, tweet_id: int) -> bool:
+        position = bisect.bisect_left(self._ids, tweet_id)
+        return position < len(self._ids) and self._ids[position] == tweet_id
+
+    @staticmethod
+    def _to_int(tweet_id) -> Optional[int]:
+        try:
+            value = int(tweet_id)
+        except (TypeError, ValueError):
+            return None
+        return value if 0 <= value < 2 ** 64 else None
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self.meta_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _edge_hash(self, size: int) -> Optional[str]:
+        """Hash of the last record ending at byte ``size`` of the log"""
+        if size <= 0:
+            return None
+        with open(self.log_file, 'rb') as f:
+            start = max(0, size - 65536)
+            f.seek(start)
+            data = f.read(size - start)
+        if len(data) != size - start:
+            return None
+        record_start = data.rfind(b'\n', 0, len(data) - 1) + 1
+        return hashlib.sha256(data[record_start:]).hexdigest()
+
+    def _write_meta(self) -> None:
+        stat = os.stat(self.log_file)
+        temp_file = f"{self.meta_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "log_size": stat.st_size,
+                "log_inode": stat.st_ino,
+                "log_device": stat.st_dev,
+                "edge_hash": self._edge_hash(stat.st_size)
+            }, f)
+        os.replace(temp_file, self.meta_file)
+
+    def is_stale(self) -> bool:
+        """True if the index cannot be trusted for the current log"""
+        meta = self._read_meta()
+        if meta is None or not os.path.exists(self.index_file):
+            return True
+        stat = os.stat(self.log_file)
+        if (stat.st_ino, stat.st_dev) != (meta.get("log_inode"), meta.get("log_device")):
+            return True
+        size = meta.get("log_size", 0)
+        if stat.st_size < size:
+            return True
+        return self._edge_hash(size) != meta.get("edge_hash")
+
+    def covered_size(self) -> int:
+        """Log offset up to which every tweet ID is known to be in the index"""
+        meta = self._read_meta() or {}
+        return meta.get("log_size", 0)
+
+    def __contains__(self, tweet_id) -> bool:
+        value = self._to_int(tweet_id)
+        if value is None:
+            return False
+        return value in self._tail or self._in_sorted(value)
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._tail)
+
+    def add(self, tweet_id) -> bool:
+        """
+        Add a single ID
+        Returns True if added, False if already present or not a numeric ID
+        """
+        value = self._to_int(tweet_id)
+        if value is None:
+            print(f"Cannot index non-numeric tweet id: {tweet_id!r}")
+            return False
+        if value in self._tail or self._in_sorted(value):
+            return False
+        self._tail_log.write(array('Q', [value]).tobytes())
+        self._tail_log.flush()
+        self._tail.add(value)
+        if len(self._tail) >= self.merge_threshold:
+            self.merge()
+        return True
+
+    def sync(self) -> None:
+        """Force appended IDs to disk; call after the log itself was synced"""
+        if self._tail_log and not self._tail_log.closed:
+            self._tail_log.flush()
+            os.fsync(self._tail_log.fileno())
+            self._write_meta()
+
+    def merge(self, extra_ids: Iterable = ()) -> None:
+        """Fold the tail (and any extra IDs) into the sorted file"""
+        merged = array('Q')
+        if len(self._ids):
+            merged.frombytes(self._ids.tobytes())
+        merged.extend(self._tail)
+        merged.extend(value for value in map(self._to_int, extra_ids) if value is not None)
+        merged = array('Q', sorted(set(merged)))
+
+        temp_file = f"{self.index_file}.tmp"
+        with open(temp_file, 'wb') as f:
+            merged.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        self._close_files()
+        os.replace(temp_file, self.index_file)
+        self._write_meta()
+        # Anything still in the tail is now also in the sorted file
+        open(self.tail_file, 'wb').close()
+        self._load()
+
+    def rebuild(self, tweet_ids: Iterable) -> None:
+        """Replace the index contents with ``tweet_ids``"""
+        self._close_files()
+        for path in (self.index_file, self.tail_file):
+            if os.path.exists(path):
+                os.remove(path)
+        self._load()
+        self.merge(tweet_ids)
+
+    def mark_log_rewritten(self) -> None:
+        """Record the new log identity after the log was compacted in place"""
+        self._write_meta()
+
+    def close(self) -> None:
+        self.sync()
+        self._close_files()
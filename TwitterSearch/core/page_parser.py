@@ -0,0 +1,211 @@
+# core/page_parser.py
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Union
+
+from utils.json_path import find_first
+from .extractors import TWEET_RESULT_PATH, TwitterDataExtractor
+from .records import Comment, Tweet
+from .timeline import TimelineResolver
+
+# One extractor per process, created on first use inside pool workers
+_extractor: Optional[TwitterDataExtractor] = None
+# One resolver per process, so each process learns the endpoint layouts once
+_resolver = TimelineResolver()
+
+
+def _get_extractor() -> TwitterDataExtractor:
+    global _extractor
+    if _extractor is None:
+        _extractor = TwitterDataExtractor()
+    return _extractor
+
+
+def get_resolver() -> TimelineResolver:
+    return _resolver
+
+
+def _decode(data: Union[bytes, str, Dict, None]) -> Optional[Dict]:
+    if isinstance(data, (bytes, str)):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def search_page_cursor(response: Dict) -> Optional[str]:
+    """Bottom cursor of a search page"""
+    for path in ("cursor.bottom", "cursor.bottom.value"):
+        cursor = find_first(response, path)
+        if cursor and cursor[0]:
+            return cursor[0]
+    return None
+
+
+def search_page_entries(response: Dict) -> List[Dict]:
+    """Tweet entries of one search page (those of its TimelineAddEntries instruction)"""
+    return _resolver.entries("search", response)
+
+
+def search_page_tweet_ids(response: Dict) -> List[str]:
+    """IDs of the tweets of one search page, without extracting them"""
+    ids = []
+    for entry in search_page_entries(response) or []:
+        tweet_id = find_first(entry, f"{TWEET_RESULT_PATH}.legacy.id_str")
+        if tweet_id and tweet_id[0]:
+            ids.append(tweet_id[0])
+    return ids
+
+
+def entry_ids(entries: List[Dict]) -> List[Optional[str]]:
+    """Timeline entry IDs of a page of entries (None for an entry without one)"""
+    return [entry.get("entryId") if isinstance(entry, dict) else None for entry in entries]
+
+
+def comment_page_entries(comments_data: Optional[Dict]) -> Optional[List[Dict]]:
+    """Comment entries of one page without the leading/trailing cursor entries, None when exhausted"""
+    if not comments_data:
+        return None
+    comments_entries = _resolver.entries("comments", comments_data)
+    if not comments_entries or len(comments_entries) <= 2:  # Accounting for first/last entries
+        return None
+    return comments_entries[1:-1]
+
+
+def parse_search_page(data: Union[bytes, str, Dict, None]) -> Optional[Dict[str, Any]]:
+    """
+    Decode and extract one search page.
+
+    ``data`` is the raw response body or the decoded JSON. Returns
+    ``{"cursor", "entries", "tweets"}``, where ``entries`` is the number of
+    entries on the page, or None if the body is not a JSON object. This is a
+    module-level function so a ProcessPoolExecutor can run it.
+    """
+    response = _decode(data)
+    if not response:
+        return None
+    entries = search_page_entries(response) or []
+    return {
+        "cursor": search_page_cursor(response),
+        "entries": len(entries),
+        "tweets": _get_extractor().extract_tweets(entries)
+    }
+
+
+def parse_comment_page(data: Union[bytes, str, Dict, None]) -> Optional[Dict[str, Any]]:
+    """
+    Decode and extract one comment page: ``{"cursor", "ids", "comments"}``,
+    where ``ids`` are the entry IDs, or None when the body is empty or the
+    thread has no more comments.
+    """
+    comments_data = _decode(data)
+    entries = comment_page_entries(comments_data)
+    if entries is None:
+        return None
+    cursor = find_first(comments_data, "cursor.bottom")
+    return {
+        "cursor": cursor[0] if cursor else None,
+        "ids": entry_ids(entries),
+        "comments": _get_extractor().extract_comments(entries)
+    }
+
+
+class _TimelineStream(ABC):
+    """
+    Entries of the instruction the resolver expects for ``endpoint`` are
+    handled as they arrive; entries of other instructions are kept aside. If
+    the finished document shows the TimelineAddEntries instruction elsewhere,
+    the handled ones are discarded and the kept ones replayed.
+    """
+    endpoint = ""
+
+    def __init__(self, extractor: Optional[TwitterDataExtractor] = None):
+        self.extractor = extractor or _get_extractor()
+        self.index = _resolver.expected_index(self.endpoint)
+        self._other: Dict[int, List[Dict]] = {}
+        self._reset()
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Forget everything taken so far"""
+
+    @abstractmethod
+    def _take(self, entry: Dict) -> None:
+        """Handle one entry of the TimelineAddEntries instruction"""
+
+    def add(self, index: int, entry: Dict) -> None:
+        if index == self.index:
+            self._take(entry)
+        else:
+            self._other.setdefault(index, []).append(entry)
+
+    def _resolve(self, document: Dict) -> None:
+        layout = _resolver.layout(self.endpoint, document)
+        index = layout.index if layout else None
+        if index != self.index:
+            self._reset()
+            for entry in self._other.get(index, ()):
+                self._take(entry)
+        self._other.clear()
+
+
+class SearchPageStream(_TimelineStream):
+    """
+    Builds the parse_search_page result while a search page is streamed:
+    pass ``add`` as the request's on_entry and call ``finish`` with the
+    returned document. Tweets are extracted as their entries arrive, so only
+    the records are kept, never the raw page.
+    """
+    endpoint = "search"
+
+    def _reset(self) -> None:
+        self.entries = 0
+        self.tweets: List[Tweet] = []
+
+    def _take(self, entry: Dict) -> None:
+        self.entries += 1
+        record = self.extractor.parse_tweet(entry)
+        if record:
+            self.tweets.append(record)
+
+    def finish(self, response: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        if not response:
+            return None
+        self._resolve(response)
+        return {"cursor": search_page_cursor(response), "entries": self.entries, "tweets": self.tweets}
+
+
+class CommentPageStream(_TimelineStream):
+    """
+    Streaming counterpart of parse_comment_page. The first and last entries
+    of a page are cursors, so each entry is only extracted once the next one
+    has arrived.
+    """
+    endpoint = "comments"
+
+    def _reset(self) -> None:
+        self.entries = 0
+        self.comments: List[Comment] = []
+        self.ids: List[Optional[str]] = []
+        self._held: Optional[Dict] = None
+
+    def _take(self, entry: Dict) -> None:
+        self.entries += 1
+        if self.entries > 2:
+            self.ids.extend(entry_ids([self._held]))
+            record = self.extractor.parse_comment(self._held)
+            if record:
+                self.comments.append(record)
+        if self.entries > 1:
+            self._held = entry
+
+    def finish(self, comments_data: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        if not comments_data:
+            return None
+        self._resolve(comments_data)
+        if self.entries <= 2:  # Accounting for first/last entries
+            return None
+        cursor = find_first(comments_data, "cursor.bottom")
+        return {"cursor": cursor[0] if cursor else None, "ids": self.ids, "comments": self.comments}
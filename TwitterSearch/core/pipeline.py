@@ -0,0 +1,285 @@
+# core/pipeline.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from config.settings import (
+    PIPELINE_WORKERS, PIPELINE_QUEUE_SIZES, PIPELINE_STATS_INTERVAL, INCREMENTAL_CRAWL, SINCE_OPERATOR
+)
+from .checkpoint import CheckpointStore
+from .records import Comment, Tweet
+from utils.paginator import Paginator
+
+logger = logging.getLogger(__name__)
+
+
+class StageStats:
+    """Items handled by one pipeline stage and its input queue depth"""
+
+    def __init__(self, name: str, queue: asyncio.Queue):
+        self.name = name
+        self.queue = queue
+        self.processed = 0
+        self.busy_time = 0.0
+        self.started = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "processed": self.processed,
+            "per_second": round(self.processed / elapsed, 2),
+            "busy_seconds": round(self.busy_time, 2),
+            "queue": f"{self.queue.qsize()}/{self.queue.maxsize}"
+        }
+
+
+class QueryProgress:
+    """
+    Search pages of one query whose tweets are still on their way to the
+    writer. The query's checkpoint only advances past a page once every
+    tweet of that page and of all earlier pages has been written.
+    """
+
+    def __init__(self, query: str, checkpoints: CheckpointStore, first_page: int):
+        self.query = query
+        self.checkpoints = checkpoints
+        self.next_page = first_page
+        self.pages: Dict[int, List[Any]] = {}  # page -> [tweets not yet written, cursor after it]
+        self.search_finished = False
+        self.reached_end = False  # the last page of the results was read, not just max_batches
+
+    def opened(self, page: int, tweets: int, cursor: Optional[str]) -> None:
+        self.pages[page] = [tweets, cursor]
+        self._advance()
+
+    def written(self, page: int, tweets: int = 1) -> None:
+        """``tweets`` of ``page`` were written, or will never reach the writer"""
+        self.pages[page][0] -= tweets
+        self._advance()
+
+    def _advance(self) -> None:
+        while self.pages.get(self.next_page, (1,))[0] == 0:
+            _, cursor = self.pages.pop(self.next_page)
+            self.next_page += 1
+            if cursor:
+                self.checkpoints.update_query(self.query, cursor, self.next_page)
+
+
+class TweetJob:
+    """A tweet waiting for its comment thread before it can be written"""
+
+    def __init__(self, query: str, tweet_data: Tweet, page: int = 0):
+        self.query = query
+        self.tweet_data = tweet_data
+        self.page = page
+        self.comments: List[Comment] = []
+
+
+class CrawlPipeline:
+    """
+    Crawl queries as four stages connected by bounded queues:
+
+        search pages -> tweet routing -> comment threads -> persistence
+
+    Search pages and comment threads are fetched through the crawler's own
+    fetch_search_page/process_comments, so streaming, parse workers, thread
+    checkpoints and pagination limits behave exactly as in
+    TwitterCrawler.crawl. Each stage has its own worker count. Bounded queues
+    give backpressure: a slow writer or slow comment fetchers make upstream
+    stages wait instead of buffering without limit. Queue depths and
+    per-stage throughput are logged every ``stats_interval`` seconds, which
+    shows the bottleneck.
+    """
+
+    def __init__(self, crawler, workers: Optional[Dict[str, int]] = None,
+                 queue_sizes: Optional[Dict[str, int]] = None, stats_interval: float = PIPELINE_STATS_INTERVAL,
+                 max_batches: int = 30, max_comment_pages: int = 50, incremental: bool = INCREMENTAL_CRAWL,
+                 since_operator: Optional[str] = SINCE_OPERATOR):
+        self.crawler = crawler
+        self.workers = {**PIPELINE_WORKERS, **(workers or {})}
+        sizes = {**PIPELINE_QUEUE_SIZES, **(queue_sizes or {})}
+        self.stats_interval = stats_interval
+        self.max_batches = max_batches
+        self.max_comment_pages = max_comment_pages
+        self.incremental = incremental
+        self.since_operator = since_operator
+        self.marks: Dict[str, Optional[int]] = {}  # query -> high-water mark at the start of its crawl
+
+        self.queries: asyncio.Queue = asyncio.Queue()
+        self.pages: asyncio.Queue = asyncio.Queue(maxsize=sizes["pages"])
+        self.threads: asyncio.Queue = asyncio.Queue(maxsize=sizes["threads"])
+        self.records: asyncio.Queue = asyncio.Queue(maxsize=sizes["records"])
+        self.progress: Dict[str, QueryProgress] = {}
+
+        self.stats = {
+            "search": StageStats("search", self.queries),
+            "extract": StageStats("extract", self.pages),
+            "comments": StageStats("comments", self.threads),
+            "write": StageStats("write", self.records)
+        }
+
+    async def _timed(self, stage: str, coro) -> Any:
+        start = time.monotonic()
+        try:
+            return await coro
+        finally:
+            self.stats[stage].busy_time += time.monotonic() - start
+
+    async def _search_worker(self) -> None:
+        """Stage 1: page through each query and hand parsed pages downstream"""
+        while True:
+            query = await self.queries.get()
+            checkpoints = self.crawler.checkpoints
+            cursor, first_batch = checkpoints.query(query)
+            paginator = Paginator(self.max_batches, cursor, first_batch)
+            try:
+                if cursor:
+                    logger.info(f"Resuming query {query!r} after {first_batch} pages")
+                progress = self.progress[query] = QueryProgress(query, checkpoints, first_batch)
+                watermarks = self.crawler.watermarks
+                mark = self.marks[query] = watermarks.mark(query) if self.incremental else None
+                search_query = watermarks.search_query(query, self.since_operator) if self.incremental else query
+                for batch in range(first_batch, self.max_batches):
+                    if not cursor and batch > first_batch:
+                        break
+                    page = await self._timed("search", self.crawler.fetch_search_page(search_query, cursor))
+                    if not page:
+                        logger.error(f"No response from API for query: {query}")
+                        paginator.stop("no_response")
+                        break
+                    # Error responses come back as None, so this is a successful empty page
+                    if not page["entries"]:
+                        logger.error(f"No tweets found in response for query: {query}")
+                        paginator.stop("no_entries")
+                        progress.search_finished = progress.reached_end = True
+                        break
+                    cursor = self.crawler.next_search_cursor(paginator, mark, page)
+                    if paginator.stop_reason == "seen_before":
+                        logger.info(f"Page {batch + 1} of {query!r} only has tweets seen before; stopping")
+                        progress.search_finished = progress.reached_end = True
+                        break
+                    self.stats["search"].processed += 1
+                    await self.pages.put((query, batch, cursor, page["tweets"]))
+                    if not cursor:
+                        progress.search_finished = True
+                        progress.reached_end = not page["cursor"]
+                else:
+                    progress.search_finished = True
+            except Exception as e:
+                logger.error(f"Error fetching search pages for {query}: {e}")
+                paginator.stop("error")
+            finally:
+                logger.info(f"Query {query!r} stopped paging: {paginator.stop_reason}")
+                self.queries.task_done()
+
+    async def _extract_worker(self) -> None:
+        """Stage 2: drop tweets seen before and route the rest to comment fetching or the writer"""
+        while True:
+            query, batch, cursor, tweets = await self.pages.get()
+            progress = self.progress[query]
+            queued = 0
+            try:
+                start = time.monotonic()
+                if self.incremental:
+                    tweets = self.crawler.watermarks.unseen(self.marks.get(query), tweets)
+                    self.crawler.watermarks.observe(query, tweets)
+                # Tweets stored by another query are neither written nor fetched again
+                tweets = self.crawler.claim_tweets(tweets, query)
+                self.stats["extract"].busy_time += time.monotonic() - start
+                progress.opened(batch, len(tweets), cursor)
+                for tweet_data in tweets:
+                    self.stats["extract"].processed += 1
+                    logger.info(f"Tweet {tweet_data.id} crawled")
+                    job = TweetJob(query, tweet_data, batch)
+                    if self.crawler.should_fetch_comments(tweet_data):
+                        await self.threads.put(job)
+                    else:
+                        await self.records.put(job)
+                    queued += 1
+            except Exception as e:
+                logger.error(f"Error extracting search page: {e}")
+                if batch not in progress.pages:
+                    progress.opened(batch, 0, cursor)
+                else:
+                    # Tweets that never reached a queue are not waited for, and another query may store them
+                    for tweet_data in tweets[queued:]:
+                        self.crawler.seen.release(tweet_data.id)
+                    progress.written(batch, len(tweets) - queued)
+            finally:
+                self.pages.task_done()
+
+    async def _comment_worker(self) -> None:
+        """Stage 3: fetch one tweet's comment thread, resuming it from its checkpoint"""
+        while True:
+            job = await self.threads.get()
+            try:
+                job.comments = await self._timed(
+                    "comments", self.crawler.process_comments(job.tweet_data.id, self.max_comment_pages))
+                self.stats["comments"].processed += 1
+            except Exception as e:
+                logger.error(f"Error fetching comments for Tweet {job.tweet_data.id}: {e}")
+            finally:
+                await self.records.put(job)
+                self.threads.task_done()
+
+    async def _write_worker(self) -> None:
+        """Stage 4: persist finished tweets"""
+        while True:
+            job = await self.records.get()
+            try:
+                record = self.crawler.make_record(job.tweet_data, job.comments, job.query)
+                start = time.monotonic()
+                self.crawler.save_to_json(data=record)
+                self.stats["write"].busy_time += time.monotonic() - start
+                self.stats["write"].processed += 1
+            except Exception as e:
+                logger.error(f"Error saving tweet: {e}")
+                self.crawler.seen.release(job.tweet_data.id)
+            finally:
+                self.progress[job.query].written(job.page)
+                self.records.task_done()
+
+    def stage_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            logger.info(f"Pipeline stages: {self.stage_stats()}")
+
+    async def run(self, queries: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Crawl every query through the pipeline; returns per-stage statistics"""
+        for query in queries:
+            self.queries.put_nowait(query)
+
+        workers = []
+        for stage, worker in (("search", self._search_worker), ("extract", self._extract_worker),
+                              ("comments", self._comment_worker), ("write", self._write_worker)):
+            workers.extend(asyncio.create_task(worker()) for _ in range(max(1, self.workers[stage])))
+        reporter = asyncio.create_task(self._report())
+
+        try:
+            # Each stage only finishes its items after handing them downstream,
+            # so draining the queues in order means everything was written
+            for queue in (self.queries, self.pages, self.threads, self.records):
+                await queue.join()
+        finally:
+            for task in workers + [reporter]:
+                task.cancel()
+            await asyncio.gather(*workers, reporter, return_exceptions=True)
+            for progress in self.progress.values():
+                if progress.search_finished and not progress.pages:
+                    self.crawler.checkpoints.finish_query(progress.query)
+                    if self.incremental and progress.reached_end:
+                        self.crawler.watermarks.commit(progress.query)
+            self.crawler.checkpoints.save()
+            self.crawler.watermarks.save()
+            self.crawler.seen.flush()
+
+        summary = self.stage_stats()
+        logger.info(f"Pipeline completed: {summary}")
+        logger.info(f"Comment fetch policy: {self.crawler.comment_policy.stats()}")
+        logger.info(f"Comment threads stopped: {self.crawler.pagination_stops}")
+        return summary
@@ -0,0 +1,98 @@
+# core/records.py
+
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+def intern_str(value: Any) -> Any:
+    """Intern strings that repeat across records (usernames, hashtags); other values pass through"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Record:
+    """
+    Fixed-field record with ``__slots__`` instead of a per-instance dict.
+
+    Subclasses list their fields in ``__slots__``; the constructor takes them
+    positionally in that order. Item access (``record["id"]``) is kept so code
+    written against the old dict records keeps working, and ``to_dict`` (or
+    ``record_default`` as a json ``default=`` hook) converts only when the
+    record is serialized.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values: Any):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __reduce__(self):
+        # Pickle as constructor arguments: smaller and faster than the slot state dict
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        """Record from a ``to_dict`` result (nested records stay dicts)"""
+        return cls(*(data.get(name) for name in cls.__slots__))
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def record_default(value: Any) -> Any:
+    """``default=`` hook for json.dump(s): serializes records met inside plain data"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class UserRef(Record):
+    """A mentioned user"""
+    __slots__ = ("name", "screen_name")
+
+
+class Tweet(Record):
+    """One extracted tweet; the fields are those of TWEET_FIELDS"""
+    __slots__ = ("id", "content", "datetime", "likes", "shares", "views", "source", "media", "username",
+                 "is_blueTick", "followers", "hashtags", "user_mentions", "created_at", "reply_count", "is_retweet",
+                 "is_quote")
+
+
+class Comment(Record):
+    """One extracted comment; the fields are those of COMMENT_FIELDS"""
+    __slots__ = ("content", "likes", "shares", "views", "media", "is_blueTick", "followers")
+
+
+def user_refs(mentions: List[Dict]) -> List[UserRef]:
+    return [UserRef(intern_str(mention["name"]), intern_str(mention["screen_name"])) for mention in mentions]
@@ -6,33 +6,79 @@ from jsonpath_ng import jsonpath, parse
 import hjson
 import requests
 from jsonpath import jsonpath
-from typing import Dict, Union, List
+from typing import Callable, Dict, Union, List, Optional
+from config.settings import STREAM_CHUNK_SIZE
+from utils.json_path import find_all, find_first
+from utils.json_stream import EntryStreamParser
+from utils.keyword_matcher import KeywordMatcher, get_keyword_matcher
+from utils.session_manager import SessionManager
+from utils.text_normalizer import get_normalizer
+from utils.timestamps import parse_twitter_timestamp
 
 class ScrapingUtils:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared pooled session, created on first use if none was injected"""
+        if getattr(self, 'session_manager', None) is None:
+            self.session_manager = SessionManager()
+        return await self.session_manager.get_session()
+
+    async def close_session(self) -> None:
+        """Close the pooled session"""
+        if getattr(self, 'session_manager', None) is not None:
+            await self.session_manager.close()
+
+    async def make_async_request_with_status(self, url, headers, params, raw=False, on_entry=None):
+        """
+        Make a GET request and return (status, response headers, decoded JSON or None).
+        With raw=True the undecoded body bytes are returned instead of the JSON.
+        With on_entry, a successful body is parsed from the stream: every
+        instructions[i].entries element is passed to on_entry(i, entry) as soon
+        as it is decoded, and the rest of the document is returned without them.
+        """
+        session = await self._get_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            if raw:
+                return response.status, response.headers, await response.read()
+            if on_entry is not None and response.status == 200:
+                return response.status, response.headers, await self._stream_entries(response, on_entry)
+            try:
+                # Ensure proper encoding of response
+                response.encoding = 'utf-8'
+                return response.status, response.headers, await response.json()
+            except aiohttp.client_exceptions.ContentTypeError as e:
+                print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
+                return response.status, response.headers, None
+            except Exception as e:
+                print(f"Error: {e}")
+                return response.status, response.headers, None
+
+    @staticmethod
+    async def _stream_entries(response: aiohttp.ClientResponse,
+                              on_entry: Callable[[int, Dict], None]) -> Optional[Dict]:
+        """Feed the body through an EntryStreamParser chunk by chunk; None if it is not valid JSON"""
+        parser = EntryStreamParser()
+        try:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                for index, entry in parser.feed(chunk):
+                    on_entry(index, entry)
+            return parser.close()
+        except ValueError as e:
+            print(f"Error: {e}, URL: {response.url}")
+            return None
+
     async def make_async_requests(self, url, headers, params):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                try:
-                    # Ensure proper encoding of response
-                    response.encoding = 'utf-8'
-                    response_text = await response.text()
-                    return await response.json()
-                except aiohttp.client_exceptions.ContentTypeError as e:
-                    print(f"ContentTypeError: {e.message}, URL: {e.request_info.url}")
-                    return None
-                except Exception as e:
-                    print(f"Error: {e}")
-                    return None
+        _, _, data = await self.make_async_request_with_status(url, headers, params)
+        return data
 
     @staticmethod
     def j_extract(json_data, path, default=None) -> List:
-        """j_extract with Unicode support"""
-        _x = jsonpath(json_data, path)
+        """j_extract with Unicode support; each path is compiled once and cached"""
+        _x = find_all(json_data, path)
         return _x if _x else default
 
     def j_extract_first(self, json_data, path, default=None):
-        """j_extract_first with Unicode support"""
-        for _x in self.j_extract(json_data, path, default=default) or []:
+        """j_extract_first with Unicode support; stops at the first match"""
+        for _x in find_first(json_data, path) or default or []:
             return _x
         return default
 
@@ -46,39 +92,41 @@ class ScrapingUtils:
 
     def normalize_text(self, text):
         """Normalize text while preserving non-English characters"""
-        if not isinstance(text, str):
-            return ""
-            
-        # Unescape HTML entities while preserving Unicode
-        text = html.unescape(text)
-        
-        # Handle common Twitter text artifacts
-        text = text.replace("\n", " ")
-        text = text.replace("\r", " ")
-        text = text.replace("\t", " ")
-        
-        # Remove URLs but keep the rest of the text intact
-        text = re.sub(r'https://t\.co/\S+', '', text)
-        
-        # Normalize whitespace while preserving Unicode characters
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        return get_normalizer("normalize").clean(text)
 
     def convert_timestamp(self, timestamp):
         """Convert timestamp with Unicode support"""
         try:
-            dt = datetime.strptime(timestamp, "%a %b %d %H:%M:%S %z %Y")
-            return dt.strftime("%d-%m-%Y %H:%M:%S")
+            return parse_twitter_timestamp(timestamp).formatted
+        except ValueError as e:
+            print(f"Error converting timestamp: {e}")
+            return None
+
+    def timestamp_to_epoch(self, timestamp) -> Optional[int]:
+        """Seconds since the epoch for a Twitter created_at string, None if invalid"""
+        try:
+            return parse_twitter_timestamp(timestamp).epoch
         except ValueError as e:
             print(f"Error converting timestamp: {e}")
             return None
 
+    @staticmethod
+    def _keyword_matcher(keywords: Union[KeywordMatcher, List[str]]) -> KeywordMatcher:
+        if isinstance(keywords, KeywordMatcher):
+            return keywords
+        return get_keyword_matcher(keywords)
+
     def contains_keywords(self, text, keywords):
-        """Check keywords with Unicode support"""
+        """Check keywords with Unicode support; ``keywords`` is a list or a KeywordMatcher"""
         if not isinstance(text, str):
             return False
-        return any(keyword.lower() in text.lower() for keyword in keywords)
+        return self._keyword_matcher(keywords).contains(text)
+
+    def matching_keywords(self, text, keywords) -> List[str]:
+        """Keywords that occur in ``text``, in the order they first occur"""
+        if not isinstance(text, str):
+            return []
+        return self._keyword_matcher(keywords).matches(text)
 
     def load_keywords(self, file_path):
         """Load keywords with Unicode support"""
@@ -86,27 +134,13 @@ class ScrapingUtils:
             keywords = file.read().splitlines()
         return keywords
 
+    def load_keyword_matcher(self, file_path, word_boundary=False) -> KeywordMatcher:
+        """Load a keyword file straight into a compiled KeywordMatcher"""
+        return KeywordMatcher(self.load_keywords(file_path), word_boundary)
+
     def remove_tags_and_links(self, text):
         """Clean text while preserving non-English characters"""
-        if not isinstance(text, str):
-            return ""
-
-        # Unescape HTML entities
-        text = html.unescape(text)
-
-        # Remove Twitter-specific patterns
-        text = re.sub(r'RT @\w+:', '', text)  # Remove retweet markers
-        text = re.sub(r'@(\w+)', r'\1', text)  # Remove '@' but keep the username
-        text = re.sub(r'https?://\S+', '', text)  # Remove URLs
-        text = re.sub(r'#(\w+)', r'\1', text)  # Remove '#' but keep the word
-
-        # Remove zero-width and invisible characters while keeping other Unicode
-        text = re.sub(r'[\u200b-\u200f\u2028-\u202f\u205f-\u206f]', '', text)
-
-        # Normalize whitespace while preserving Unicode characters
-        text = ' '.join(text.split())
-
-        return text.strip()
+        return get_normalizer("tweet").clean(text)
 
     def extract_usernames_from_queries(self, queries):
         """Extract usernames with Unicode support"""
@@ -0,0 +1,69 @@
+# core/seen_tweets.py
+
+import os
+from typing import Dict, List, Optional
+
+from config.settings import DEDUP_ACROSS_RUNS
+from utils.state_file import load_json_state, save_json_state
+
+
+class SeenTweets:
+    """
+    Tweet IDs already stored in the output file, shared by every query of a
+    crawler so overlapping queries store (and fetch comments for) each tweet
+    only once.
+
+    The first query to claim a tweet stores it with ``queries: [query]``.
+    Later queries that find it only add their name; those additions are
+    kept in memory and written to the stored records by ``flush``, once per
+    crawl rather than once per duplicate. With ``across_runs`` the set is
+    seeded from the output file, so tweets written before an interrupted
+    crawl are not written again when a resumed page is fetched a second
+    time; the price is that a stored tweet is never stored afresh.
+    """
+
+    def __init__(self, filepath: Optional[str] = None, across_runs: bool = DEDUP_ACROSS_RUNS):
+        self.filepath = filepath
+        self.queries: Dict[str, List[str]] = {}  # tweet id -> queries that found it
+        self.pending: Dict[str, List[str]] = {}  # tweet id -> queries not yet on the stored record
+        self.duplicates = 0
+        if filepath and across_runs:
+            for record in load_json_state(filepath, default=[]) or []:
+                if isinstance(record, dict) and record.get("tweet_id"):
+                    self.queries[record["tweet_id"]] = list(record.get("queries") or [])
+
+    def claim(self, tweet_id: str, query: Optional[str]) -> bool:
+        """
+        True if ``tweet_id`` has not been seen before and the caller should
+        store it; otherwise ``query`` is remembered for the stored record
+        """
+        queries = self.queries.get(tweet_id)
+        if queries is None:
+            self.queries[tweet_id] = [query] if query else []
+            return True
+        self.duplicates += 1
+        if query and query not in queries:
+            queries.append(query)
+            self.pending.setdefault(tweet_id, []).append(query)
+        return False
+
+    def release(self, tweet_id: str) -> None:
+        """Forget a claimed tweet that could not be stored, so another query may store it"""
+        self.queries.pop(tweet_id, None)
+        self.pending.pop(tweet_id, None)
+
+    def flush(self) -> None:
+        """Add the queries found since the last flush to the stored records"""
+        if not self.pending or not self.filepath or not os.path.exists(self.filepath):
+            return
+        records = load_json_state(self.filepath, default=None)
+        if not isinstance(records, list):
+            return
+        for record in records:
+            added = self.pending.get(record.get("tweet_id")) if isinstance(record, dict) else None
+            if added:
+                queries = record.setdefault("queries", [])
+                queries.extend(query for query in added if query not in queries)
+        # Atomic, so a crash mid-write cannot truncate the stored tweets
+        if save_json_state(self.filepath, records):
+            self.pending.clear()
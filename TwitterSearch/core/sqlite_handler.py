@@ -0,0 +1,204 @@
+# core/sqlite_handler.py
+
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional
+from datetime import datetime
+
+from config.settings import STORAGE_FSYNC_POLICY
+from .records import record_default
+
+# fsync policy -> PRAGMA synchronous level (WAL mode)
+SYNCHRONOUS_LEVELS = {
+    "always": "FULL",
+    "batch": "NORMAL",
+    "never": "OFF"
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    tweet_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    comments_count INTEGER,
+    crawled_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS comments (
+    tweet_id TEXT NOT NULL REFERENCES tweets(tweet_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (tweet_id, position)
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteDataHandler:
+    """
+    SQLite-backed tweet store with the same public methods as TwitterDataHandler.
+
+    Tweets are keyed by ``tweet_id`` and their comments live in a child table,
+    so lookups and comment updates go through the primary key index instead
+    of scanning the whole dataset.
+    """
+
+    def __init__(self, output_dir: str = "data", fsync_policy: str = STORAGE_FSYNC_POLICY):
+        """Initialize data handler with output directory and open the database"""
+        if fsync_policy not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
+        self.output_dir = output_dir
+        self.fsync_policy = fsync_policy
+        self._ensure_output_dir()
+        self._initialize_files()
+
+    def _ensure_output_dir(self) -> None:
+        """Create output directory and subdirectories"""
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+
+    def _initialize_files(self) -> None:
+        """Open the database and create the schema"""
+        self.db_file = os.path.join(self.output_dir, "tweets.db")
+        self._conn = sqlite3.connect(self.db_file)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={SYNCHRONOUS_LEVELS[self.fsync_policy]}")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _comment_rows(tweet_id: str, comments: List[Dict]) -> List[tuple]:
+        return [(tweet_id, position, json.dumps(comment, ensure_ascii=False, default=record_default))
+                for position, comment in enumerate(comments)]
+
+    def _load_comments(self, tweet_id: str) -> List[Dict]:
+        rows = self._conn.execute(
+            "SELECT data FROM comments WHERE tweet_id = ? ORDER BY position", (tweet_id,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def _row_to_tweet(self, tweet_id: str, data: str, comments_count: Optional[int]) -> Dict:
+        tweet = json.loads(data)
+        if comments_count is not None:
+            tweet['comments'] = self._load_comments(tweet_id)
+        return tweet
+
+    def save_tweets(self, tweets: List[Dict]) -> int:
+        """
+        Upsert a batch of tweets in one transaction: a tweet already stored
+        gets the new data (and comments, when the record carries them)
+        Returns the number of tweets that were not stored before
+        """
+        crawled_at = datetime.now().isoformat()
+        saved = 0
+        try:
+            with self._conn:
+                for tweet_data in tweets:
+                    tweet_id = tweet_data.get('tweet_id')
+                    if not tweet_id:
+                        continue
+                    record = dict(tweet_data)
+                    record['crawled_at'] = crawled_at
+                    comments = record.pop('comments', None)
+                    is_new = not self.has_tweet(tweet_id)
+                    self._conn.execute(
+                        "INSERT INTO tweets (tweet_id, data, comments_count, crawled_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(tweet_id) DO UPDATE SET data = excluded.data, "
+                        "comments_count = COALESCE(excluded.comments_count, comments_count), "
+                        "updated_at = excluded.crawled_at",
+                        (tweet_id, json.dumps(record, ensure_ascii=False, default=record_default),
+                         len(comments) if comments is not None else None, crawled_at)
+                    )
+                    if comments is not None and not is_new:
+                        self._conn.execute("DELETE FROM comments WHERE tweet_id = ?", (tweet_id,))
+                    if comments:
+                        self._conn.executemany(
+                            "INSERT INTO comments (tweet_id, position, data) VALUES (?, ?, ?)",
+                            self._comment_rows(tweet_id, comments)
+                        )
+                    saved += is_new
+        except sqlite3.Error as e:
+            print(f"Error writing to {self.db_file}: {e}")
+            return 0
+        return saved
+
+    def save_tweet(self, tweet_data: Dict) -> bool:
+        """
+        Save a single tweet, updating it in place if it is already stored
+        Returns True if it was new, False if it was an update or on error
+        """
+        return self.save_tweets([tweet_data]) == 1
+
+    def update_tweet_comments(self, tweet_id: str, comments: List[Dict]) -> bool:
+        """
+        Update existing tweet with comments
+        Returns True if updated, False if tweet not found or error
+        """
+        if not tweet_id:
+            return False
+        try:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "UPDATE tweets SET comments_count = ?, updated_at = ? WHERE tweet_id = ?",
+                    (len(comments), datetime.now().isoformat(), tweet_id)
+                )
+                if cursor.rowcount != 1:
+                    return False
+                self._conn.execute("DELETE FROM comments WHERE tweet_id = ?", (tweet_id,))
+                self._conn.executemany(
+                    "INSERT INTO comments (tweet_id, position, data) VALUES (?, ?, ?)",
+                    self._comment_rows(tweet_id, comments)
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating comments for {tweet_id}: {e}")
+            return False
+
+    def get_tweet(self, tweet_id: str) -> Optional[Dict]:
+        """Get single tweet by ID"""
+        row = self._conn.execute(
+            "SELECT data, comments_count, updated_at FROM tweets WHERE tweet_id = ?", (tweet_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        data, comments_count, updated_at = row
+        tweet = self._row_to_tweet(tweet_id, data, comments_count)
+        if updated_at:
+            tweet['updated_at'] = updated_at
+        return tweet
+
+    def get_all_tweets(self) -> List[Dict]:
+        """Get all stored tweets"""
+        tweets = []
+        rows = self._conn.execute(
+            "SELECT tweet_id, data, comments_count, updated_at FROM tweets ORDER BY rowid"
+        ).fetchall()
+        for tweet_id, data, comments_count, updated_at in rows:
+            tweet = self._row_to_tweet(tweet_id, data, comments_count)
+            if updated_at:
+                tweet['updated_at'] = updated_at
+            tweets.append(tweet)
+        return tweets
+
+    def get_tweet_count(self) -> int:
+        """Get total number of stored tweets"""
+        return self._conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+
+    def has_tweet(self, tweet_id: str) -> bool:
+        """Check whether a tweet is already stored"""
+        return self._conn.execute(
+            "SELECT 1 FROM tweets WHERE tweet_id = ?", (tweet_id,)
+        ).fetchone() is not None
+
+    def close(self) -> None:
+        """Checkpoint the WAL and close the database"""
+        try:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"Error checkpointing {self.db_file}: {e}")
+        self._conn.close()
+
+    def clear_all_data(self) -> None:
+        """Clear all stored data"""
+        with self._conn:
+            self._conn.execute("DELETE FROM comments")
+            self._conn.execute("DELETE FROM tweets")
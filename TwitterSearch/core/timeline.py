@@ -0,0 +1,104 @@
+# core/timeline.py
+
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from utils.json_path import find_first
+
+logger = logging.getLogger(__name__)
+
+# Where the endpoints put their instruction lists, most common first
+INSTRUCTION_ROOTS = (
+    "result.timeline.instructions",
+    "data.search_by_raw_query.search_timeline.timeline.instructions",
+    "result.instructions",
+)
+ADD_ENTRIES = "TimelineAddEntries"
+
+
+class TimelineLayout(NamedTuple):
+    """Instruction list path and the index of its TimelineAddEntries instruction"""
+    root: str
+    index: int
+
+
+def _is_add_entries(instruction: Any) -> bool:
+    # Instructions without a type (older payloads) count when they carry entries
+    if not isinstance(instruction, dict):
+        return False
+    kind = instruction.get("type")
+    return kind == ADD_ENTRIES or (kind is None and isinstance(instruction.get("entries"), list))
+
+
+class TimelineResolver:
+    """
+    Finds the TimelineAddEntries instruction of a timeline response by its
+    type instead of probing fixed ``instructions[i]`` paths one at a time.
+
+    The layout found for each endpoint is cached: later pages check that one
+    instruction and go straight to its entries. Only when it no longer holds
+    the entries are the known roots scanned again; a layout that differs from
+    the cached one is logged as schema drift and replaces it.
+    """
+
+    def __init__(self, roots: Tuple[str, ...] = INSTRUCTION_ROOTS):
+        self.roots = roots
+        self.layouts: Dict[str, TimelineLayout] = {}
+        self.drift_events: Dict[str, int] = {}
+
+    @staticmethod
+    def _instructions(response: Any, root: str) -> Optional[List]:
+        found = find_first(response, root)
+        return found[0] if found and isinstance(found[0], list) else None
+
+    def _discover(self, response: Any) -> Optional[Tuple[TimelineLayout, List]]:
+        for root in self.roots:
+            instructions = self._instructions(response, root)
+            if not instructions:
+                continue
+            # A typed instruction wins over an untyped one that merely has entries
+            untyped = None
+            for index, instruction in enumerate(instructions):
+                if isinstance(instruction, dict) and instruction.get("type") == ADD_ENTRIES:
+                    return TimelineLayout(root, index), instructions
+                if untyped is None and _is_add_entries(instruction):
+                    untyped = index
+            if untyped is not None:
+                return TimelineLayout(root, untyped), instructions
+        return None
+
+    def resolve(self, endpoint: str, response: Any) -> Optional[Tuple[TimelineLayout, List]]:
+        """(layout, instruction list) of ``response``; None if it has no entries instruction"""
+        cached = self.layouts.get(endpoint)
+        if cached is not None:
+            instructions = self._instructions(response, cached.root)
+            if instructions and cached.index < len(instructions) and _is_add_entries(instructions[cached.index]):
+                return cached, instructions
+        found = self._discover(response)
+        if found is None:
+            return None
+        layout = found[0]
+        if cached is not None and layout != cached:
+            self.drift_events[endpoint] = self.drift_events.get(endpoint, 0) + 1
+            logger.warning(f"Schema drift on {endpoint!r}: entries moved from "
+                           f"{cached.root}[{cached.index}] to {layout.root}[{layout.index}]")
+        self.layouts[endpoint] = layout
+        return found
+
+    def layout(self, endpoint: str, response: Any) -> Optional[TimelineLayout]:
+        found = self.resolve(endpoint, response)
+        return found[0] if found else None
+
+    def expected_index(self, endpoint: str) -> int:
+        """Instruction index the entries of ``endpoint`` are expected at (0 before the first page)"""
+        cached = self.layouts.get(endpoint)
+        return cached.index if cached else 0
+
+    def entries(self, endpoint: str, response: Any) -> List[Dict]:
+        """Entries of the TimelineAddEntries instruction, [] if there is none"""
+        found = self.resolve(endpoint, response)
+        if found is None:
+            return []
+        layout, instructions = found
+        entries = instructions[layout.index].get("entries")
+        return entries if isinstance(entries, list) else []
@@ -0,0 +1,85 @@
+# core/watermarks.py
+
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from config.settings import WATERMARK_FILE
+from utils.state_file import load_json_state, save_json_state
+from .records import Tweet
+
+SINCE_OPERATORS = (None, "since_id", "since")
+
+
+class QueryWatermarks:
+    """
+    Per-query high-water marks for incremental crawling: the newest tweet ID
+    (and its created_at) seen by the last complete crawl of each query.
+
+    Search results come newest first, so a later crawl can stop at the first
+    page made up entirely of tweets at or below the mark. Tweets seen during a
+    crawl only raise the mark once that crawl completes (``commit``); until
+    then they are kept as pending, so an interrupted crawl that resumes from
+    its checkpoint still covers the gap down to the old mark.
+    """
+
+    def __init__(self, filepath: Optional[str] = WATERMARK_FILE):
+        self.filepath = filepath
+        state = load_json_state(filepath, default={}) if filepath else {}
+        self.marks: Dict[str, Dict] = state.get("marks", {})
+        self.pending: Dict[str, Dict] = state.get("pending", {})
+        self._unsaved = False
+
+    def mark(self, query: str) -> Optional[int]:
+        """Newest tweet ID of the last complete crawl of ``query``, None if there was none"""
+        mark = self.marks.get(query)
+        return int(mark["tweet_id"]) if mark else None
+
+    def search_query(self, query: str, since_operator: Optional[str] = None) -> str:
+        """``query`` with a since_id:/since: operator for its mark added, if requested"""
+        if since_operator not in SINCE_OPERATORS:
+            raise ValueError(f"Unknown since operator: {since_operator}")
+        mark = self.marks.get(query)
+        if not since_operator or not mark:
+            return query
+        if since_operator == "since_id":
+            return f"{query} since_id:{mark['tweet_id']}"
+        if not mark.get("created_at"):
+            return query
+        # since: takes a UTC date, so tweets from earlier that day are still filtered by ID
+        return f"{query} since:{time.strftime('%Y-%m-%d', time.gmtime(mark['created_at']))}"
+
+    @staticmethod
+    def unseen(mark: Optional[int], tweets: Iterable[Tweet]) -> list:
+        """Tweets newer than ``mark`` (all of them without a mark)"""
+        if mark is None:
+            return list(tweets)
+        return [tweet for tweet in tweets if int(tweet.id) > mark]
+
+    def observe(self, query: str, tweets: Iterable[Tweet]) -> None:
+        """Remember the newest of ``tweets`` as the pending mark of ``query``"""
+        newest = self.pending.get(query)
+        newest_id = int(newest["tweet_id"]) if newest else 0
+        for tweet in tweets:
+            if int(tweet.id) > newest_id:
+                newest_id = int(tweet.id)
+                newest = {"tweet_id": tweet.id, "created_at": tweet.created_at}
+        if newest is not None and newest is not self.pending.get(query):
+            self.pending[query] = newest
+            self._unsaved = True
+
+    def commit(self, query: str) -> None:
+        """The crawl of ``query`` completed: its pending mark becomes the mark"""
+        newest = self.pending.pop(query, None)
+        if newest is None:
+            return
+        current = self.mark(query)
+        if current is None or int(newest["tweet_id"]) > current:
+            self.marks[query] = {**newest, "updated_at": datetime.now().isoformat()}
+        self._unsaved = True
+        self.save()
+
+    def save(self) -> None:
+        if self.filepath and self._unsaved:
+            if save_json_state(self.filepath, {"marks": self.marks, "pending": self.pending}):
+                self._unsaved = False
@@ -4,29 +4,106 @@ import asyncio
 import logging
 import json
 import os
-from typing import Optional, Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Dict, List
 from datetime import datetime
 
 from core.api_client import TwitterAPIClient
+from core.checkpoint import CheckpointStore
+from core.comment_policy import CommentFetchPolicy
+from core.watermarks import QueryWatermarks
 from core.data_handler import TwitterDataHandler
 from core.extractors import TwitterDataExtractor
-from config.settings import HEADERS, BASE_URL, DEFAULT_OUTPUT_DIR
+from config.settings import (
+    HEADERS, BASE_URL, DEFAULT_OUTPUT_DIR, MAX_CONCURRENT_TWEETS, PREFETCH_DEPTH, PARSE_WORKERS, STREAM_PAGES,
+    USE_PIPELINE, INCREMENTAL_CRAWL, SINCE_OPERATOR
+)
+from core.page_parser import CommentPageStream, SearchPageStream, parse_comment_page, parse_search_page
+from core.pipeline import CrawlPipeline
+from core.records import Comment, Tweet, record_default
+from core.seen_tweets import SeenTweets
 from core.scraping_utils import ScrapingUtils
+from utils.key_pool import KeyPool
+from utils.paginator import Paginator
+from utils.prefetch import CursorPrefetcher
+from utils.session_manager import SessionManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class TwitterCrawler(ScrapingUtils):
-    def __init__(self, output_dir: str = "data"):
+    def __init__(self, output_dir: str = "data", parse_workers: int = PARSE_WORKERS,
+                 checkpoints: Optional[CheckpointStore] = None, watermarks: Optional[QueryWatermarks] = None):
+        self.session_manager = SessionManager()
+        self.key_pool = KeyPool.from_settings()
         self.api_client = TwitterAPIClient(
-            {
-    "x-rapidapi-key": "",
-    "x-rapidapi-host": "twitter241.p.rapidapi.com"
-}
+            HEADERS,
+            session_manager=self.session_manager,
+            key_pool=self.key_pool
         )
         self.extractor = TwitterDataExtractor()
         self.output_file = "LatentSearch.json"
+        self.checkpoints = checkpoints or CheckpointStore()
+        self.watermarks = watermarks or QueryWatermarks()
+        # Shared by every query, so tweets found by several queries are stored once
+        self.seen = SeenTweets(self.output_file)
+        self.comment_policy = CommentFetchPolicy.from_settings()
+        self.pagination_stops: Dict[str, int] = {}  # why comment threads stopped paging
+        # With parse workers, pages are fetched as raw bytes and decoded/extracted
+        # in other processes, so the event loop thread only does network I/O
+        self.executor = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+
+    async def close(self) -> None:
+        """Release pooled HTTP connections and parse workers, and persist API key usage and checkpoints"""
+        await self.session_manager.close()
+        self.seen.flush()
+        self.checkpoints.save()
+        self.watermarks.save()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.key_pool is not None:
+            await self.key_pool.close()
+
+    async def parse(self, parser: Callable[[Any], Optional[Dict]], data: Any) -> Optional[Dict]:
+        """Run a page parser in the process pool, or inline without one"""
+        if self.executor is None:
+            return parser(data)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, parser, data)
+
+    async def fetch_search_page(self, query: str, cursor: Optional[str]) -> Optional[Dict]:
+        """One parsed search page ({"cursor", "entries", "tweets"}), None without a response"""
+        if self.executor is None and STREAM_PAGES:
+            stream = SearchPageStream(self.extractor)
+            data = await self.api_client.search_tweets(query, count="1000", search_type="Latest", cursor=cursor,
+                                                       on_entry=stream.add)
+            return stream.finish(data)
+        data = await self.api_client.search_tweets(query, count="1000", search_type="Latest", cursor=cursor,
+                                                   raw=self.executor is not None)
+        if not data:
+            return None
+        return await self.parse(parse_search_page, data)
+
+    async def fetch_comment_page(self, tweet_id: str, cursor: Optional[str]) -> Optional[Dict]:
+        """One parsed comment page ({"cursor", "comments"}), None when there are no more comments"""
+        if self.executor is None and STREAM_PAGES:
+            stream = CommentPageStream(self.extractor)
+            data = await self.api_client.fetch_comments(tweet_id, cursor=cursor, on_entry=stream.add)
+            if not data:
+                logger.info(f"Empty response for tweet {tweet_id}")
+            return stream.finish(data)
+        data = await self.api_client.fetch_comments(tweet_id, cursor=cursor, raw=self.executor is not None)
+        if not data:
+            logger.info(f"Empty response for tweet {tweet_id}")
+            return None
+        return await self.parse(parse_comment_page, data)
+
+    async def __aenter__(self) -> "TwitterCrawler":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
 
     def save_to_json(self, data: dict, filepath: str = "LatentSearch.json") -> None:
         """Save data to JSON file"""
@@ -43,145 +120,234 @@ class TwitterCrawler(ScrapingUtils):
             existing_data.append(data)
 
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, indent=2, ensure_ascii=False)
+                json.dump(existing_data, f, indent=2, ensure_ascii=False, default=record_default)
 
         except Exception as e:
             print(f"Error saving data: {str(e)}")
 
-    async def process_tweet(self, tweet_content: Dict) -> Optional[str]:
-        """Process a single tweet and its comments"""
+    async def tweet_record(self, tweet_data: Tweet, query: Optional[str] = None) -> Optional[Dict]:
+        """Fetch the comments of an extracted tweet, returning the record to save"""
         try:
-            # Extract tweet data
-            tweet_data = await self.extractor.extract_tweet_data(tweet_content)
-            if not tweet_data:
-                return None
-
-            tweet_id = tweet_data['id']
+            tweet_id = tweet_data.id
             logger.info(f"Tweet {tweet_id} crawled")
 
             comm = []
 
-            # If it's not a retweet, fetch comments
-            if tweet_id and "RT @" not in tweet_data["content"]:
+            if self.should_fetch_comments(tweet_data):
                 comm = await self.process_comments(tweet_id)
 
-            csv_data = {
-                'tweet_id': tweet_data["id"],
-                'content': tweet_data["content"],
-                'datetime': tweet_data["datetime"],
-                'likes': tweet_data["likes"],
-                'shares': tweet_data["shares"],
-                'views': tweet_data["views"],
-                'source': tweet_data["source"],
-                'isBlue': tweet_data['is_blueTick'],
-                "followers": tweet_data["followers"],
-                "hashtags": tweet_data["hashtags"],
-                "location":"",
-                "user_mentions": tweet_data["user_mentions"],
-                'media': tweet_data["media"] if tweet_data["media"] else [],
-                'username': tweet_data["username"],
-                'url': f"https://x.com/{tweet_data['username']}/status/{tweet_data['id']}",
-                'comments': comm
-            }
-
-            self.save_to_json(data=csv_data)
-            return tweet_id
+            return self.make_record(tweet_data, comm, query)
 
         except Exception as e:
             logger.error(f"Error processing tweet: {e}")
             return None
 
-    async def process_comments(self, tweet_id: str, max_pages: int = 50) -> List[Dict]:
-        """Fetch and process comments for a tweet"""
-        comments = []
-        cursor2 = None
-        empty_response_count = 0  # Track empty responses
-
-        for comment_page in range(max_pages):
+    def should_fetch_comments(self, tweet_data: Tweet) -> bool:
+        """Whether the comment policy fetches this tweet's thread (not for retweets, nor tweets without replies)"""
+        return self.comment_policy.should_fetch(tweet_data)
+
+    @staticmethod
+    def make_record(tweet_data: Tweet, comments: List[Comment], query: Optional[str] = None) -> Dict:
+        """Build the stored record for an extracted tweet; records inside are serialized by record_default"""
+        return {
+            'tweet_id': tweet_data.id,
+            'content': tweet_data.content,
+            'datetime': tweet_data.datetime,
+            'likes': tweet_data.likes,
+            'shares': tweet_data.shares,
+            'views': tweet_data.views,
+            'source': tweet_data.source,
+            'isBlue': tweet_data.is_blueTick,
+            "followers": tweet_data.followers,
+            "hashtags": tweet_data.hashtags,
+            "location":"",
+            "user_mentions": tweet_data.user_mentions,
+            'media': tweet_data.media if tweet_data.media else [],
+            'username': tweet_data.username,
+            'url': f"https://x.com/{tweet_data.username}/status/{tweet_data.id}",
+            'comments': comments,
+            'queries': [query] if query else []
+        }
+
+    def pagination_stopped(self, paginator: Paginator) -> None:
+        """Count why a comment thread stopped paging"""
+        reason = paginator.stop_reason or "unknown"
+        self.pagination_stops[reason] = self.pagination_stops.get(reason, 0) + 1
+
+    async def process_comments(self, tweet_id: str, max_pages: int = 50) -> List[Comment]:
+        """Fetch and process comments for a tweet, resuming a thread that was interrupted"""
+        cursor2, first_page, comments = self.checkpoints.thread(tweet_id)
+        if first_page:
+            logger.info(f"Resuming comments for tweet {tweet_id} after {first_page} pages")
+        paginator = Paginator(max_pages, cursor2, first_page)
+
+        for comment_page in range(first_page, max_pages):
             if comment_page > 0 and cursor2 is None:
-                print(f"No more comments available for tweet {tweet_id}")
                 break
-            comments_data = await self.api_client.fetch_comments(tweet_id, cursor=cursor2)
-
-            if not comments_data:
-                logger.info(f"Empty response for tweet {tweet_id}")
-                break  # Break immediately on empty response
-
-
-            comments_entries = self.j_extract(comments_data, "result.instructions[0].entries.*", default=[])
-            if not comments_entries or len(comments_entries) <= 2:  # Accounting for first/last entries
+            page = await self.fetch_comment_page(tweet_id, cursor2)
+            if page is None:
+                paginator.stop("no_more_comments")  # Empty response or no more comments
                 break
 
+            cursor2 = paginator.advance(page["cursor"], page["ids"])
+            logger.info(f"Crawled {len(page['comments'])} comments on tweet {tweet_id}, "
+                        f"page {comment_page + 1}, cursor: {page['cursor']}")
+            comments.extend(page["comments"])
+            if cursor2:
+                self.checkpoints.update_thread(tweet_id, cursor2, comment_page + 1, page["comments"])
 
-            try:
-                querystring2 = {"pid": tweet_id, "count": "100", "rankingMode": "Relevance"}
-
-                cursor2 = self.j_extract_first(comments_data, "cursor.bottom")
-                print(f"Comments cursor for tweet {tweet_id}, page {comment_page + 1}: {cursor2}")
-
-                for c in comments_entries[1:-1]:
-                    try:
-                        result = await self.extractor.extract_comment_data(c)
-                        if result:
-                            comments.append(result)
-                            print(f"Comment on Tweet {tweet_id} crawled")
-                    except Exception as e:
-                        print(f"Error processing comment: {str(e)}")
-                        continue
-
-            except Exception as e:
-                print(f"Error fetching comments for Tweet {tweet_id}: {e}")
-                continue
-
+        logger.info(f"No more comments for tweet {tweet_id}: {paginator.stop_reason}")
+        self.pagination_stopped(paginator)
+        self.checkpoints.finish_thread(tweet_id)
         return comments
 
-    async def crawl(self, query: str, max_batches: int = 30):
-        """Main crawling function"""
-        cursor = None
+    def next_search_cursor(self, paginator: Paginator, mark: Optional[int], page: Dict) -> Optional[str]:
+        """Cursor of the page after a parsed search page, None to stop (see ``paginator.stop_reason``)"""
+        # A page of seen tweets ends the crawl, so nothing is read ahead past it
+        if mark is not None and page["tweets"] and not self.watermarks.unseen(mark, page["tweets"]):
+            return paginator.stop("seen_before")
+        return paginator.advance(page["cursor"], [tweet.id for tweet in page["tweets"]])
+
+    def claim_tweets(self, tweets: List[Tweet], query: Optional[str]) -> List[Tweet]:
+        """The tweets no earlier query (or earlier run) stored; ``query`` is added to the others"""
+        new_tweets = []
+        for tweet_data in tweets:
+            if self.seen.claim(tweet_data.id, query):
+                new_tweets.append(tweet_data)
+            else:
+                logger.info(f"Tweet {tweet_data.id} already stored, skipping")
+        return new_tweets
+
+    async def process_page(self, tweets: List[Tweet], max_concurrent_tweets: int = MAX_CONCURRENT_TWEETS,
+                           query: Optional[str] = None) -> int:
+        """
+        Process the extracted tweets of one search page with up to
+        max_concurrent_tweets tweets (and their comment threads) in flight.
+        Tweets already stored are skipped without fetching their comments.
+        Records are saved in page order. Returns the number of tweets saved.
+        """
+        tweets = self.claim_tweets(tweets, query)
+        if max_concurrent_tweets <= 1:
+            processed = 0
+            for tweet_data in tweets:
+                record = await self.tweet_record(tweet_data, query)
+                if record:
+                    self.save_to_json(data=record)
+                    processed += 1
+                else:
+                    self.seen.release(tweet_data.id)
+            return processed
+
+        semaphore = asyncio.Semaphore(max_concurrent_tweets)
+
+        async def build(tweet_data: Tweet) -> Optional[Dict]:
+            async with semaphore:
+                return await self.tweet_record(tweet_data, query)
+
+        tasks = [asyncio.create_task(build(t)) for t in tweets]
+        processed = 0
+        try:
+            # Await in page order so output is stable; later tweets keep running meanwhile
+            for tweet_data, task in zip(tweets, tasks):
+                record = await task
+                if record:
+                    self.save_to_json(data=record)
+                    processed += 1
+                else:
+                    self.seen.release(tweet_data.id)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return processed
+
+    async def crawl(self, query: str, max_batches: int = 30, max_concurrent_tweets: int = MAX_CONCURRENT_TWEETS,
+                    prefetch_depth: int = PREFETCH_DEPTH, incremental: bool = INCREMENTAL_CRAWL,
+                    since_operator: Optional[str] = SINCE_OPERATOR):
+        """
+        Main crawling function; an interrupted crawl of the same query resumes
+        from its checkpoint. In incremental mode, tweets at or below the
+        query's high-water mark are skipped and paging stops at the first
+        page that has only such tweets.
+        """
         processed_tweets = 0
+        first_cursor, pages_done = self.checkpoints.query(query)
+        if first_cursor:
+            logger.info(f"Resuming query {query!r} after {pages_done} pages")
+        mark = self.watermarks.mark(query) if incremental else None
+        search_query = self.watermarks.search_query(query, since_operator) if incremental else query
+        paginator = Paginator(max_batches, first_cursor, pages_done)
+
+        pages = CursorPrefetcher(
+            lambda cursor: self.fetch_search_page(search_query, cursor),
+            lambda page: self.next_search_cursor(paginator, mark, page),
+            max_pages=max_batches - pages_done,
+            depth=prefetch_depth,
+            first_cursor=first_cursor
+        )
 
-        for batch in range(max_batches):
-            try:
-                if not cursor and batch > 0:
-                    logger.info("No more results available. Stopping crawl.")
-                    break
-
-                response = await self.api_client.search_tweets(query, count="1000", search_type="Latest", cursor=cursor)
-                if not response:
-                    logger.error("No response from API")
-                    break
-
-                cursor = self.j_extract_first(response, "cursor.bottom")
-                print(f"Using cursor: {cursor}")  # Debug cursor
-
-
-                content_json_filtered = self.j_extract(response,
-                                                       "data.search_by_raw_query.search_timeline.timeline.instructions[0].entries[*]")
-                if not content_json_filtered:
-                    content_json_filtered = self.j_extract(response,
-                                                           "result.timeline.instructions[0].entries.*")
-                if not content_json_filtered:
-                    logger.error("No tweets found in response")
-                    break
-
-
-                for c in content_json_filtered:
-                    if await self.process_tweet(c):
-                        processed_tweets += 1
-
-                # If we didn't get cursor earlier, try alternate paths
-                if not cursor:
-                    cursor = self.j_extract_first(response, "cursor.bottom.value")
-
-                logger.info(f"Current cursor: {cursor}")
-                logger.info(f"Processed batch {batch + 1}, total tweets: {processed_tweets}")
-
-            except Exception as e:
-                logger.error(f"Error processing batch {batch + 1}: {str(e)}")
-                continue
-
+        # Only a crawl that reaches the end of the results (or max_batches) drops its checkpoint;
+        # the watermark is only committed at the end of the results, as older pages may be unread
+        finished = True
+        reached_end = False
+        try:
+            async for batch, page in pages:
+                batch += pages_done
+                try:
+                    if not page:
+                        logger.error("No response from API")
+                        paginator.stop("no_response")
+                        finished = False
+                        break
+
+                    cursor = page["cursor"]
+
+                    # Error responses come back as None, so this is a successful empty page
+                    if not page["entries"]:
+                        logger.error("No tweets found in response")
+                        paginator.stop("no_entries")
+                        reached_end = True
+                        break
+
+                    tweets = self.watermarks.unseen(mark, page["tweets"])
+                    if page["tweets"] and not tweets:
+                        logger.info(f"Batch {batch + 1} only has tweets seen before. Stopping crawl.")
+                        reached_end = True
+                        break
+
+                    processed_tweets += await self.process_page(tweets, max_concurrent_tweets, query)
+                    if incremental:
+                        self.watermarks.observe(query, tweets)
+
+                    logger.info(f"Current cursor: {cursor}")
+                    logger.info(f"Processed batch {batch + 1}, total tweets: {processed_tweets}")
+                    if not cursor:
+                        logger.info("No more results available. Stopping crawl.")
+                        reached_end = True
+                    else:
+                        self.checkpoints.update_query(query, cursor, batch + 1)
+
+                except Exception as e:
+                    logger.error(f"Error processing batch {batch + 1}: {str(e)}")
+                    continue
+        except Exception as e:
+            logger.error(f"Error fetching search page: {str(e)}")
+            paginator.stop("error")
+            finished = False
+
+        if finished:
+            self.checkpoints.finish_query(query)
+            if incremental and reached_end:
+                self.watermarks.commit(query)
+        self.checkpoints.save()
+        self.watermarks.save()
+        self.seen.flush()
         logger.info(f"Crawling completed. Total tweets processed: {processed_tweets}")
-
+        logger.info(f"Query {query!r} stopped after {paginator.pages} pages: {paginator.stop_reason}")
+        logger.info(f"Comment threads stopped: {self.pagination_stops}")
+        logger.info(f"Tweets already stored by earlier queries: {self.seen.duplicates}")
+        logger.info(f"Comment fetch policy: {self.comment_policy.stats()}")
+        logger.info(f"Rate limiter waits: {self.api_client.rate_limiter.stats()}")
+        logger.info(f"Adaptive throttling: {self.api_client.controller.stats()}")
 
 
 async def main():
@@ -190,12 +356,15 @@ async def main():
                "Apology @BeerBicepsGuy",
                "India's got latent @ReheSamay",]
 
-    crawler = TwitterCrawler(output_dir="twitter_data")
+    async with TwitterCrawler(output_dir="twitter_data") as crawler:
+        if USE_PIPELINE:
+            await CrawlPipeline(crawler).run(queries)
+            return
 
-    for query in queries:
-        logger.info(f"Processing query: {query}")
-        await crawler.crawl(query)
-        await asyncio.sleep(2)
+        for query in queries:
+            logger.info(f"Processing query: {query}")
+            await crawler.crawl(query)
+            await asyncio.sleep(2)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
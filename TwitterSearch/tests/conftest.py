@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# Modules import each other as top-level packages (config, core, utils), as when run from TwitterSearch
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
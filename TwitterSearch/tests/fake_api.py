@@ -0,0 +1,132 @@
+# tests/fake_api.py
+
+import os
+from typing import Dict, Optional, Set
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.checkpoint import CheckpointStore
+from core.watermarks import QueryWatermarks
+from utils.adaptive_controller import AdaptiveController
+from utils.rate_limiter import RateLimiter
+
+CREATED_AT = "Tue Aug 06 02:54:02 +0000 2024"
+
+
+def tweet_result(tweet_id: int, text: Optional[str] = None, replies: int = 3) -> Dict:
+    return {
+        "rest_id": str(tweet_id),
+        "legacy": {
+            "full_text": text or f"Hello #tag{tweet_id} @user{tweet_id} https://t.co/x{tweet_id} world",
+            "id_str": str(tweet_id), "created_at": CREATED_AT, "favorite_count": tweet_id % 100,
+            "retweet_count": 2, "reply_count": replies,
+            "entities": {"media": [], "hashtags": [{"text": f"tag{tweet_id}"}],
+                         "user_mentions": [{"name": "U", "screen_name": f"user{tweet_id}"}]}
+        },
+        "views": {"count": "10"},
+        "core": {"user_results": {"result": {"is_blue_verified": False,
+                                             "legacy": {"screen_name": "someone", "followers_count": 5}}}}
+    }
+
+
+def tweet_entry(tweet_id: int, **kwargs) -> Dict:
+    return {"entryId": f"tweet-{tweet_id}", "content": {
+        "entryType": "TimelineTimelineItem", "itemContent": {"tweet_results": {"result": tweet_result(tweet_id, **kwargs)}}}}
+
+
+def comment_entry(comment_id: int) -> Dict:
+    return {"entryId": f"conversationthread-{comment_id}", "content": {"items": [{"item": {"itemContent": {
+        "tweet_results": {"result": tweet_result(comment_id, text=f"reply {comment_id}")}}}}]}}
+
+
+def cursor_entry(kind: str) -> Dict:
+    return {"entryId": f"cursor-{kind}", "content": {"cursorType": kind.capitalize(), "value": kind}}
+
+
+class FakeTwitterAPI:
+    """
+    Search and comment endpoints in the twitter241 response shape.
+
+    Search page k of any query holds ``per_page`` tweets counting down from
+    ``top``; there are ``pages`` pages. Every tweet has ``comment_pages``
+    comment pages of three replies each. ``requests`` counts calls per
+    endpoint; ``search_queries`` records the query strings sent.
+    ``failing_search`` maps a search cursor ("0" for the first page) to how
+    many more requests for it get a 500 with an error body.
+    """
+
+    def __init__(self, pages: int = 2, per_page: int = 5, comment_pages: int = 2, top: int = 1100):
+        self.pages = pages
+        self.per_page = per_page
+        self.comment_pages = comment_pages
+        self.top = top
+        self.failing_comments: Set[str] = set()  # tweet ids whose comment requests get a 500
+        self.failing_search: Dict[str, int] = {}
+        self.rejected_search: Set[str] = set()  # search cursors that get a 400
+        self.requests = {"search": 0, "comments": 0}
+        self.search_queries = []
+        self.server: Optional[TestServer] = None
+
+    def tweet_ids(self, page: int):
+        first = self.top - page * self.per_page
+        return [tweet_id for tweet_id in range(first, first - self.per_page, -1) if tweet_id > 0]
+
+    async def search(self, request: web.Request) -> web.Response:
+        self.requests["search"] += 1
+        self.search_queries.append(request.query["query"])
+        cursor = request.query.get("cursor", "0")
+        if self.failing_search.get(cursor):
+            self.failing_search[cursor] -= 1
+            return web.json_response({"message": "Internal Server Error"}, status=500,
+                                     headers={"Retry-After": "0"})
+        if cursor in self.rejected_search:
+            return web.json_response({"message": "Bad Request"}, status=400)
+        page = int(cursor)
+        entries = [tweet_entry(tweet_id) for tweet_id in self.tweet_ids(page)] if page < self.pages else []
+        entries += [cursor_entry("top"), cursor_entry("bottom")]
+        return web.json_response({
+            "cursor": {"bottom": str(page + 1) if page + 1 < self.pages else None, "top": "top"},
+            "result": {"timeline": {"instructions": [{"type": "TimelineAddEntries", "entries": entries}]}}
+        })
+
+    async def comments(self, request: web.Request) -> web.Response:
+        self.requests["comments"] += 1
+        tweet_id = request.query["pid"]
+        if tweet_id in self.failing_comments:
+            return web.json_response({}, status=500)
+        page = int(request.query.get("cursor", "0"))
+        replies = [comment_entry(int(tweet_id) * 100 + page * 3 + k) for k in range(3)]
+        return web.json_response({
+            "cursor": {"bottom": str(page + 1) if page + 1 < self.comment_pages else None},
+            "result": {"instructions": [{"type": "TimelineAddEntries",
+                                         "entries": [cursor_entry("top")] + replies + [cursor_entry("bottom")]}]}
+        })
+
+    async def __aenter__(self) -> "FakeTwitterAPI":
+        app = web.Application()
+        app.router.add_get("/search", self.search)
+        app.router.add_get("/comments", self.comments)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.server.close()
+
+
+def make_crawler(api: FakeTwitterAPI, state_dir: str, **kwargs):
+    """A TwitterCrawler against ``api`` with no key pool and no rate limiting to speak of"""
+    from main import TwitterCrawler
+
+    kwargs.setdefault("checkpoints", CheckpointStore(os.path.join(state_dir, "checkpoints.json")))
+    kwargs.setdefault("watermarks", QueryWatermarks(os.path.join(state_dir, "watermarks.json")))
+    crawler = TwitterCrawler(**kwargs)
+    crawler.key_pool = crawler.api_client.key_pool = None
+    client = crawler.api_client
+    client.base_url = str(api.server.make_url("/search"))
+    client.comments_url = str(api.server.make_url("/comments"))
+    client.rate_limiter = RateLimiter(calls_per_second=1000, burst=1000)
+    client.controller = AdaptiveController(client.rate_limiter, initial_rate=1000, max_rate=1000,
+                                           initial_limit=50)
+    return crawler
@@ -0,0 +1,63 @@
+# tests/test_adaptive_controller.py
+
+import time
+from email.utils import formatdate
+
+from utils.adaptive_controller import AdaptiveController, parse_retry_after
+from utils.rate_limiter import RateLimiter
+
+
+def make_controller(**kwargs):
+    settings = dict(initial_rate=10, min_rate=1, max_rate=100, initial_limit=4, min_limit=1, max_limit=50,
+                    decrease_factor=0.5, decrease_interval=0.0)
+    settings.update(kwargs)
+    return AdaptiveController(RateLimiter(calls_per_second=10), **settings)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 0 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def test_healthy_responses_grow_limit_and_rate():
+    controller = make_controller()
+    for _ in range(4):
+        assert controller.record(200, 0.1) == 0.0
+    assert (controller.limit, controller.rate, controller.increases) == (5, 11, 1)
+    assert controller.rate_limiter.calls_per_second == 11
+
+
+def test_throttle_cuts_both_and_honours_retry_after():
+    controller = make_controller()
+    delay = controller.record(429, 0.1, retry_after="2")
+    assert delay == 2.0
+    assert (controller.limit, controller.rate, controller.throttled) == (2, 5, 1)
+    assert controller._paused_until > time.monotonic() + 1
+
+
+def test_rotated_throttle_does_not_pause_other_requests():
+    controller = make_controller()
+    controller.record(429, 0.1, retry_after="30", pause=False)
+    assert controller.decreases == 1
+    assert controller._paused_until == 0.0
+
+
+def test_decrease_counts_once_per_interval():
+    controller = make_controller(decrease_interval=60)
+    controller.record(503, 0.1)
+    controller.record(503, 0.1)
+    assert controller.decreases == 1
+    assert controller.limit == 2
+
+
+def test_latency_rise_counts_as_congestion():
+    controller = make_controller()
+    for _ in range(3):
+        controller.record(200, 0.1, endpoint="search")
+    controller.record(200, 5.0, endpoint="search")
+    assert controller.decreases == 1
+    # Another endpoint keeps its own baseline
+    controller.record(200, 5.0, endpoint="comments")
+    assert controller.decreases == 1
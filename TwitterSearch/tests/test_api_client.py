@@ -0,0 +1,49 @@
+# tests/test_api_client.py
+
+import asyncio
+
+from config.settings import MAX_RETRIES
+from fake_api import FakeTwitterAPI, make_crawler
+
+
+def fetch(tmp_path, failures, **crawler_options):
+    async def run():
+        async with FakeTwitterAPI() as api:
+            api.failing_search = {"0": failures}
+            async with make_crawler(api, str(tmp_path), **crawler_options) as crawler:
+                data = await crawler.api_client.search_tweets("q")
+                api.failing_search = {"0": failures}
+                page = await crawler.fetch_search_page("q", None)
+            return data, page, api.requests["search"]
+
+    return asyncio.run(run())
+
+
+def test_exhausted_retries_return_none_not_the_error_body(tmp_path):
+    data, page, requests = fetch(tmp_path, MAX_RETRIES + 1)
+    assert data is None
+    assert page is None
+    assert requests == 2 * (MAX_RETRIES + 1)
+
+
+def test_exhausted_retries_with_parse_workers(tmp_path):
+    _, page, _ = fetch(tmp_path, MAX_RETRIES + 1, parse_workers=2)
+    assert page is None
+
+
+def test_a_retry_that_succeeds_returns_the_page(tmp_path):
+    data, page, requests = fetch(tmp_path, MAX_RETRIES)
+    assert data["cursor"]["bottom"] == "1"
+    assert [tweet.id for tweet in page["tweets"]] == [str(i) for i in range(1100, 1095, -1)]
+    assert requests == 2 * (MAX_RETRIES + 1)
+
+
+def test_error_statuses_are_not_retried_or_returned(tmp_path):
+    async def run():
+        async with FakeTwitterAPI() as api:
+            api.rejected_search = {"0"}
+            async with make_crawler(api, str(tmp_path)) as crawler:
+                page = await crawler.fetch_search_page("q", None)
+            return page, api.requests["search"]
+
+    assert asyncio.run(run()) == (None, 1)
@@ -0,0 +1,173 @@
+# tests/test_checkpoint.py
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from config.settings import MAX_RETRIES
+from core.checkpoint import CheckpointStore
+from core.pipeline import CrawlPipeline
+from core.records import Comment
+from fake_api import FakeTwitterAPI, make_crawler
+
+
+def comment(n):
+    return Comment(f"reply {n}", n, 0, None, None, False, 1)
+
+
+def reopen(store):
+    """A new store over the same files, as after the process exits without saving"""
+    while store._spill_files:
+        store._spill_files.popitem()[1].close()
+    return CheckpointStore(store.filepath, save_every=store.save_every)
+
+
+def test_query_resume(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    store = CheckpointStore(path, save_every=1)
+    assert store.query("q") == (None, 0)
+
+    store.update_query("q", "c3", 3)
+    store.update_query("other", "c1", 1)
+    assert reopen(store).query("q") == ("c3", 3)
+
+    store.finish_query("q")
+    resumed = reopen(store)
+    assert resumed.query("q") == (None, 0)
+    assert resumed.query("other") == ("c1", 1)
+
+
+def test_progress_is_only_written_every_save_every_pages(tmp_path):
+    path = str(tmp_path / "checkpoints.json")
+    store = CheckpointStore(path, save_every=3)
+    store.update_query("q", "c1", 1)
+    store.update_query("q", "c2", 2)
+    assert not os.path.exists(path)
+    store.update_query("q", "c3", 3)
+    assert reopen(store).query("q") == ("c3", 3)
+
+    store.update_query("q", "c4", 4)
+    assert reopen(store).query("q") == ("c3", 3)
+    assert store.save()
+    assert reopen(store).query("q") == ("c4", 4)
+
+
+def test_thread_resume_from_spill(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    store.update_thread("t", "c1", 1, [comment(1), comment(2)])
+    store.update_thread("t", "c2", 2, [comment(3)])
+
+    assert os.path.exists(tmp_path / "checkpoints_threads" / "t.jsonl")
+    assert "comments" not in json.loads((tmp_path / "checkpoints.json").read_text())["threads"]["t"]
+    assert reopen(store).thread("t") == ("c2", 2, [comment(1), comment(2), comment(3)])
+
+
+def test_pages_spilled_after_the_checkpoint_are_ignored(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=2)
+    store.update_thread("t", "c1", 1, [comment(1)])
+    store.update_thread("t", "c2", 2, [comment(2)])
+    store.update_thread("t", "c3", 3, [comment(3)])  # spilled, not yet counted by a checkpoint
+
+    assert reopen(store).thread("t") == ("c2", 2, [comment(1), comment(2)])
+
+
+def test_page_spilled_twice_counts_once(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=2)
+    store.update_thread("t", "c1", 1, [comment(1)])
+    store.update_thread("t", "c2", 2, [comment(2)])
+    store.update_thread("t", "c3", 3, [comment(3)])
+
+    # Resumed at page 2: page 3 is fetched again and spilled a second time
+    resumed = reopen(store)
+    resumed.update_thread("t", "c3", 3, [comment(30)])
+    resumed.save()
+    assert reopen(resumed).thread("t") == ("c3", 3, [comment(1), comment(2), comment(30)])
+
+
+def test_incomplete_spill_restarts_the_thread(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    store.update_thread("t", "c1", 1, [comment(1)])
+    store.update_thread("t", "c2", 2, [comment(2)])
+    store._spill_files.pop("t").close()
+    spill = tmp_path / "checkpoints_threads" / "t.jsonl"
+    spill.write_text(spill.read_text().splitlines(keepends=True)[0])
+
+    resumed = CheckpointStore(store.filepath, save_every=1)
+    assert resumed.thread("t") == (None, 0, [])
+    assert "t" not in resumed.threads
+    assert not spill.exists()
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    store.update_thread("t", "c1", 1, [comment(1)])
+    store._spill_files.pop("t").close()
+    spill = tmp_path / "checkpoints_threads" / "t.jsonl"
+    with open(spill, "a", encoding="utf-8") as f:
+        f.write('{"page": 1, "comments": [{"cont')
+
+    resumed = CheckpointStore(store.filepath, save_every=1)
+    assert resumed.thread("t") == ("c1", 1, [comment(1)])
+    resumed.update_thread("t", "c2", 2, [comment(2)])
+    resumed = reopen(resumed)
+    assert [json.loads(line)["page"] for line in spill.read_text().splitlines()] == [0, 1]
+    assert resumed.thread("t") == ("c2", 2, [comment(1), comment(2)])
+
+
+def test_legacy_inline_comments(tmp_path):
+    path = tmp_path / "checkpoints.json"
+    path.write_text(json.dumps({"queries": {}, "threads": {
+        "t": {"cursor": "c2", "pages": 2, "comments": [comment(1).to_dict(), comment(2).to_dict()]}}}))
+    assert CheckpointStore(str(path)).thread("t") == ("c2", 2, [comment(1), comment(2)])
+
+
+def test_finish_thread_removes_the_spill(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.json"), save_every=1)
+    store.update_thread("t", "c1", 1, [comment(1)])
+    store.finish_thread("t")
+
+    assert not (tmp_path / "checkpoints_threads" / "t.jsonl").exists()
+    assert reopen(store).thread("t") == (None, 0, [])
+
+
+def test_in_memory_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = CheckpointStore(None, save_every=1)
+    store.update_query("q", "c1", 1)
+    store.update_thread("t", "c1", 1, [comment(1)])
+    store.update_thread("t", "c2", 2, [comment(2)])
+
+    assert store.save()
+    assert store.query("q") == ("c1", 1)
+    assert store.thread("t") == ("c2", 2, [comment(1), comment(2)])
+    store.finish_thread("t")
+    assert store.thread("t") == (None, 0, [])
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("use_pipeline", [False, True])
+def test_failed_search_page_keeps_the_checkpoint(tmp_path, monkeypatch, use_pipeline):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "checkpoints.json")
+
+    async def run(failing_search):
+        async with FakeTwitterAPI(pages=3, per_page=2, comment_pages=1) as api:
+            api.failing_search = failing_search
+            async with make_crawler(api, str(tmp_path)) as crawler:
+                if use_pipeline:
+                    await CrawlPipeline(crawler, stats_interval=60).run(["q"])
+                else:
+                    await crawler.crawl("q")
+            return api.search_queries
+
+    # Page 1 keeps failing after every retry: the crawl stops but is not finished
+    asyncio.run(run({"1": MAX_RETRIES + 1}))
+    assert CheckpointStore(path).query("q") == ("1", 1)
+
+    assert len(asyncio.run(run({}))) == 2  # resumes at page 1
+    assert CheckpointStore(path).query("q") == (None, 0)
+    with open(tmp_path / "LatentSearch.json", 'r', encoding='utf-8') as f:
+        stored = [record["tweet_id"] for record in json.load(f)]
+    assert sorted(stored, reverse=True) == [str(i) for i in range(1100, 1094, -1)]
@@ -0,0 +1,64 @@
+# tests/test_comment_policy.py
+
+from core.comment_policy import CommentFetchPolicy
+from core.extractors import TwitterDataExtractor
+from core.records import Tweet
+from fake_api import tweet_entry, tweet_result
+
+
+def tweet(tweet_id="1", likes=0, shares=0, reply_count=3, is_retweet=False, is_quote=False):
+    return Tweet(tweet_id, "text", None, likes, shares, None, "TWITTER", None, None, None, 0, None, [], None,
+                 reply_count, is_retweet, is_quote)
+
+
+def test_skip_reasons():
+    policy = CommentFetchPolicy(skip_quotes=True, min_engagement=5)
+    assert policy.skip_reason(tweet(tweet_id=None)) == "no_id"
+    assert policy.skip_reason(tweet(is_retweet=True)) == "retweet"
+    assert policy.skip_reason(tweet(is_quote=True, likes=10)) == "quote"
+    assert policy.skip_reason(tweet(reply_count=0, likes=10)) == "no_replies"
+    assert policy.skip_reason(tweet(likes=1, reply_count=3)) == "low_engagement"
+    assert policy.skip_reason(tweet(likes=1, shares=1, reply_count=3)) is None
+
+
+def test_tweets_without_a_reply_count_are_fetched():
+    assert CommentFetchPolicy(min_replies=5).skip_reason(tweet(reply_count=None)) is None
+
+
+def test_defaults_fetch_quotes_and_ignore_engagement():
+    policy = CommentFetchPolicy()
+    assert policy.should_fetch(tweet(is_quote=True))
+    assert policy.should_fetch(tweet(reply_count=1))
+
+
+def test_stats_count_skips_and_saved_calls():
+    policy = CommentFetchPolicy(max_pages=3, comments_per_page=100)
+    assert not policy.should_fetch(tweet(is_retweet=True, reply_count=250))  # 3 pages
+    assert not policy.should_fetch(tweet(is_retweet=True, reply_count=10_000))  # capped at max_pages
+    assert not policy.should_fetch(tweet(reply_count=0))  # the first page is still saved
+    assert policy.should_fetch(tweet())
+
+    assert policy.stats() == {"checked": 4, "fetched": 1, "skipped": {"retweet": 2, "no_replies": 1},
+                              "calls_saved": 3 + 3 + 1}
+
+
+def test_retweets_are_detected_from_the_payload_not_the_text():
+    extractor = TwitterDataExtractor()
+    policy = CommentFetchPolicy()
+
+    looks_like_retweet = extractor.parse_tweet(tweet_entry(10, text="RT @someone: quoting by hand"))
+    assert not looks_like_retweet.is_retweet
+    assert policy.should_fetch(looks_like_retweet)
+
+    entry = tweet_entry(11, text="a retweet without the RT prefix")
+    entry["content"]["itemContent"]["tweet_results"]["result"]["legacy"]["retweeted_status_result"] = {
+        "result": tweet_result(3)}
+    retweet = extractor.parse_tweet(entry)
+    assert retweet.is_retweet
+    assert policy.skip_reason(retweet) == "retweet"
+
+
+def test_from_settings():
+    policy = CommentFetchPolicy.from_settings(max_pages=7)
+    assert policy.max_pages == 7
+    assert policy.skip_retweets
@@ -0,0 +1,38 @@
+# tests/test_crawler.py
+
+import asyncio
+import json
+
+from fake_api import FakeTwitterAPI, make_crawler
+
+
+def crawl_records(directory, monkeypatch, api_options=None, crawler_options=None, **crawl_options):
+    directory.mkdir()
+    monkeypatch.chdir(directory)
+
+    async def run():
+        async with FakeTwitterAPI(**(api_options or {})) as api:
+            async with make_crawler(api, str(directory), **(crawler_options or {})) as crawler:
+                await crawler.crawl("q", **crawl_options)
+            return api.requests
+
+    requests = asyncio.run(run())
+    with open(directory / "LatentSearch.json", 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    for record in records:
+        record.pop("crawled_at", None)
+    return requests, records
+
+
+def test_concurrent_tweets_store_the_same_records_in_page_order(tmp_path, monkeypatch):
+    _, sequential = crawl_records(tmp_path / "one", monkeypatch, max_concurrent_tweets=1)
+    _, concurrent = crawl_records(tmp_path / "many", monkeypatch, max_concurrent_tweets=8)
+    assert concurrent == sequential
+    assert [record["tweet_id"] for record in sequential] == [str(i) for i in range(1100, 1090, -1)]
+
+
+def test_parse_workers_store_the_same_records(tmp_path, monkeypatch):
+    inline_requests, inline = crawl_records(tmp_path / "inline", monkeypatch)
+    pooled_requests, pooled = crawl_records(tmp_path / "pool", monkeypatch, crawler_options={"parse_workers": 2})
+    assert pooled == inline
+    assert pooled_requests == inline_requests
@@ -0,0 +1,64 @@
+# tests/test_data_handler.py
+
+import json
+import os
+
+from core.data_handler import TwitterDataHandler
+
+
+def read_lines(handler):
+    with open(handler.tweet_file, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_save_appends_one_record_per_tweet_and_skips_duplicates(tmp_path):
+    handler = TwitterDataHandler(str(tmp_path), fsync_policy="never")
+    assert handler.save_tweet({"tweet_id": "1", "content": "a"})
+    assert not handler.save_tweet({"tweet_id": "1", "content": "again"})
+    assert handler.save_tweets([{"tweet_id": "2"}, {"tweet_id": "3"}, {"tweet_id": "2"}]) == 2
+    handler.close()
+
+    lines = read_lines(handler)
+    assert [line["tweet"]["tweet_id"] for line in lines] == ["1", "2", "3"]
+    assert all(line["op"] == "tweet" for line in lines)
+
+
+def test_comment_updates_are_folded_into_their_tweet(tmp_path):
+    handler = TwitterDataHandler(str(tmp_path), fsync_policy="never")
+    handler.save_tweet({"tweet_id": "1", "comments": []})
+    assert handler.update_tweet_comments("1", [{"content": "first"}])
+    assert handler.update_tweet_comments("1", [{"content": "second"}])
+    assert not handler.update_tweet_comments("missing", [])
+
+    assert handler.get_tweet("1")["comments"] == [{"content": "second"}]
+    assert handler.get_tweet("missing") is None
+
+    assert handler.compact()
+    assert len(read_lines(handler)) == 1
+    assert handler.get_all_tweets()[0]["comments"] == [{"content": "second"}]
+    handler.close()
+
+
+def test_reopen_drops_a_torn_last_line(tmp_path):
+    handler = TwitterDataHandler(str(tmp_path), fsync_policy="always")
+    handler.save_tweet({"tweet_id": "1"})
+    handler.close()
+    with open(handler.tweet_file, 'a', encoding='utf-8') as f:
+        f.write('{"op": "tweet", "tweet": {"tweet_id": "2"')
+
+    reopened = TwitterDataHandler(str(tmp_path))
+    assert reopened.get_tweet_count() == 1
+    assert not reopened.has_tweet("2")
+    assert reopened.save_tweet({"tweet_id": "2"})
+    reopened.close()
+    assert [line["tweet"]["tweet_id"] for line in read_lines(reopened)] == ["1", "2"]
+
+
+def test_legacy_json_array_is_migrated(tmp_path):
+    with open(os.path.join(tmp_path, "tweets.json"), 'w', encoding='utf-8') as f:
+        json.dump([{"tweet_id": "7"}, {"tweet_id": "8"}], f)
+
+    handler = TwitterDataHandler(str(tmp_path))
+    assert handler.has_tweet("7") and handler.has_tweet("8")
+    assert [tweet["tweet_id"] for tweet in handler.get_all_tweets()] == ["7", "8"]
+    handler.close()
@@ -0,0 +1,125 @@
+# tests/test_extractors.py
+
+import pickle
+
+import pytest
+from jsonpath import jsonpath
+
+from core.extractors import TWEET_FIELDS, TwitterDataExtractor
+from core.records import Comment, Tweet, UserRef
+from fake_api import comment_entry, cursor_entry, tweet_entry, tweet_result
+
+TWEET = "$..content.itemContent.tweet_results.result."
+COMMENT = "$..content.items[0].item.itemContent.tweet_results.result."
+
+
+def first(data, path):
+    found = jsonpath(data, path)
+    return found[0] if found else None
+
+
+def reference_tweet(extractor, c):
+    """The dict extract_tweet_data built before records: every field read by its full path"""
+    content = first(c, TWEET + "legacy.full_text")
+    views = first(c, TWEET + "views.count")
+    mentions = jsonpath(c, TWEET + "legacy.entities.user_mentions.*") or []
+    return {
+        "id": first(c, TWEET + "legacy.id_str"),
+        "content": extractor.remove_tags_and_links(content) if content else None,
+        "datetime": extractor.convert_timestamp(first(c, TWEET + "legacy.created_at")),
+        "likes": int(first(c, TWEET + "legacy.favorite_count") or 0),
+        "shares": int(first(c, TWEET + "legacy.retweet_count") or 0),
+        "views": int(views) if views else views,
+        "source": "TWITTER",
+        "media": jsonpath(c, TWEET + "legacy.entities.media[*].media_url_https") or None,
+        "username": first(c, TWEET + "core.user_results.result.legacy.screen_name"),
+        "is_blueTick": first(c, TWEET + "core.user_results.result.is_blue_verified"),
+        "followers": int(first(c, TWEET + "core.user_results.result.legacy.followers_count") or 0),
+        "hashtags": jsonpath(c, TWEET + "legacy.entities.hashtags[*].text") or None,
+        "user_mentions": [{"name": m["name"], "screen_name": m["screen_name"]} for m in mentions],
+    }
+
+
+def test_tweet_matches_the_old_dict_extraction():
+    extractor = TwitterDataExtractor()
+    entry = tweet_entry(1042)
+    entry["content"]["itemContent"]["tweet_results"]["result"]["legacy"]["entities"]["media"] = [
+        {"media_url_https": "https://pbs.twimg.com/a.jpg"}, {"media_url_https": "https://pbs.twimg.com/b.jpg"}]
+
+    record = extractor.parse_tweet(entry)
+    stored = {name: value for name, value in record.to_dict().items() if name in reference_tweet(extractor, entry)}
+
+    assert stored == reference_tweet(extractor, entry)
+    assert record.content == "Hello tag1042 user1042 world"
+    assert record.datetime == "06-08-2024 02:54:02"
+    assert record.media == ["https://pbs.twimg.com/a.jpg", "https://pbs.twimg.com/b.jpg"]
+    assert record.user_mentions == [UserRef("U", "user1042")]
+
+
+def test_policy_signals_are_read_from_the_payload():
+    extractor = TwitterDataExtractor()
+    record = extractor.parse_tweet(tweet_entry(7, replies=0))
+    assert record.created_at == 1722912842
+    assert record.reply_count == 0
+    assert record.is_retweet is False and record.is_quote is False
+
+    entry = tweet_entry(8)
+    legacy = entry["content"]["itemContent"]["tweet_results"]["result"]["legacy"]
+    del legacy["reply_count"]
+    legacy["retweeted_status_result"] = {"result": tweet_result(3)}
+    legacy["is_quote_status"] = True
+    record = extractor.parse_tweet(entry)
+    assert record.reply_count is None
+    assert record.is_retweet is True and record.is_quote is True
+
+
+def test_missing_values_take_their_defaults():
+    extractor = TwitterDataExtractor()
+    entry = tweet_entry(9)
+    result = entry["content"]["itemContent"]["tweet_results"]["result"]
+    del result["views"]
+    result["legacy"]["favorite_count"] = 0
+    result["legacy"]["entities"] = {}
+
+    record = extractor.parse_tweet(entry)
+
+    assert record.views is None
+    assert record.likes == 0
+    assert record.media is None and record.hashtags is None
+    assert record.user_mentions == []
+    assert extractor.parse_tweet(tweet_entry(10)).user_mentions is not record.user_mentions
+
+
+def test_entries_without_text_or_id_are_skipped():
+    extractor = TwitterDataExtractor()
+    no_id = tweet_entry(11)
+    del no_id["content"]["itemContent"]["tweet_results"]["result"]["legacy"]["id_str"]
+
+    assert extractor.parse_tweet(cursor_entry("bottom")) is None
+    assert extractor.parse_tweet(no_id) is None
+    tweets = extractor.extract_tweets([tweet_entry(12), cursor_entry("top"), no_id, tweet_entry(13)])
+    assert [tweet.id for tweet in tweets] == ["12", "13"]
+
+
+def test_comments():
+    extractor = TwitterDataExtractor()
+    comments = extractor.extract_comments([comment_entry(5), cursor_entry("bottom"), comment_entry(6)])
+
+    assert [comment.content for comment in comments] == ["reply 5", "reply 6"]
+    comment = comments[0]
+    entry = comment_entry(5)
+    assert comment == Comment("reply 5", 5, 2, 10, None, False, 5)
+    assert comment.likes == int(first(entry, COMMENT + "legacy.favorite_count"))
+    assert comment.to_dict() == {"content": "reply 5", "likes": 5, "shares": 2, "views": 10, "media": None,
+                                 "is_blueTick": False, "followers": 5}
+
+
+def test_records_pickle_for_parse_workers():
+    record = TwitterDataExtractor().parse_tweet(tweet_entry(20))
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_fields_must_match_the_record():
+    extractor = TwitterDataExtractor()
+    with pytest.raises(ValueError):
+        extractor._bind(TWEET_FIELDS[:-1], Tweet)
@@ -0,0 +1,109 @@
+# tests/test_id_index.py
+
+import os
+
+from core.id_index import TweetIdIndex
+
+
+def make_log(tmp_path, lines):
+    log_file = os.path.join(tmp_path, "tweets.jsonl")
+    with open(log_file, 'w', encoding='utf-8') as f:
+        f.writelines(line + '\n' for line in lines)
+    return log_file
+
+
+def test_membership_across_tail_and_merges(tmp_path):
+    log_file = make_log(tmp_path, ['{"id": 1}'])
+    index = TweetIdIndex(str(tmp_path), log_file, merge_threshold=3)
+    assert index.add("10") and index.add(20)
+    assert not index.add("10")
+    assert not index.add("not-a-number")
+    assert index.add("5")  # reaches the threshold and merges
+    assert os.path.getsize(index.tail_file) == 0
+    assert index.add("7")
+    assert all(tweet_id in index for tweet_id in ("5", "7", "10", "20"))
+    assert "6" not in index and None not in index
+    assert len(index) == 4
+    index.close()
+
+    reopened = TweetIdIndex(str(tmp_path), log_file, merge_threshold=3)
+    assert not reopened.is_stale()
+    assert all(tweet_id in reopened for tweet_id in ("5", "7", "10", "20"))
+    reopened.close()
+
+
+def test_fresh_index_is_stale_until_built(tmp_path):
+    log_file = make_log(tmp_path, ['{"id": 1}'])
+    index = TweetIdIndex(str(tmp_path), log_file)
+    assert index.is_stale()
+    index.rebuild(["1"])
+    assert not index.is_stale()
+    assert index.covered_size() == os.path.getsize(log_file)
+    index.close()
+
+
+def test_appended_records_are_past_the_covered_size(tmp_path):
+    log_file = make_log(tmp_path, ['{"id": 1}'])
+    index = TweetIdIndex(str(tmp_path), log_file)
+    index.rebuild(["1"])
+    covered = index.covered_size()
+    index.close()
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write('{"id": 2}\n')
+
+    reopened = TweetIdIndex(str(tmp_path), log_file)
+    assert not reopened.is_stale()
+    assert reopened.covered_size() == covered
+    reopened.close()
+
+
+def test_truncated_log_is_stale(tmp_path):
+    log_file = make_log(tmp_path, ['{"id": 1}', '{"id": 2}'])
+    index = TweetIdIndex(str(tmp_path), log_file)
+    index.rebuild(["1", "2"])
+    index.close()
+    make_log(tmp_path, ['{"id": 1}'])
+    assert TweetIdIndex(str(tmp_path), log_file).is_stale()
+
+
+def test_same_size_rewrite_is_stale(tmp_path):
+    log_file = make_log(tmp_path, ['{"id": 1}', '{"id": 2}'])
+    index = TweetIdIndex(str(tmp_path), log_file)
+    index.rebuild(["1", "2"])
+    index.close()
+    with open(log_file, 'r+', encoding='utf-8') as f:
+        f.seek(len('{"id": 1}\n'))
+        f.write('{"id": 3}\n')
+    assert TweetIdIndex(str(tmp_path), log_file).is_stale()
+
+
+def test_replaced_log_is_stale(tmp_path):
+    log_file = make_log(tmp_path, ['{"id": 1}'])
+    index = TweetIdIndex(str(tmp_path), log_file)
+    index.rebuild(["1"])
+    index.close()
+    replacement = os.path.join(tmp_path, "other.jsonl")
+    with open(replacement, 'w', encoding='utf-8') as f:
+        f.write('{"id": 1}\n{"id": 9}\n')
+    os.replace(replacement, log_file)
+    assert TweetIdIndex(str(tmp_path), log_file).is_stale()
+
+
+def test_data_handler_indexes_records_written_after_the_last_sync(tmp_path):
+    from core.data_handler import TwitterDataHandler
+
+    handler = TwitterDataHandler(str(tmp_path), fsync_policy="always")
+    handler.save_tweet({"tweet_id": "1"})
+    synced_tail = os.path.getsize(handler._processed_ids.tail_file)
+    handler.fsync_policy = "never"
+    handler.save_tweet({"tweet_id": "2"})
+    handler._log.close()
+    handler._processed_ids._close_files()
+    # The log record reached the disk but the index's unsynced tail did not
+    with open(handler._processed_ids.tail_file, 'r+b') as f:
+        f.truncate(synced_tail)
+
+    reopened = TwitterDataHandler(str(tmp_path))
+    assert reopened.has_tweet("1") and reopened.has_tweet("2")
+    assert not reopened.save_tweet({"tweet_id": "2"})
+    reopened.close()
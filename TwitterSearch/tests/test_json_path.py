@@ -0,0 +1,62 @@
+# tests/test_json_path.py
+
+import pytest
+from jsonpath import jsonpath
+
+from utils.json_path import compile_path, find_all, find_first
+
+DOCUMENT = {
+    "data": {
+        "user": {"name": "a", "ids": [10, 20, 30], "0": "zero-key"},
+        "entries": [
+            {"content": {"text": "first", "items": [{"id": 1}, {"id": 2}]}},
+            {"content": {"text": "second", "items": []}},
+            {"other": {"id": 3}},
+        ],
+        "empty": {},
+        "falsy": 0,
+    },
+    "id": 99,
+}
+
+PATHS = [
+    "data.user.name",
+    "$.data.user.name",
+    "data.user.ids.1",
+    "data.user.ids.7",
+    "data.user.0",
+    "data.entries[*].content.text",
+    "data.entries.*.content.items.*.id",
+    "data..id",
+    "$..id",
+    "..text",
+    "data.missing.path",
+    "data.empty",
+    "data.falsy",
+    "data.entries[0].content.text",
+    "data.entries[?(@.other)].other.id",
+    "data.entries[0:2].content.text",
+]
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_matches_the_jsonpath_package(path):
+    assert find_all(DOCUMENT, path) == jsonpath(DOCUMENT, path)
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_find_first_is_the_first_match(path):
+    expected = jsonpath(DOCUMENT, path)
+    assert find_first(DOCUMENT, path) == (expected[:1] if expected else False)
+
+
+@pytest.mark.parametrize("obj", [None, {}, [], "", 0])
+def test_empty_documents_have_no_match(obj):
+    assert find_all(obj, "a.b") is False
+    assert find_first(obj, "..a") is False
+
+
+def test_paths_are_compiled_once_and_filters_fall_back():
+    assert compile_path("data.user.name") is compile_path("data.user.name")
+    assert compile_path("data.entries[?(@.other)].other.id") is None
+    assert find_all(DOCUMENT, "") is False
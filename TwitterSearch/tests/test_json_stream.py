@@ -0,0 +1,155 @@
+# tests/test_json_stream.py
+
+import json
+
+import pytest
+
+import core.page_parser as page_parser
+from core.page_parser import (CommentPageStream, SearchPageStream, _TimelineStream, parse_comment_page,
+                              parse_search_page)
+from core.timeline import TimelineResolver
+from fake_api import comment_entry, cursor_entry, tweet_entry
+from utils.json_stream import EntryStreamParser
+
+DOCUMENT = {
+    "cursor": {"bottom": "DAAB]{\"x\":1}", "top": None},
+    "result": {"timeline": {"instructions": [
+        {"type": "TimelineClearCache"},
+        {"type": "TimelineAddEntries", "entries": [
+            {"entryId": "a", "text": "brackets ] } [ { and \"quotes\" and \\ backslash"},
+            {"entryId": "b", "text": "ünïcödé 日本語 🙂  ", "nested": {"entries": [1, 2]}},
+            125,
+            -2.5e3,
+            "plain string",
+            [1, [2, [3]]],
+            None,
+            True,
+        ]},
+        {"type": "TimelineAddEntries", "entries": []},
+    ]}},
+    "other": {"entries": [{"not": "streamed"}], "instructions": "not a list"},
+    "numbers": [0, -1, 3.25, 1e10],
+}
+
+
+def stream(body: bytes, size: int):
+    parser = EntryStreamParser()
+    entries = []
+    for start in range(0, len(body), size):
+        entries.extend(parser.feed(body[start:start + size]))
+    return entries, parser.close()
+
+
+def expected_skeleton(document):
+    skeleton = json.loads(json.dumps(document))
+    for instruction in skeleton["result"]["timeline"]["instructions"]:
+        if "entries" in instruction:
+            instruction["entries"] = []
+    return skeleton
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_chunked_stream_matches_json_loads(size, indent):
+    body = json.dumps(DOCUMENT, ensure_ascii=False, indent=indent).encode("utf-8")
+    entries, skeleton = stream(body, size)
+
+    instructions = DOCUMENT["result"]["timeline"]["instructions"]
+    assert entries == [(1, entry) for entry in instructions[1]["entries"]]
+    assert skeleton == expected_skeleton(DOCUMENT)
+
+
+def test_entries_are_returned_by_the_chunk_that_completes_them():
+    body = json.dumps({"result": {"instructions": [{"entries": [{"id": 1}, {"id": 2}]}]}}).encode()
+    parser = EntryStreamParser()
+    split = body.index(b'{"id": 2}') + 3
+    assert parser.feed(body[:split]) == [(0, {"id": 1})]
+    assert parser.feed(body[split:]) == [(0, {"id": 2})]
+    assert parser.close() == {"result": {"instructions": [{"entries": []}]}}
+
+
+@pytest.mark.parametrize("body", [b'{"result": {"instructions": [{"entries": [{"id": 1}',
+                                  b'{"a": 1', b'{"a": tru', b''])
+def test_incomplete_document_raises(body):
+    parser = EntryStreamParser()
+    with pytest.raises(ValueError):
+        parser.feed(body)
+        parser.close()
+
+
+def test_extra_data_raises():
+    parser = EntryStreamParser()
+    parser.feed(b'{"a": 1} {"b": 2}')
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_non_object_document():
+    parser = EntryStreamParser()
+    parser.feed(b'[1, 2, 3]')
+    assert parser.close() is None
+
+
+def search_body(entries, index=0):
+    instructions = [{"type": "TimelineClearCache"}] * index + [{"type": "TimelineAddEntries", "entries": entries}]
+    return json.dumps({"cursor": {"bottom": "next", "top": "top"},
+                       "result": {"timeline": {"instructions": instructions}}}).encode()
+
+
+def comment_body(entries):
+    return json.dumps({"cursor": {"bottom": "more"},
+                       "result": {"instructions": [{"type": "TimelineAddEntries", "entries": entries}]}}).encode()
+
+
+def streamed(page_stream, body, size=50):
+    parser = EntryStreamParser()
+    for start in range(0, len(body), size):
+        for index, entry in parser.feed(body[start:start + size]):
+            page_stream.add(index, entry)
+    return page_stream.finish(parser.close())
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    resolver = TimelineResolver()
+    monkeypatch.setattr(page_parser, "_resolver", resolver)
+    return resolver
+
+
+def test_search_stream_matches_parse_search_page(resolver):
+    body = search_body([tweet_entry(i) for i in range(20, 10, -1)] + [cursor_entry("top"), cursor_entry("bottom")])
+    assert streamed(SearchPageStream(), body) == parse_search_page(body)
+    assert streamed(SearchPageStream(), body)["entries"] == 12
+
+
+def test_search_stream_replays_entries_when_the_layout_moves(resolver):
+    first = search_body([tweet_entry(5)])
+    moved = search_body([tweet_entry(4), tweet_entry(3)], index=2)
+
+    assert streamed(SearchPageStream(), first) == parse_search_page(first)
+    page_stream = SearchPageStream()
+    assert page_stream.index == 0
+    result = streamed(page_stream, moved)
+    assert [tweet.id for tweet in result["tweets"]] == ["4", "3"]
+    assert result["entries"] == 2
+    assert resolver.expected_index("search") == 2
+    assert resolver.drift_events == {"search": 1}
+
+
+def test_comment_stream_matches_parse_comment_page(resolver):
+    body = comment_body([cursor_entry("top")] + [comment_entry(i) for i in range(7)] + [cursor_entry("bottom")])
+    result = streamed(CommentPageStream(), body, size=17)
+    assert result == parse_comment_page(body)
+    assert result["ids"] == [f"conversationthread-{i}" for i in range(7)]
+
+
+def test_comment_stream_without_comments(resolver):
+    body = comment_body([cursor_entry("top"), cursor_entry("bottom")])
+    assert streamed(CommentPageStream(), body) is None
+    assert parse_comment_page(body) is None
+    assert CommentPageStream().finish(None) is None
+
+
+def test_timeline_stream_is_abstract():
+    with pytest.raises(TypeError):
+        _TimelineStream()
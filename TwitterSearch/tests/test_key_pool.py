@@ -0,0 +1,109 @@
+# tests/test_key_pool.py
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from utils.key_pool import KeyPool, KeyPoolExhausted
+
+
+def make_pool(keys=("a", "b"), **kwargs):
+    settings = dict(rate_per_key=1000, burst=100, daily_quota=None, quarantine_seconds=30, state_file=None)
+    settings.update(kwargs)
+    return KeyPool(list(keys), **settings)
+
+
+def test_requests_are_spread_over_the_keys():
+    async def run():
+        pool = make_pool(burst=2, rate_per_key=1)
+        return [(await pool.acquire()).key for _ in range(4)]
+
+    assert sorted(asyncio.run(run())) == ["a", "a", "b", "b"]
+
+
+def test_rejected_key_is_quarantined_for_retry_after():
+    pool = make_pool()
+    key_a = pool.keys[0]
+    assert pool.report(key_a, 429, retry_after="5")
+    assert 4 < key_a.quarantined_until - time.time() <= 5
+    # Requests already in flight on the key do not extend the quarantine
+    until = key_a.quarantined_until
+    assert pool.report(key_a, 429, retry_after="60")
+    assert key_a.quarantined_until == until
+
+    async def run():
+        return [(await pool.acquire()).key for _ in range(3)]
+
+    assert asyncio.run(run()) == ["b", "b", "b"]
+
+
+def test_quarantine_backs_off_without_retry_after():
+    pool = make_pool()
+    key_a = pool.keys[0]
+    backoffs = []
+    for _ in range(3):
+        key_a.quarantined_until = 0.0
+        pool.report(key_a, 403)
+        backoffs.append(round(key_a.quarantined_until - time.time()))
+    assert backoffs == [30, 60, 120]
+    pool.report(key_a, 200)
+    assert key_a.failures == 0
+
+
+def test_last_usable_key_is_never_quarantined():
+    pool = make_pool(keys=("only",))
+    assert not pool.report(pool.keys[0], 429, retry_after="300")
+    assert not pool.keys[0].is_quarantined(time.time())
+
+    pool = make_pool()
+    assert pool.report(pool.keys[0], 429)
+    assert not pool.report(pool.keys[1], 429)
+
+
+def test_daily_quota_counts_granted_requests_only():
+    async def run():
+        pool = make_pool(keys=("a",), daily_quota=2, rate_per_key=1, burst=1)
+        await pool.acquire()
+        waiting = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.01)
+        # The waiting request holds the last unit of quota
+        with pytest.raises(KeyPoolExhausted):
+            await pool.acquire()
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert pool.keys[0].used_today == 1 and pool.keys[0].pending == 0
+
+    asyncio.run(run())
+
+
+def test_state_persists_by_fingerprint(tmp_path):
+    state_file = str(tmp_path / "keys.json")
+
+    async def run():
+        pool = make_pool(keys=("secret-one", "secret-two"), state_file=state_file)
+        for _ in range(3):
+            await pool.acquire()
+        pool.report(pool.keys[0], 429, retry_after="120")
+        await pool.close()
+        return pool
+
+    pool = asyncio.run(run())
+    with open(state_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert "secret" not in json.dumps(saved)
+    assert sum(state["used_today"] for state in saved.values()) == 3
+
+    reloaded = make_pool(keys=("secret-one", "secret-two"), state_file=state_file)
+    assert [key.used_today for key in reloaded.keys] == [key.used_today for key in pool.keys]
+    assert reloaded.keys[0].is_quarantined(time.time())
+
+
+def test_saved_quarantines_do_not_stall_startup(tmp_path):
+    state_file = str(tmp_path / "keys.json")
+    pool = make_pool(keys=("a",), state_file=state_file)
+    pool.keys[0].quarantined_until = time.time() + 600
+    pool.save()
+    assert not make_pool(keys=("a",), state_file=state_file).keys[0].is_quarantined(time.time())
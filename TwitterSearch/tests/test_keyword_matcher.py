@@ -0,0 +1,104 @@
+# tests/test_keyword_matcher.py
+
+import random
+
+import pytest
+
+from core.scraping_utils import ScrapingUtils
+from utils.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+
+def naive_contains(text, keywords):
+    return any(keyword.lower() in text.lower() for keyword in keywords)
+
+
+def naive_matches(text, keywords):
+    """Keywords ordered by where their first occurrence ends; of two ending together, the longer first"""
+    lowered = text.lower()
+    positions = {}
+    for keyword in keywords:
+        position = lowered.find(keyword.lower())
+        if position >= 0 and keyword not in positions:
+            positions[keyword] = (position + len(keyword), -len(keyword), keywords.index(keyword))
+    return sorted(positions, key=positions.get)
+
+
+def random_words(rng, count, alphabet="abAB", longest=4):
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, longest))) for _ in range(count)]
+
+
+def test_contains_matches_the_substring_check():
+    rng = random.Random(3)
+    for _ in range(300):
+        keywords = random_words(rng, rng.randint(1, 6))
+        matcher = KeywordMatcher(keywords)
+        for text in random_words(rng, 5, alphabet="abAB ", longest=12):
+            assert matcher.contains(text) == naive_contains(text, keywords), (text, keywords)
+
+
+def test_matches_in_order_of_first_occurrence():
+    rng = random.Random(5)
+    for _ in range(300):
+        keywords = list(dict.fromkeys(random_words(rng, rng.randint(1, 6), alphabet="abc", longest=3)))
+        text = random_words(rng, 1, alphabet="abc ", longest=15)[0]
+        assert KeywordMatcher(keywords).matches(text) == naive_matches(text, keywords), (text, keywords)
+
+
+def test_overlapping_and_nested_keywords():
+    matcher = KeywordMatcher(["he", "she", "his", "hers", "Crypto"])
+    assert matcher.matches("USHERS buy cryptocurrency") == ["she", "he", "hers", "Crypto"]
+    assert matcher.matches("nothing here") == ["he"]
+    assert not matcher.contains("nothing")
+
+
+def test_unicode_case_folding():
+    matcher = KeywordMatcher(["ΣΟΦΊΑ", "straße", "日本"])
+    assert matcher.matches("σοφία in 日本語 and STRASSE") == ["ΣΟΦΊΑ", "日本"]
+    assert naive_contains("Straße", ["STRASSE"]) is KeywordMatcher(["STRASSE"]).contains("Straße")
+
+
+def test_word_boundary():
+    matcher = KeywordMatcher(["art", "new york"], word_boundary=True)
+    assert not matcher.contains("party started")
+    assert not matcher.contains("art_work")
+    assert matcher.matches("Art, in New York!") == ["art", "new york"]
+    assert matcher.matches("New Yorker art") == ["art"]
+
+
+def test_empty_keyword_matches_every_text():
+    assert KeywordMatcher(["", "x"]).matches("abc") == [""]
+    assert KeywordMatcher([""]).contains("") is naive_contains("", [""])
+    assert not KeywordMatcher([]).contains("abc")
+
+
+def test_shared_matcher_is_built_once_per_list():
+    keywords = ["alpha", "beta"]
+    matcher = get_keyword_matcher(keywords)
+    assert get_keyword_matcher(keywords) is matcher
+    assert get_keyword_matcher(["alpha", "beta"]) is not matcher
+    assert get_keyword_matcher(keywords, word_boundary=True) is not matcher
+
+    keywords.append("gamma")
+    grown = get_keyword_matcher(keywords)
+    assert grown is not matcher
+    assert grown.contains("GAMMA ray")
+
+
+def test_scraping_utils_accepts_lists_and_matchers(tmp_path):
+    utils = ScrapingUtils()
+    path = tmp_path / "keywords.txt"
+    path.write_text("Bitcoin\nélan\n", encoding="utf-8")
+
+    keywords = utils.load_keywords(str(path))
+    matcher = utils.load_keyword_matcher(str(path))
+    for argument in (keywords, matcher):
+        assert utils.contains_keywords("buy BITCOIN now", argument)
+        assert utils.matching_keywords("ÉLAN and bitcoin", argument) == ["élan", "Bitcoin"]
+        assert not utils.contains_keywords(None, argument)
+        assert utils.matching_keywords(None, argument) == []
+
+
+@pytest.mark.parametrize("text", ["", "a", "İstanbul", "ﬃ ligature"])
+def test_texts_that_change_length_when_lowered(text):
+    keywords = ["i̇", "ffi", "a"]
+    assert KeywordMatcher(keywords).contains(text) == naive_contains(text, keywords)
@@ -0,0 +1,102 @@
+# tests/test_pipeline.py
+
+import asyncio
+import json
+
+import pytest
+
+from core.checkpoint import CheckpointStore
+from core.pipeline import CrawlPipeline, QueryProgress
+from fake_api import FakeTwitterAPI, make_crawler
+
+
+def test_checkpoint_only_advances_past_fully_written_pages():
+    checkpoints = CheckpointStore(None)
+    progress = QueryProgress("q", checkpoints, first_page=0)
+    progress.opened(0, 2, "c1")
+    progress.opened(1, 1, "c2")
+    progress.written(1)
+    assert checkpoints.query("q") == (None, 0)  # page 0 is still in flight
+
+    progress.written(0)
+    assert checkpoints.query("q") == (None, 0)
+    progress.written(0)
+    assert checkpoints.query("q") == ("c2", 2)
+    assert progress.pages == {}
+
+
+def test_empty_and_settled_pages_advance_in_order():
+    checkpoints = CheckpointStore(None)
+    progress = QueryProgress("q", checkpoints, first_page=3)
+    progress.opened(4, 0, "c5")
+    assert checkpoints.query("q") == (None, 0)
+    progress.opened(3, 4, "c4")
+    progress.written(3, tweets=4)  # e.g. routing failed and none will reach the writer
+    assert checkpoints.query("q") == ("c5", 5)
+
+
+def test_last_page_without_cursor_keeps_the_previous_checkpoint():
+    checkpoints = CheckpointStore(None)
+    progress = QueryProgress("q", checkpoints, first_page=0)
+    progress.opened(0, 0, "c1")
+    progress.opened(1, 0, None)
+    assert checkpoints.query("q") == ("c1", 1)
+    assert progress.next_page == 2
+
+
+def stored(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    return {record["tweet_id"]: (record["queries"], [c["content"] for c in record["comments"]]) for record in records}
+
+
+@pytest.mark.parametrize("workers", [None, {"search": 1, "comments": 1}])
+def test_pipeline_stores_what_crawl_stores(tmp_path, monkeypatch, workers):
+    async def run(directory, use_pipeline):
+        directory.mkdir()
+        monkeypatch.chdir(directory)
+        async with FakeTwitterAPI(pages=3, per_page=4) as api:
+            async with make_crawler(api, str(directory)) as crawler:
+                if use_pipeline:
+                    await CrawlPipeline(crawler, workers=workers, stats_interval=60).run(["q"])
+                else:
+                    await crawler.crawl("q")
+            return api.requests, stored(directory / "LatentSearch.json")
+
+    crawl_requests, crawled = asyncio.run(run(tmp_path / "crawl", False))
+    pipeline_requests, piped = asyncio.run(run(tmp_path / "pipeline", True))
+    assert piped == crawled
+    assert pipeline_requests == crawl_requests == {"search": 3, "comments": 12 * 2}
+    assert all(len(comments) == 6 for _, comments in crawled.values())
+
+
+def test_pipeline_checkpoints_and_resumes_a_query(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def run():
+        async with FakeTwitterAPI(pages=3, per_page=2) as api:
+            async with make_crawler(api, str(tmp_path)) as crawler:
+                crawler.checkpoints.update_query("q", "2", 2)  # as left by an interrupted crawl
+                await CrawlPipeline(crawler, stats_interval=60).run(["q"])
+            return api.requests
+
+    requests = asyncio.run(run())
+    assert requests["search"] == 1
+    assert sorted(stored(tmp_path / "LatentSearch.json")) == ["1095", "1096"]
+    assert CheckpointStore(str(tmp_path / "checkpoints.json")).query("q") == (None, 0)
+
+
+def test_overlapping_queries_store_each_tweet_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def run():
+        async with FakeTwitterAPI(pages=1, per_page=3) as api:
+            async with make_crawler(api, str(tmp_path)) as crawler:
+                await CrawlPipeline(crawler, stats_interval=60).run(["a", "b"])
+            return api.requests
+
+    requests = asyncio.run(run())
+    records = stored(tmp_path / "LatentSearch.json")
+    assert len(records) == 3
+    assert all(sorted(queries) == ["a", "b"] for queries, _ in records.values())
+    assert requests["comments"] == 3 * 2
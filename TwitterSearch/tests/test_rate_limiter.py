@@ -0,0 +1,64 @@
+# tests/test_rate_limiter.py
+
+import asyncio
+
+import pytest
+
+from utils.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_burst_is_free_and_the_rest_is_paced():
+    async def run():
+        bucket = TokenBucket(rate=100, burst=3)
+        return [await bucket.acquire() for _ in range(5)]
+
+    waits = asyncio.run(run())
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0 < waits[3] <= 0.011 and 0 < waits[4] <= 0.011
+
+
+def test_waiters_are_served_in_arrival_order():
+    async def run():
+        bucket = TokenBucket(rate=200, burst=1)
+        order = []
+
+        async def take(n):
+            await bucket.acquire()
+            order.append(n)
+
+        await asyncio.gather(*(take(n) for n in range(6)))
+        return order
+
+    assert asyncio.run(run()) == list(range(6))
+
+
+def test_cancelled_waiter_returns_its_reservation():
+    async def run():
+        bucket = TokenBucket(rate=10, burst=1)
+        await bucket.acquire()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return bucket.available_tokens()
+
+    assert asyncio.run(run()) > -0.5
+
+
+def test_endpoint_bucket_applies_on_top_of_the_shared_one():
+    async def run():
+        limiter = RateLimiter(calls_per_second=1000, burst=100, endpoint_limits={"user": (50, 1)})
+        await limiter.acquire("user")
+        slow = await limiter.acquire("user")
+        fast = await limiter.acquire("search")
+        return slow, fast, limiter.stats()
+
+    slow, fast, stats = asyncio.run(run())
+    assert slow > 0.01 and fast == 0.0
+    assert stats["user"]["acquired"] == 2 and stats["shared"]["acquired"] == 3
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, burst=1)
@@ -0,0 +1,75 @@
+# tests/test_records.py
+
+import json
+import pickle
+import sys
+
+import pytest
+
+from core.records import Comment, Tweet, UserRef, intern_str, record_default, user_refs
+
+TWEET_DICT = {
+    "id": "1", "content": "hello", "datetime": "06-08-2024 02:54:02", "likes": 3, "shares": 1, "views": None,
+    "source": "TWITTER", "media": ["https://pbs.twimg.com/a.jpg"], "username": "someone", "is_blueTick": False,
+    "followers": 5, "hashtags": ["tag"], "user_mentions": [{"name": "U", "screen_name": "user"}],
+    "created_at": 1722912842, "reply_count": 0, "is_retweet": False, "is_quote": False,
+}
+
+
+def make_tweet():
+    values = dict(TWEET_DICT, user_mentions=user_refs(TWEET_DICT["user_mentions"]))
+    return Tweet(*(values[name] for name in Tweet.__slots__))
+
+
+def test_records_have_no_instance_dict():
+    tweet = make_tweet()
+    assert not hasattr(tweet, "__dict__")
+    with pytest.raises(AttributeError):
+        tweet.extra = 1
+
+
+def test_dict_style_access():
+    tweet = make_tweet()
+    assert tweet["id"] == "1"
+    assert tweet.get("likes") == 3
+    assert tweet.get("missing", "default") == "default"
+    assert list(tweet.keys()) == list(TWEET_DICT)
+    assert list(tweet) == list(TWEET_DICT)
+    with pytest.raises(KeyError):
+        tweet["missing"]
+
+
+def test_to_dict_converts_nested_records():
+    assert make_tweet().to_dict() == TWEET_DICT
+    assert json.loads(json.dumps({"tweet": make_tweet(), "comments": [Comment("c", 1, 0, None, None, True, 2)]},
+                                 default=record_default)) == {
+        "tweet": TWEET_DICT,
+        "comments": [{"content": "c", "likes": 1, "shares": 0, "views": None, "media": None,
+                      "is_blueTick": True, "followers": 2}]}
+    with pytest.raises(TypeError):
+        json.dumps({"value": object()}, default=record_default)
+
+
+def test_from_dict_round_trip():
+    comment = Comment("c", 1, 0, 7, ["m"], False, 2)
+    assert Comment.from_dict(comment.to_dict()) == comment
+    assert Comment.from_dict({"content": "partial"}) == Comment("partial", None, None, None, None, None, None)
+
+
+def test_equality_needs_the_same_type():
+    assert UserRef("a", "b") == UserRef("a", "b")
+    assert UserRef("a", "b") != UserRef("a", "c")
+    assert UserRef("a", "b") != {"name": "a", "screen_name": "b"}
+
+
+def test_pickle_round_trip():
+    tweet = make_tweet()
+    assert pickle.loads(pickle.dumps(tweet)) == tweet
+
+
+def test_repeated_strings_are_interned():
+    name = "".join(["some", "one"])
+    assert intern_str(name) is sys.intern("someone")
+    assert intern_str(5) == 5
+    refs = user_refs([{"name": "".join(["U", "1"]), "screen_name": "u"} for _ in range(2)])
+    assert refs[0].name is refs[1].name
@@ -0,0 +1,95 @@
+# tests/test_seen_tweets.py
+
+import asyncio
+import json
+
+from core.seen_tweets import SeenTweets
+from fake_api import FakeTwitterAPI, make_crawler
+
+
+def write_records(path, records):
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+def read_records(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_claim_and_release():
+    seen = SeenTweets()
+    assert seen.claim("1", "a")
+    assert not seen.claim("1", "b")
+    assert not seen.claim("1", "b")
+    assert seen.queries["1"] == ["a", "b"]
+    assert seen.pending == {"1": ["b"]}
+    assert seen.duplicates == 2
+
+    seen.release("1")
+    assert "1" not in seen.pending
+    assert seen.claim("1", "b")
+    assert seen.claim("2", None)
+    assert seen.queries["2"] == []
+
+
+def test_flush_adds_queries_to_the_stored_records(tmp_path):
+    path = tmp_path / "LatentSearch.json"
+    write_records(path, [{"tweet_id": "1", "queries": ["a"]}, {"tweet_id": "2"}, "not a record"])
+    seen = SeenTweets(str(path))
+    assert not seen.claim("1", "b")
+    assert not seen.claim("2", "b")
+    assert not seen.claim("2", "c")
+
+    seen.flush()
+    assert read_records(path) == [{"tweet_id": "1", "queries": ["a", "b"]},
+                                  {"tweet_id": "2", "queries": ["b", "c"]}, "not a record"]
+    assert seen.pending == {}
+    assert [p.name for p in tmp_path.iterdir()] == ["LatentSearch.json"]
+
+    seen.flush()
+    assert read_records(path)[0] == {"tweet_id": "1", "queries": ["a", "b"]}
+
+
+def test_failed_flush_keeps_the_pending_queries(tmp_path, monkeypatch):
+    path = tmp_path / "LatentSearch.json"
+    write_records(path, [{"tweet_id": "1", "queries": ["a"]}])
+    seen = SeenTweets(str(path))
+    seen.claim("1", "b")
+
+    monkeypatch.setattr("core.seen_tweets.save_json_state", lambda filepath, state: False)
+    seen.flush()
+    assert seen.pending == {"1": ["b"]}
+    assert read_records(path) == [{"tweet_id": "1", "queries": ["a"]}]
+
+
+def test_flush_without_an_output_file(tmp_path):
+    seen = SeenTweets(str(tmp_path / "missing.json"))
+    seen.claim("1", "a")
+    seen.claim("1", "b")
+    seen.flush()
+    assert seen.pending == {"1": ["b"]}
+    assert not (tmp_path / "missing.json").exists()
+
+
+def test_seeding_from_the_output_file(tmp_path):
+    path = tmp_path / "LatentSearch.json"
+    write_records(path, [{"tweet_id": "1", "queries": ["a"]}])
+
+    assert not SeenTweets(str(path)).claim("1", "a")
+    assert SeenTweets(str(path), across_runs=False).claim("1", "a")
+
+
+def test_overlapping_queries_fetch_comments_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def run():
+        async with FakeTwitterAPI(pages=1) as api:
+            async with make_crawler(api, str(tmp_path)) as crawler:
+                await crawler.crawl("a", incremental=False)
+                await crawler.crawl("b", incremental=False)
+            return api.requests
+
+    requests = asyncio.run(run())
+    records = read_records(tmp_path / "LatentSearch.json")
+    assert [record["tweet_id"] for record in records] == [str(i) for i in range(1100, 1095, -1)]
+    assert all(record["queries"] == ["a", "b"] for record in records)
+    assert requests == {"search": 2, "comments": 5 * 2}
@@ -0,0 +1,20 @@
+# tests/test_session_manager.py
+
+import asyncio
+
+from utils.session_manager import SessionManager
+
+
+def test_one_session_until_closed():
+    async def run():
+        async with SessionManager(limit=5, limit_per_host=2) as manager:
+            first = await manager.get_session()
+            assert await manager.get_session() is first
+            assert first.connector.limit == 5 and first.connector.limit_per_host == 2
+            await manager.close()
+            assert first.closed
+            second = await manager.get_session()
+            assert second is not first
+        assert second.closed
+
+    asyncio.run(run())
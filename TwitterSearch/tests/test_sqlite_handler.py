@@ -0,0 +1,51 @@
+# tests/test_sqlite_handler.py
+
+import os
+
+from core.sqlite_handler import SQLiteDataHandler
+
+
+def test_save_counts_new_tweets_and_upserts_existing(tmp_path):
+    handler = SQLiteDataHandler(str(tmp_path))
+    assert handler.save_tweets([{"tweet_id": "1", "likes": 1}, {"tweet_id": "2"}]) == 2
+    assert handler.save_tweets([{"tweet_id": "1", "likes": 5}, {"tweet_id": "3"}]) == 1
+    assert not handler.save_tweet({"tweet_id": "1", "likes": 9})
+
+    assert handler.get_tweet_count() == 3
+    tweet = handler.get_tweet("1")
+    assert tweet["likes"] == 9
+    assert "updated_at" in tweet
+    assert [tweet["tweet_id"] for tweet in handler.get_all_tweets()] == ["1", "2", "3"]
+    handler.close()
+
+
+def test_upsert_keeps_comments_unless_the_record_carries_them(tmp_path):
+    handler = SQLiteDataHandler(str(tmp_path))
+    record = {"tweet_id": "1", "comments": [{"content": "a"}, {"content": "b"}]}
+    handler.save_tweet(record)
+    assert record["comments"] == [{"content": "a"}, {"content": "b"}]  # the caller's dict is left alone
+
+    handler.save_tweet({"tweet_id": "1", "likes": 2})
+    assert handler.get_tweet("1")["comments"] == [{"content": "a"}, {"content": "b"}]
+
+    handler.save_tweet({"tweet_id": "1", "comments": [{"content": "c"}]})
+    assert handler.get_tweet("1")["comments"] == [{"content": "c"}]
+
+    assert handler.update_tweet_comments("1", [])
+    assert handler.get_tweet("1")["comments"] == []
+    assert not handler.update_tweet_comments("missing", [{"content": "x"}])
+    handler.close()
+
+
+def test_close_checkpoints_the_wal(tmp_path):
+    handler = SQLiteDataHandler(str(tmp_path))
+    handler.save_tweet({"tweet_id": "1"})
+    handler.close()
+    wal = handler.db_file + "-wal"
+    assert not os.path.exists(wal) or os.path.getsize(wal) == 0
+
+    reopened = SQLiteDataHandler(str(tmp_path))
+    assert reopened.has_tweet("1")
+    reopened.clear_all_data()
+    assert reopened.get_tweet_count() == 0
+    reopened.close()
@@ -0,0 +1,98 @@
+# tests/test_text_normalizer.py
+
+import html
+import re
+
+import pytest
+
+from core.scraping_utils import ScrapingUtils
+from utils.text_normalizer import TextNormalizer, get_normalizer
+
+TEXTS = [
+    "",
+    "   ",
+    "plain ascii text",
+    "RT @someone: Hello @user #tag https://t.co/abc world",
+    "RT @a:RT @b: nested retweet markers",
+    "email@example.com and @ alone and # alone and #",
+    "@user_1@user_2 ##double #ümlaut @Ñandú",
+    "http://example.com/x?y=1 https://t.co/q\nnext line https://t.co/end",
+    "&amp; &lt;tag&gt; &quot;quoted&quot; &#64;escaped &#35;hash",
+    "zero\u200bwidth\u200f marks\u2028and\u202f\u2060joiner\u206f end",
+    "tabs\tand\r\nnewlines\n\n  and\xa0nbsp\u3000ideographic",
+    "混合 текст مرحبا 🙂 #日本 @ユーザー https://t.co/日本",
+    "trailing link https://t.co/",
+]
+
+
+def old_remove_tags_and_links(text):
+    """ScrapingUtils.remove_tags_and_links before the normalizer"""
+    if not isinstance(text, str):
+        return ""
+    text = html.unescape(text)
+    text = re.sub(r'RT @\w+:', '', text)
+    text = re.sub(r'@(\w+)', r'\1', text)
+    text = re.sub(r'https?://\S+', '', text)
+    text = re.sub(r'#(\w+)', r'\1', text)
+    text = re.sub(r'[\u200b-\u200f\u2028-\u202f\u205f-\u206f]', '', text)
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def old_normalize_text(text):
+    """ScrapingUtils.normalize_text before the normalizer"""
+    if not isinstance(text, str):
+        return ""
+    text = html.unescape(text)
+    text = text.replace("\n", " ")
+    text = text.replace("\r", " ")
+    text = text.replace("\t", " ")
+    text = re.sub(r'https://t\.co/\S+', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+@pytest.mark.parametrize("text", TEXTS + [None, 12, b"bytes"])
+def test_tweet_profile_matches_the_old_cleaner(text):
+    assert TextNormalizer("tweet").clean(text) == old_remove_tags_and_links(text)
+    assert ScrapingUtils().remove_tags_and_links(text) == old_remove_tags_and_links(text)
+
+
+@pytest.mark.parametrize("text", TEXTS + [None, 12, b"bytes"])
+def test_normalize_profile_matches_the_old_normalizer(text):
+    assert TextNormalizer("normalize").clean(text) == old_normalize_text(text)
+    assert ScrapingUtils().normalize_text(text) == old_normalize_text(text)
+
+
+def test_repeated_texts_are_cleaned_once():
+    normalizer = TextNormalizer("tweet", cache_size=2)
+    for _ in range(3):
+        assert normalizer.clean("spam @bot https://t.co/x") == "spam bot"
+    info = normalizer.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+    normalizer.clean("a")
+    normalizer.clean("b")
+    normalizer.clean("spam @bot https://t.co/x")
+    assert normalizer.cache_info().misses == 4
+    assert normalizer.cache_info().currsize == 2
+
+
+def test_non_strings_bypass_the_cache():
+    normalizer = TextNormalizer("tweet")
+    assert normalizer.clean(None) == ""
+    assert normalizer.clean(["@a"]) == ""
+    assert normalizer.cache_info().currsize == 0
+
+
+def test_without_cache():
+    normalizer = TextNormalizer("normalize", cache_size=0)
+    assert normalizer.cache_info() is None
+    assert normalizer.clean_many(["a\n b", None, "x https://t.co/y"]) == ["a b", "", "x"]
+
+
+def test_profiles():
+    assert get_normalizer("tweet") is get_normalizer("tweet")
+    assert get_normalizer("tweet") is not get_normalizer("normalize")
+    with pytest.raises(ValueError):
+        TextNormalizer("unknown")
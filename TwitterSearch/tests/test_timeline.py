@@ -0,0 +1,80 @@
+# tests/test_timeline.py
+
+from core.timeline import INSTRUCTION_ROOTS, TimelineLayout, TimelineResolver
+
+ENTRIES = [{"entryId": "tweet-1"}, {"entryId": "tweet-2"}]
+
+
+def timeline(instructions, root="result.timeline.instructions"):
+    document = instructions
+    for key in reversed(root.split(".")):
+        document = {key: document}
+    return document
+
+
+def add_entries(entries=ENTRIES):
+    return {"type": "TimelineAddEntries", "entries": entries}
+
+
+def test_entries_are_found_by_instruction_type():
+    resolver = TimelineResolver()
+    response = timeline([{"type": "TimelineClearCache"}, {"type": "TimelinePinEntry", "entries": ["pinned"]},
+                         add_entries()])
+    assert resolver.entries("search", response) == ENTRIES
+    assert resolver.layouts["search"] == TimelineLayout("result.timeline.instructions", 2)
+    assert resolver.expected_index("search") == 2
+    assert resolver.expected_index("comments") == 0
+
+
+def test_every_known_root():
+    for root in INSTRUCTION_ROOTS:
+        resolver = TimelineResolver()
+        assert resolver.entries("search", timeline([add_entries()], root)) == ENTRIES
+        assert resolver.layouts["search"].root == root
+
+
+def test_untyped_instruction_with_entries():
+    resolver = TimelineResolver()
+    response = timeline([{"other": 1}, {"entries": ENTRIES}], "result.instructions")
+    assert resolver.entries("comments", response) == ENTRIES
+    assert resolver.layouts["comments"] == TimelineLayout("result.instructions", 1)
+
+
+def test_cached_layout_skips_the_scan(monkeypatch):
+    resolver = TimelineResolver()
+    resolver.entries("search", timeline([add_entries()]))
+    monkeypatch.setattr(resolver, "_discover", lambda response: None)
+    assert resolver.entries("search", timeline([add_entries([{"entryId": "tweet-3"}])])) == [{"entryId": "tweet-3"}]
+
+
+def test_schema_drift_is_counted_and_relearned():
+    resolver = TimelineResolver()
+    resolver.entries("search", timeline([add_entries()]))
+    moved = timeline([{"type": "TimelineClearCache"}, add_entries()],
+                     "data.search_by_raw_query.search_timeline.timeline.instructions")
+
+    assert resolver.entries("search", moved) == ENTRIES
+    assert resolver.drift_events == {"search": 1}
+    assert resolver.layouts["search"] == TimelineLayout(
+        "data.search_by_raw_query.search_timeline.timeline.instructions", 1)
+
+    assert resolver.entries("search", moved) == ENTRIES
+    assert resolver.drift_events == {"search": 1}
+
+
+def test_endpoints_are_cached_separately():
+    resolver = TimelineResolver()
+    resolver.entries("search", timeline([add_entries()]))
+    resolver.entries("comments", timeline([{"type": "TimelineClearCache"}, add_entries()], "result.instructions"))
+    assert resolver.expected_index("search") == 0
+    assert resolver.expected_index("comments") == 1
+    assert resolver.drift_events == {}
+
+
+def test_responses_without_entries():
+    resolver = TimelineResolver()
+    assert resolver.entries("search", {}) == []
+    assert resolver.entries("search", None) == []
+    assert resolver.entries("search", timeline([{"type": "TimelineClearCache"}])) == []
+    assert resolver.entries("search", timeline([{"type": "TimelineAddEntries", "entries": "bad"}])) == []
+    assert resolver.layout("search", {"result": {"timeline": {"instructions": "bad"}}}) is None
@@ -0,0 +1,88 @@
+# tests/test_timestamps.py
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.scraping_utils import ScrapingUtils
+from utils.timestamps import OUTPUT_TIME_FORMAT, TWITTER_TIME_FORMAT, parse_twitter_timestamp
+
+
+def reference(value):
+    dt = datetime.strptime(value, TWITTER_TIME_FORMAT)
+    return int(dt.timestamp()), dt.strftime(OUTPUT_TIME_FORMAT)
+
+
+def sample_timestamps(count=500):
+    rng = random.Random(7)
+    start = datetime(1990, 1, 1, tzinfo=timezone.utc)
+    for _ in range(count):
+        minutes = rng.randrange(-23 * 60 - 59, 23 * 60 + 60)
+        zone = timezone(timedelta(minutes=minutes))
+        moment = (start + timedelta(seconds=rng.randrange(50 * 365 * 86400))).astimezone(zone)
+        yield moment.strftime(TWITTER_TIME_FORMAT)
+
+
+@pytest.mark.parametrize("value", [
+    "Tue Aug 06 02:54:02 +0000 2024",
+    "Thu Jan 01 00:00:00 +0000 1970",
+    "Wed Dec 31 23:59:59 -0000 1969",
+    "Thu Feb 29 12:00:00 +0530 2024",
+    "Mon Mar 10 23:59:59 -2359 2025",
+    "Sun Jan 01 00:00:00 +2359 1000",
+])
+def test_matches_strptime(value):
+    assert tuple(parse_twitter_timestamp(value)) == reference(value)
+
+
+def test_matches_strptime_across_offsets_and_years():
+    for value in sample_timestamps():
+        assert tuple(parse_twitter_timestamp(value)) == reference(value), value
+
+
+def test_formatted_keeps_the_timestamps_own_offset():
+    parsed = parse_twitter_timestamp("Tue Aug 06 02:54:02 -0500 2024")
+    assert parsed.formatted == "06-08-2024 02:54:02"
+    assert parsed.epoch == parse_twitter_timestamp("Tue Aug 06 07:54:02 +0000 2024").epoch
+
+
+@pytest.mark.parametrize("value", [
+    "Fri Feb 30 00:00:00 +0000 2024",  # no such day
+    "Tue Feb 29 00:00:00 +0000 2023",  # not a leap year
+    "Tue Aug 06 24:00:00 +0000 2024",
+    "Tue Aug 06 02:60:02 +0000 2024",
+    "Tue Aug 06 02:54:02 +2400 2024",
+    "Tue Foo 06 02:54:02 +0000 2024",
+    "Tue Aug 0x 02:54:02 +0000 2024",
+    "Tue Aug 06 02:54:02 0000 2024",
+    "Tue Aug 06 02:54:02 +0000 2024 ",
+    "2024-08-06T02:54:02Z",
+    "",
+])
+def test_invalid_timestamps_raise_like_strptime(value):
+    with pytest.raises(ValueError):
+        datetime.strptime(value, TWITTER_TIME_FORMAT)
+    with pytest.raises(ValueError):
+        parse_twitter_timestamp(value)
+
+
+def test_other_spellings_fall_back_to_strptime():
+    # strptime accepts an unpadded day and a colon in the offset; the sliced layout does not
+    for value in ("Tue Aug 6 02:54:02 +0000 2024", "Tue Aug 06 02:54:02 +05:30 2024"):
+        assert tuple(parse_twitter_timestamp(value)) == reference(value)
+
+
+def test_results_are_cached():
+    parse_twitter_timestamp.cache_clear()
+    for _ in range(3):
+        parse_twitter_timestamp("Tue Aug 06 02:54:02 +0000 2024")
+    assert parse_twitter_timestamp.cache_info().hits == 2
+
+
+def test_scraping_utils_helpers():
+    utils = ScrapingUtils()
+    assert utils.convert_timestamp("Tue Aug 06 02:54:02 +0000 2024") == "06-08-2024 02:54:02"
+    assert utils.timestamp_to_epoch("Tue Aug 06 02:54:02 +0000 2024") == 1722912842
+    assert utils.convert_timestamp("not a date") is None
+    assert utils.timestamp_to_epoch("not a date") is None
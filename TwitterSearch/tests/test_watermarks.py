@@ -0,0 +1,153 @@
+# tests/test_watermarks.py
+
+import asyncio
+import json
+
+import pytest
+
+from config.settings import MAX_RETRIES
+from core.pipeline import CrawlPipeline
+from core.records import Tweet
+from core.watermarks import QueryWatermarks
+from fake_api import FakeTwitterAPI, make_crawler
+
+CREATED_AT = 1722912842  # 2024-08-06 02:54:02 UTC
+
+
+def tweets(*ids):
+    return [Tweet(str(tweet_id), "", None, 0, 0, None, "TWITTER", None, None, None, 0, None, [],
+                  CREATED_AT + tweet_id, None, False, False) for tweet_id in ids]
+
+
+def test_pending_mark_only_counts_after_commit(tmp_path):
+    path = str(tmp_path / "watermarks.json")
+    watermarks = QueryWatermarks(path)
+    assert watermarks.mark("q") is None
+
+    watermarks.observe("q", tweets(95, 100, 98))
+    watermarks.observe("q", tweets(99))
+    assert watermarks.mark("q") is None
+    assert watermarks.pending["q"]["tweet_id"] == "100"
+
+    watermarks.save()
+    reloaded = QueryWatermarks(path)
+    assert reloaded.mark("q") is None
+    assert reloaded.pending["q"]["tweet_id"] == "100"
+
+    reloaded.commit("q")
+    assert reloaded.mark("q") == 100
+    assert "q" not in reloaded.pending
+    assert QueryWatermarks(path).mark("q") == 100
+
+
+def test_commit_never_lowers_the_mark(tmp_path):
+    watermarks = QueryWatermarks(str(tmp_path / "watermarks.json"))
+    watermarks.observe("q", tweets(100))
+    watermarks.commit("q")
+    watermarks.observe("q", tweets(50))
+    watermarks.commit("q")
+    assert watermarks.mark("q") == 100
+
+    watermarks.commit("never observed")
+    assert watermarks.mark("never observed") is None
+
+
+def test_unseen():
+    assert [t.id for t in QueryWatermarks.unseen(None, tweets(1, 2))] == ["1", "2"]
+    assert [t.id for t in QueryWatermarks.unseen(100, tweets(101, 100, 99, 1000))] == ["101", "1000"]
+
+
+def test_search_query_operators():
+    watermarks = QueryWatermarks(None)
+    assert watermarks.search_query("q", "since_id") == "q"
+    watermarks.observe("q", tweets(100))
+    watermarks.commit("q")
+
+    assert watermarks.search_query("q") == "q"
+    assert watermarks.search_query("q", "since_id") == "q since_id:100"
+    assert watermarks.search_query("q", "since") == "q since:2024-08-06"
+    with pytest.raises(ValueError):
+        watermarks.search_query("q", "until")
+
+
+def test_in_memory_watermarks_write_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    watermarks = QueryWatermarks(None)
+    watermarks.observe("q", tweets(1))
+    watermarks.commit("q")
+    watermarks.save()
+    assert watermarks.mark("q") == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_second_crawl_stops_at_the_first_page_seen_before(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def run(top, **options):
+        async with FakeTwitterAPI(pages=4, top=top) as api:
+            async with make_crawler(api, str(tmp_path)) as crawler:
+                await crawler.crawl("q", **options)
+            return api
+
+    first = asyncio.run(run(1100))
+    assert first.requests["search"] == 4
+    assert QueryWatermarks(str(tmp_path / "watermarks.json")).mark("q") == 1100
+
+    # Two newer tweets: page 0 holds them and three seen ones, page 1 only seen ones
+    second = asyncio.run(run(1102))
+    assert second.requests["search"] == 2
+    assert QueryWatermarks(str(tmp_path / "watermarks.json")).mark("q") == 1102
+    with open(tmp_path / "LatentSearch.json", 'r', encoding='utf-8') as f:
+        stored = [record["tweet_id"] for record in json.load(f)]
+    assert stored == [str(i) for i in range(1100, 1080, -1)] + ["1102", "1101"]
+
+    third = asyncio.run(run(1102, incremental=False))
+    assert third.requests["search"] == 4
+
+
+def test_since_id_operator_is_sent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    watermarks = QueryWatermarks(str(tmp_path / "watermarks.json"))
+    watermarks.observe("q", tweets(1000))
+    watermarks.commit("q")
+
+    async def run():
+        async with FakeTwitterAPI(pages=1) as api:
+            async with make_crawler(api, str(tmp_path), watermarks=watermarks) as crawler:
+                await crawler.crawl("q", since_operator="since_id")
+            return api.search_queries
+
+    assert asyncio.run(run()) == ["q since_id:1000"]
+
+
+def crawl_with(tmp_path, use_pipeline, failing_search=None, max_batches=30):
+    async def run():
+        async with FakeTwitterAPI(pages=4, per_page=2, comment_pages=1) as api:
+            api.failing_search = failing_search or {}
+            async with make_crawler(api, str(tmp_path)) as crawler:
+                if use_pipeline:
+                    await CrawlPipeline(crawler, max_batches=max_batches, stats_interval=60).run(["q"])
+                else:
+                    await crawler.crawl("q", max_batches=max_batches)
+            return api.requests["search"]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("use_pipeline", [False, True])
+def test_failed_page_mid_chain_commits_no_watermark(tmp_path, monkeypatch, use_pipeline):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "watermarks.json")
+
+    crawl_with(tmp_path, use_pipeline, failing_search={"2": MAX_RETRIES + 1})
+    assert QueryWatermarks(path).mark("q") is None  # pages 2 and 3 were never read
+
+    crawl_with(tmp_path, use_pipeline)  # resumes at page 2 and reaches the end
+    assert QueryWatermarks(path).mark("q") == 1100
+
+
+@pytest.mark.parametrize("use_pipeline", [False, True])
+def test_stopping_at_max_batches_commits_no_watermark(tmp_path, monkeypatch, use_pipeline):
+    monkeypatch.chdir(tmp_path)
+    assert crawl_with(tmp_path, use_pipeline, max_batches=2) == 2
+    assert QueryWatermarks(str(tmp_path / "watermarks.json")).mark("q") is None
@@ -0,0 +1,165 @@
+# utils/adaptive_controller.py
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from config.settings import (
+    RATE_LIMIT_PER_SECOND, ADAPTIVE_MIN_RATE, ADAPTIVE_MAX_RATE,
+    ADAPTIVE_INITIAL_CONCURRENCY, ADAPTIVE_MIN_CONCURRENCY, ADAPTIVE_MAX_CONCURRENCY,
+    ADAPTIVE_DECREASE_FACTOR, ADAPTIVE_LATENCY_TOLERANCE, BACKOFF_TIME
+)
+from utils.rate_limiter import RateLimiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveController:
+    """
+    AIMD (additive increase, multiplicative decrease) control of request
+    concurrency and rate.
+
+    Every ``limit`` healthy responses the concurrency limit grows by one and
+    the rate by ``increase_step``. A 429, a 5xx or a latency above
+    ``latency_tolerance`` times the observed baseline cuts both by
+    ``decrease_factor``, at most once per ``decrease_interval`` seconds so
+    one burst of failures only counts once. ``Retry-After`` pauses all new
+    requests until it expires.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter,
+                 initial_rate: float = RATE_LIMIT_PER_SECOND,
+                 min_rate: float = ADAPTIVE_MIN_RATE, max_rate: float = ADAPTIVE_MAX_RATE,
+                 initial_limit: int = ADAPTIVE_INITIAL_CONCURRENCY,
+                 min_limit: int = ADAPTIVE_MIN_CONCURRENCY, max_limit: int = ADAPTIVE_MAX_CONCURRENCY,
+                 increase_step: float = 1.0, decrease_factor: float = ADAPTIVE_DECREASE_FACTOR,
+                 latency_tolerance: float = ADAPTIVE_LATENCY_TOLERANCE, min_latency_increase: float = 0.25,
+                 decrease_interval: float = 1.0):
+        self.rate_limiter = rate_limiter
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_latency_increase = min_latency_increase
+        self.decrease_interval = decrease_interval
+
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.limit = min(max(initial_limit, min_limit), max_limit)
+        self.rate_limiter.set_rate(self.rate)
+
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._healthy_streak = 0
+        # Latency is tracked per endpoint: a 1000-tweet search page is always slower than a comment page
+        self._latency_avg: Dict[str, float] = {}
+        self._latency_baseline: Dict[str, float] = {}
+
+        self.increases = 0
+        self.decreases = 0
+        self.throttled = 0
+
+    async def acquire(self) -> None:
+        """Wait for a concurrency slot and for any Retry-After pause to pass"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    async def release(self) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _observe_latency(self, endpoint: str, latency: float) -> bool:
+        """Update latency averages; True if latency has risen past tolerance"""
+        average = self._latency_avg.get(endpoint)
+        average = latency if average is None else 0.8 * average + 0.2 * latency
+        self._latency_avg[endpoint] = average
+        baseline = self._latency_baseline.get(endpoint)
+        if baseline is None or average < baseline:
+            baseline = average
+        else:
+            # Let the baseline drift up slowly so a permanent shift is accepted eventually
+            baseline += 0.01 * (average - baseline)
+        self._latency_baseline[endpoint] = baseline
+        # Ignore jitter on very fast responses
+        return average > max(baseline * self.latency_tolerance, baseline + self.min_latency_increase)
+
+    def _increase(self) -> None:
+        self.limit = min(self.max_limit, self.limit + 1)
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+        self.rate_limiter.set_rate(self.rate)
+        self.increases += 1
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.rate_limiter.set_rate(self.rate)
+        self.decreases += 1
+
+    def record(self, status: Optional[int], latency: float, retry_after: Optional[str] = None,
+               attempt: int = 0, endpoint: str = "default", pause: bool = True) -> float:
+        """
+        Feed back one response (``status`` None for a transport error).
+        Returns how long the caller should wait before retrying, 0 if the
+        response was healthy. With ``pause=False`` a throttled response still
+        cuts the rate and concurrency but does not hold back other requests
+        (the caller retries on another API key).
+        """
+        slow = self._observe_latency(endpoint, latency)
+        if status is not None and status != 429 and status < 500:
+            if slow:
+                self._healthy_streak = 0
+                self._decrease()
+            else:
+                self._healthy_streak += 1
+                if self._healthy_streak >= self.limit:
+                    self._healthy_streak = 0
+                    self._increase()
+            return 0.0
+
+        self.throttled += 1
+        self._healthy_streak = 0
+        self._decrease()
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = BACKOFF_TIME * (2 ** attempt)
+        if pause:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "rate": round(self.rate, 2),
+            "in_flight": self._in_flight,
+            "latency_avg": {endpoint: round(value, 3) for endpoint, value in self._latency_avg.items()},
+            "latency_baseline": {endpoint: round(value, 3) for endpoint, value in self._latency_baseline.items()},
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "throttled": self.throttled
+        }
@@ -0,0 +1,27 @@
+# utils/decorators.py
+
+import asyncio
+import random
+from functools import wraps
+from typing import TypeVar, Callable, Any
+
+T = TypeVar('T')
+
+def retry_with_backoff(retries: int = 3, backoff_in_seconds: int = 1):
+    """Retry decorator with exponential backoff"""
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            retry_count = 0
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    if retry_count == retries:
+                        raise e
+                    wait_time = (backoff_in_seconds * (2 ** retry_count)) + random.uniform(0, 1)
+                    print(f"Attempt {retry_count + 1} failed. Retrying in {wait_time:.2f} seconds...")
+                    await asyncio.sleep(wait_time)
+                    retry_count += 1
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,145 @@
+# utils/json_path.py
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+from jsonpath import jsonpath, normalize
+
+# Segments the compiler understands; anything else (filters, slices, unions,
+# quoted keys) is left to the jsonpath package
+_SEGMENT_RE = re.compile(r"^(?:\*|\.\.|[A-Za-z0-9_\-]+)$")
+_MISSING = object()
+
+
+def _lookup(obj: Any, steps: Tuple[Tuple[str, Optional[int]], ...]) -> Any:
+    """Follow plain key/index steps with direct indexing"""
+    for key, index in steps:
+        if isinstance(obj, dict):
+            if key not in obj:
+                return _MISSING
+            obj = obj[key]
+        elif isinstance(obj, list) and index is not None and index < len(obj):
+            obj = obj[index]
+        else:
+            return _MISSING
+    return obj
+
+
+def _children(obj: Any):
+    if isinstance(obj, dict):
+        return obj.values()
+    if isinstance(obj, list):
+        return obj
+    return ()
+
+
+def _chain(segments: List[str]) -> Callable[[Any], Iterator[Any]]:
+    """Build a generator function yielding the matches of ``segments`` under a node"""
+    if not segments:
+        return lambda obj: iter((obj,))
+
+    head = segments[0]
+    if head == "*":
+        rest = _chain(segments[1:])
+
+        def wildcard(obj: Any) -> Iterator[Any]:
+            for child in _children(obj):
+                yield from rest(child)
+        return wildcard
+
+    if head == "..":
+        rest = _chain(segments[1:])
+
+        def descend(obj: Any) -> Iterator[Any]:
+            # Same pre-order as jsonpath: the node itself, then each child in turn
+            yield from rest(obj)
+            for child in _children(obj):
+                yield from descend(child)
+        return descend
+
+    run = 0
+    while run < len(segments) and segments[run] not in ("*", ".."):
+        run += 1
+    steps = tuple((key, int(key) if key.isdigit() else None) for key in segments[:run])
+    rest = _chain(segments[run:])
+
+    def lookup(obj: Any) -> Iterator[Any]:
+        value = _lookup(obj, steps)
+        if value is not _MISSING:
+            yield from rest(value)
+    return lookup
+
+
+class CompiledPath:
+    """
+    A JSONPath expression parsed once into Python accessors.
+
+    Paths made only of keys and indexes are resolved with plain dict/list
+    indexing; ``*`` and ``..`` become generators that visit nodes in the same
+    order as the jsonpath package, so results are identical. Dictionary keys
+    are taken literally.
+    """
+
+    __slots__ = ("path", "_steps", "_matches")
+
+    def __init__(self, path: str, segments: List[str]):
+        self.path = path
+        if all(segment not in ("*", "..") for segment in segments):
+            self._steps = tuple((key, int(key) if key.isdigit() else None) for key in segments)
+        else:
+            self._steps = None
+        self._matches = _chain(segments)
+
+    def find_all(self, obj: Any) -> Union[List[Any], bool]:
+        """Every match, or False when there is none (like ``jsonpath``)"""
+        if not obj:
+            return False
+        if self._steps is not None:
+            value = _lookup(obj, self._steps)
+            return False if value is _MISSING else [value]
+        return list(self._matches(obj)) or False
+
+    def find_first(self, obj: Any) -> Union[List[Any], bool]:
+        """The first match as a one-item list, or False; stops at the first match"""
+        if not obj:
+            return False
+        if self._steps is not None:
+            value = _lookup(obj, self._steps)
+            return False if value is _MISSING else [value]
+        for value in self._matches(obj):
+            return [value]
+        return False
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> Optional[CompiledPath]:
+    """Parse ``path`` once; None if it uses syntax the compiler does not handle"""
+    cleaned = normalize(path)
+    if cleaned.startswith("$;"):
+        cleaned = cleaned[2:]
+    segments = cleaned.split(";")
+    if not all(_SEGMENT_RE.match(segment) for segment in segments):
+        return None
+    return CompiledPath(path, segments)
+
+
+def find_all(obj: Any, path: str) -> Union[List[Any], bool]:
+    """Drop-in replacement for ``jsonpath(obj, path)``"""
+    if not path:
+        return False
+    compiled = compile_path(path)
+    if compiled is None:
+        return jsonpath(obj, path)
+    return compiled.find_all(obj)
+
+
+def find_first(obj: Any, path: str) -> Union[List[Any], bool]:
+    """``jsonpath(obj, path)[:1]``, or False, without collecting the other matches"""
+    if not path:
+        return False
+    compiled = compile_path(path)
+    if compiled is None:
+        result = jsonpath(obj, path)
+        return result[:1] if result else False
+    return compiled.find_first(obj)
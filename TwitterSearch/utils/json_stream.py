@@ -0,0 +1,153 @@
+# utils/json_stream.py
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# One token outside the entry arrays: a complete string, a structural character
+# or a literal (number, true, false, null), with the whitespace in front of it
+_TOKEN_RE = re.compile(r'\s*(?:("[^"\\]*(?:\\.[^"\\]*)*")|([{}\[\]:,])|([^\s{}\[\]:,"]+))', re.S)
+_SPACE_RE = re.compile(r'\s*')
+_decoder = json.JSONDecoder()
+
+# Frame kinds on the container stack
+_OBJECT = 0
+_ARRAY = 1
+_ENTRIES = 2
+
+
+class EntryStreamParser:
+    """
+    Incremental parser for timeline responses that yields the elements of every
+    ``instructions[i].entries`` array as soon as each one is complete.
+
+    Feed it the body in chunks; each ``feed`` returns ``(i, entry)`` pairs for
+    the entries that finished in that chunk. Entries are decoded one at a time
+    and never kept, so memory is bounded by the largest entry plus one chunk.
+    ``close`` returns the rest of the document (cursors, metadata) with every
+    entries array left empty.
+    """
+
+    def __init__(self):
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        # [kind, name in parent, current key (objects) or index (arrays), expecting a key]
+        self._stack: List[List[Any]] = []
+        self._skeleton: List[str] = []
+        self._done = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Tuple[int, Dict]]:
+        self._buf = self._buf[self._pos:] + self._utf8.decode(chunk, final)
+        self._pos = 0
+        entries: List[Tuple[int, Dict]] = []
+        while self._step(entries, final):
+            pass
+        return entries
+
+    def close(self) -> Optional[Dict]:
+        """Finish the stream and return the document without its entries (None if it is not an object)"""
+        entries = self.feed(b"", final=True)
+        if entries or self._stack or not self._done:
+            raise ValueError("Incomplete JSON document")
+        if self._buf[self._pos:].strip():
+            raise ValueError("Extra data after JSON document")
+        skeleton = json.loads("".join(self._skeleton))
+        return skeleton if isinstance(skeleton, dict) else None
+
+    def _step(self, entries: List[Tuple[int, Dict]], final: bool) -> bool:
+        """Consume one token or one entry; False when more input is needed"""
+        if self._stack and self._stack[-1][0] == _ENTRIES:
+            return self._entry(entries, final)
+        if self._done:
+            return False
+
+        match = _TOKEN_RE.match(self._buf, self._pos)
+        if match is None or (not final and match.end() == len(self._buf) and match.group(3)):
+            # Incomplete string or a literal that may continue in the next chunk
+            if final and self._buf[self._pos:].strip():
+                raise ValueError(f"Invalid JSON at offset {self._pos}")
+            return False
+        self._pos = match.end()
+        token = match.group(0).lstrip()
+        self._skeleton.append(token)
+        top = self._stack[-1] if self._stack else None
+
+        if match.group(1) is not None:
+            if top is not None and top[0] == _OBJECT and top[3]:
+                top[2] = json.loads(token)
+                top[3] = False
+            else:
+                self._value_done()
+        elif match.group(3) is not None:
+            self._value_done()
+        elif token == "{":
+            self._stack.append([_OBJECT, self._child_name(), None, True])
+        elif token == "[":
+            name = self._child_name()
+            kind = _ENTRIES if self._is_entries(name) else _ARRAY
+            self._stack.append([kind, name, 0, False])
+        elif token in "}]":
+            if not self._stack:
+                raise ValueError(f"Unexpected {token!r} at offset {self._pos}")
+            self._stack.pop()
+            self._value_done()
+        elif token == ",":
+            if top is not None and top[0] == _OBJECT:
+                top[3] = True
+            elif top is not None:
+                top[2] += 1
+        return True
+
+    def _entry(self, entries: List[Tuple[int, Dict]], final: bool) -> bool:
+        """Inside an entries array: decode the next element, or close the array"""
+        pos = _SPACE_RE.match(self._buf, self._pos).end()
+        if pos == len(self._buf):
+            self._pos = pos
+            return False
+        char = self._buf[pos]
+        if char == "]":
+            self._pos = pos + 1
+            self._skeleton.append("]")
+            self._stack.pop()
+            self._value_done()
+            return True
+        if char == ",":
+            self._pos = pos + 1
+            return True
+        try:
+            entry, end = _decoder.raw_decode(self._buf, pos)
+        except ValueError:
+            # Most likely cut off by the end of the chunk
+            if final:
+                raise
+            self._pos = pos
+            return False
+        if not final and not isinstance(entry, (dict, list)):
+            # A number cut off by the chunk ("12" of "125", "-2" of "-2.5") decodes too;
+            # only trust it once the separator after it has arrived
+            after = _SPACE_RE.match(self._buf, end).end()
+            if self._buf[after:after + 1] not in (",", "]"):
+                self._pos = pos
+                return False
+        self._pos = end
+        entries.append((self._stack[-2][1], entry))
+        return True
+
+    def _child_name(self) -> Any:
+        """Key or index under which the value starting now sits in its parent"""
+        if not self._stack:
+            return None
+        return self._stack[-1][2]
+
+    def _is_entries(self, name: Any) -> bool:
+        # instructions[i].entries: this array is "entries" of an object that is
+        # element i of an array named "instructions"
+        stack = self._stack
+        return (name == "entries" and len(stack) >= 2 and stack[-1][0] == _OBJECT
+                and stack[-2][0] == _ARRAY and stack[-2][1] == "instructions")
+
+    def _value_done(self) -> None:
+        if not self._stack:
+            self._done = True
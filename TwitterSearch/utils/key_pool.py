@@ -0,0 +1,211 @@
+# utils/key_pool.py
+
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config.settings import (
+    RAPID_API_KEYS, KEY_RATE_PER_SECOND, KEY_BURST, KEY_DAILY_QUOTA,
+    KEY_QUARANTINE_SECONDS, KEY_STATE_FILE
+)
+from utils.adaptive_controller import parse_retry_after
+from utils.rate_limiter import TokenBucket
+from utils.state_file import load_json_state, save_json_state
+
+# Statuses that mean "this key is rate limited or not allowed", not "the request failed"
+KEY_REJECT_STATUSES = (403, 429)
+
+
+class KeyPoolExhausted(Exception):
+    """Every key in the pool has used up its daily quota"""
+
+
+class ApiKey:
+    """One RapidAPI key with its own token bucket and daily counter"""
+
+    def __init__(self, key: str, rate: float, burst: int, daily_quota: Optional[int]):
+        self.key = key
+        # Keys are never written to disk; state is stored under a fingerprint
+        self.fingerprint = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+        self.bucket = TokenBucket(rate, burst)
+        self.daily_quota = daily_quota
+        self.day = self._today()
+        self.used_today = 0
+        self.pending = 0  # requests waiting on the bucket, not yet counted in used_today
+        self.quarantined_until = 0.0
+        self.failures = 0
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def roll_day(self) -> None:
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.used_today = 0
+
+    def has_quota(self) -> bool:
+        self.roll_day()
+        return self.daily_quota is None or self.used_today + self.pending < self.daily_quota
+
+    def is_quarantined(self, now: float) -> bool:
+        return now < self.quarantined_until
+
+    def to_state(self) -> Dict:
+        return {
+            "day": self.day,
+            "used_today": self.used_today,
+            "quarantined_until": self.quarantined_until,
+            "failures": self.failures
+        }
+
+    def load_state(self, state: Dict) -> None:
+        self.day = state.get("day", self.day)
+        self.used_today = state.get("used_today", 0)
+        self.quarantined_until = state.get("quarantined_until", 0.0)
+        self.failures = state.get("failures", 0)
+        self.roll_day()
+
+
+class KeyPool:
+    """
+    Spreads requests over several RapidAPI keys.
+
+    Each key has its own token bucket and daily quota. ``acquire`` picks the
+    usable key with the most tokens available, so total throughput grows with
+    the number of keys. A key answered with 429/403 is quarantined for the
+    response's Retry-After (``quarantine_seconds`` with exponential backoff
+    without one), but only while another key can take over: a pool is never
+    quarantined down to no usable key. Counters and quarantines persist in
+    ``state_file`` between runs; periodic saves run off the event loop.
+    """
+
+    def __init__(self, keys: List[str], rate_per_key: float = KEY_RATE_PER_SECOND, burst: int = KEY_BURST,
+                 daily_quota: Optional[int] = KEY_DAILY_QUOTA, quarantine_seconds: float = KEY_QUARANTINE_SECONDS,
+                 state_file: Optional[str] = KEY_STATE_FILE, save_every: int = 20):
+        if not keys:
+            raise ValueError("KeyPool needs at least one key")
+        self.keys = [ApiKey(key, rate_per_key, burst, daily_quota) for key in dict.fromkeys(keys)]
+        self.quarantine_seconds = quarantine_seconds
+        self.state_file = state_file
+        self.save_every = save_every
+        self._since_save = 0
+        self._save_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._load()
+
+    @classmethod
+    def from_settings(cls) -> Optional["KeyPool"]:
+        """Pool of the keys configured in RAPID_API_KEYS, or None if there are none"""
+        return cls(RAPID_API_KEYS) if RAPID_API_KEYS else None
+
+    def _load(self) -> None:
+        if not self.state_file:
+            return
+        state = load_json_state(self.state_file, default={})
+        for api_key in self.keys:
+            if api_key.fingerprint in state:
+                api_key.load_state(state[api_key.fingerprint])
+        if not self._usable(time.time()):
+            # Quarantines saved by an older run must not stall the pool on startup
+            for api_key in self.keys:
+                api_key.quarantined_until = 0.0
+
+    def _snapshot(self) -> Dict[str, Dict]:
+        self._since_save = 0
+        return {api_key.fingerprint: api_key.to_state() for api_key in self.keys}
+
+    def _write(self, snapshot: Dict[str, Dict]) -> None:
+        state = load_json_state(self.state_file, default={})
+        state.update(snapshot)
+        save_json_state(self.state_file, state)
+
+    def save(self) -> None:
+        """Persist per-key counters and quarantines (blocking; use at shutdown)"""
+        snapshot = self._snapshot()
+        if self.state_file:
+            self._write(snapshot)
+
+    def _save_in_background(self) -> None:
+        """Persist the current counters in a worker thread unless a save is still running"""
+        if not self.state_file or (self._save_task is not None and not self._save_task.done()):
+            return
+        self._save_task = asyncio.ensure_future(asyncio.to_thread(self._write, self._snapshot()))
+
+    async def close(self) -> None:
+        """Wait for a background save and persist the final state"""
+        if self._save_task is not None:
+            await asyncio.gather(self._save_task, return_exceptions=True)
+        if self.state_file:
+            await asyncio.to_thread(self._write, self._snapshot())
+
+    def _usable(self, now: float) -> List[ApiKey]:
+        return [api_key for api_key in self.keys if api_key.has_quota() and not api_key.is_quarantined(now)]
+
+    async def acquire(self) -> ApiKey:
+        """Wait for a usable key and take one request from its bucket and quota"""
+        while True:
+            async with self._lock:
+                now = time.time()
+                with_quota = [api_key for api_key in self.keys if api_key.has_quota()]
+                if not with_quota:
+                    self._save_in_background()
+                    raise KeyPoolExhausted("All API keys have used their daily quota")
+                usable = [api_key for api_key in with_quota if not api_key.is_quarantined(now)]
+                if usable:
+                    api_key = max(usable, key=lambda k: (k.bucket.available_tokens(), -k.used_today))
+                    # Held against the quota while waiting so concurrent callers cannot overdraw it
+                    api_key.pending += 1
+                    break
+                wait_time = min(api_key.quarantined_until for api_key in with_quota) - now
+            print(f"All API keys quarantined, waiting {wait_time:.1f}s")
+            await asyncio.sleep(wait_time)
+
+        try:
+            await api_key.bucket.acquire()
+        finally:
+            api_key.pending -= 1
+        # Only a granted token uses quota; a cancelled wait does not
+        api_key.used_today += 1
+        self._since_save += 1
+        if self._since_save >= self.save_every:
+            self._save_in_background()
+        return api_key
+
+    def report(self, api_key: ApiKey, status: Optional[int], retry_after: Optional[str] = None) -> bool:
+        """
+        Feed back the response status for a request made with ``api_key``
+        Returns True if the key was quarantined and another key can take the retry
+        """
+        if status in KEY_REJECT_STATUSES:
+            now = time.time()
+            if api_key.is_quarantined(now):
+                # Other requests already in flight on this key; it is quarantined once
+                return True
+            if not any(other is not api_key for other in self._usable(now)):
+                # No key to fall back on: leave the backoff to the caller's throttling
+                return False
+            backoff = parse_retry_after(retry_after)
+            if backoff is None:
+                backoff = self.quarantine_seconds * (2 ** min(api_key.failures, 5))
+            api_key.failures += 1
+            api_key.quarantined_until = now + backoff
+            print(f"API key {api_key.fingerprint} got HTTP {status}, quarantined for {backoff:.0f}s")
+            self._save_in_background()
+            return True
+        if status is not None and status < 400:
+            api_key.failures = 0
+        return False
+
+    def stats(self) -> List[Dict]:
+        now = time.time()
+        return [{
+            "key": api_key.fingerprint,
+            "used_today": api_key.used_today,
+            "daily_quota": api_key.daily_quota,
+            "quarantined": api_key.is_quarantined(now),
+            "failures": api_key.failures
+        } for api_key in self.keys]
@@ -0,0 +1,127 @@
+# utils/keyword_matcher.py
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a keyword list, so a text is scanned once no
+    matter how many keywords there are.
+
+    Matching is case-insensitive in the same way as ``keyword.lower() in
+    text.lower()``, including that an empty keyword matches every text. With
+    ``word_boundary`` a match only counts when it is not preceded or followed
+    by a word character (letter, digit or underscore).
+    """
+
+    def __init__(self, keywords: Iterable[str], word_boundary: bool = False):
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self.word_boundary = word_boundary
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # state -> ((keyword index, pattern length), ...) ending at that state, fail chain included
+        self._out: List[Tuple[Tuple[int, int], ...]] = [()]
+        self._empty: Tuple[int, ...] = ()
+
+        empty = []
+        for index, keyword in enumerate(self.keywords):
+            pattern = keyword.lower()
+            if not pattern:
+                empty.append(index)
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += ((index, len(pattern)),)
+        self._empty = tuple(empty)
+        self._link()
+
+    def _link(self) -> None:
+        """Breadth-first pass setting the failure links and merging outputs along them"""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                link = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                target = goto[link].get(char, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] += out[fail[nxt]]
+
+    def _scan(self, text: str):
+        """Yield (keyword index, start, end) for every match in ``text.lower()``"""
+        lowered = text.lower()
+        for index in self._empty:
+            yield index, 0, 0
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                end = position + 1
+                for index, length in out[state]:
+                    start = end - length
+                    if self.word_boundary and (
+                            (start > 0 and _is_word_char(lowered[start - 1]))
+                            or (end < len(lowered) and _is_word_char(lowered[end]))):
+                        continue
+                    yield index, start, end
+
+    def contains(self, text: str) -> bool:
+        """True if any keyword occurs in ``text``; stops at the first match"""
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def matches(self, text: str) -> List[str]:
+        """Keywords found in ``text``, each once, in the order they first occur"""
+        found: Dict[int, None] = {}
+        for index, _, _ in self._scan(text):
+            found.setdefault(index)
+        keywords = self.keywords
+        return [keywords[index] for index in found]
+
+
+_MATCHER_CACHE_SIZE = 32
+# id(keyword list) -> (the list itself, its length then, matcher), most recently used last
+_matchers: "OrderedDict[Tuple[int, bool], Tuple[Sequence[str], int, KeywordMatcher]]" = OrderedDict()
+
+
+def get_keyword_matcher(keywords: Sequence[str], word_boundary: bool = False) -> KeywordMatcher:
+    """
+    Shared matcher for a keyword list, so the automaton is only built once per list.
+
+    The cache is keyed by the identity of the list, not its contents, so a
+    lookup costs the same however many keywords there are. A list that grows
+    or shrinks gets a new matcher; one edited in place at the same length
+    does not, so callers that rewrite their keywords should build a
+    KeywordMatcher themselves.
+    """
+    key = (id(keywords), word_boundary)
+    cached = _matchers.get(key)
+    if cached is not None and cached[0] is keywords and cached[1] == len(keywords):
+        _matchers.move_to_end(key)
+        return cached[2]
+    matcher = KeywordMatcher(keywords, word_boundary)
+    # Holding the list keeps its id from being reused by another list while cached
+    _matchers[key] = (keywords, len(keywords), matcher)
+    _matchers.move_to_end(key)
+    while len(_matchers) > _MATCHER_CACHE_SIZE:
+        _matchers.popitem(last=False)
+    return matcher
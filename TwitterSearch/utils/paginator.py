@@ -0,0 +1,74 @@
+# utils/paginator.py
+
+from typing import Iterable, Optional, Set
+
+from config.settings import PAGINATION_MAX_EMPTY_PAGES, PAGINATION_MAX_STALE_PAGES
+
+# Reasons a cursor chain ends by itself; callers add their own through stop()
+END_OF_RESULTS = "end_of_results"
+REPEATED_CURSOR = "repeated_cursor"
+EMPTY_PAGES = "empty_pages"
+NO_NEW_IDS = "no_new_ids"
+MAX_PAGES = "max_pages"
+
+
+class Paginator:
+    """
+    Decides when a cursor-paginated listing is done instead of trusting the
+    bottom cursor blindly.
+
+    ``advance`` takes each fetched page's bottom cursor and the IDs of its
+    items (None for an item without one) and returns the cursor to request
+    next, or None to stop. The chain stops when there is no next cursor,
+    when the provider hands back a cursor already requested, after
+    ``max_empty_pages`` pages in a row without items (only the top/bottom
+    cursor entries), after ``max_stale_pages`` pages in a row whose IDs were
+    all seen earlier in the chain, or after ``max_pages`` pages (None for
+    no limit). Callers record their own reasons (no response, errors) with
+    ``stop``; the first reason is kept in ``stop_reason``.
+    """
+
+    def __init__(self, max_pages: Optional[int], first_cursor: Optional[str] = None, pages_done: int = 0,
+                 max_empty_pages: int = PAGINATION_MAX_EMPTY_PAGES,
+                 max_stale_pages: int = PAGINATION_MAX_STALE_PAGES):
+        self.max_pages = max_pages
+        self.pages = pages_done
+        self.max_empty_pages = max(1, max_empty_pages)
+        self.max_stale_pages = max(1, max_stale_pages)
+        self.cursors: Set[str] = {first_cursor} if first_cursor else set()
+        self.ids: Set[str] = set()
+        self.empty_run = 0
+        self.stale_run = 0
+        self.stop_reason: Optional[str] = None
+
+    def advance(self, cursor: Optional[str], ids: Iterable[Optional[str]]) -> Optional[str]:
+        """Record one fetched page; the cursor of the next page, None to stop (see ``stop_reason``)"""
+        if self.stop_reason:
+            return None
+        self.pages += 1
+        ids = list(ids)
+        if not ids:
+            self.empty_run += 1
+            if self.empty_run >= self.max_empty_pages:
+                return self.stop(EMPTY_PAGES)
+        else:
+            self.empty_run = 0
+            new_ids = [item for item in ids if item is None or item not in self.ids]
+            self.ids.update(item for item in new_ids if item is not None)
+            self.stale_run = 0 if new_ids else self.stale_run + 1
+            if self.stale_run >= self.max_stale_pages:
+                return self.stop(NO_NEW_IDS)
+        if not cursor:
+            return self.stop(END_OF_RESULTS)
+        if cursor in self.cursors:
+            return self.stop(REPEATED_CURSOR)
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return self.stop(MAX_PAGES)
+        self.cursors.add(cursor)
+        return cursor
+
+    def stop(self, reason: str) -> None:
+        """End the chain for ``reason`` unless it already ended"""
+        if self.stop_reason is None:
+            self.stop_reason = reason
+        return None
@@ -0,0 +1,77 @@
+# utils/prefetch.py
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.settings import PREFETCH_DEPTH
+
+_END = object()
+
+
+class CursorPrefetcher:
+    """
+    Read-ahead iterator over cursor-paginated pages.
+
+    A background task requests page k+1 as soon as the bottom cursor of page
+    k is known, while the caller is still processing page k. At most
+    ``depth`` fetched pages wait unconsumed, which bounds memory. With
+    ``depth=0`` pages are fetched one at a time on demand, as before.
+
+    Iteration yields ``(page_number, response)`` and stops after the page
+    with no next cursor, after ``max_pages`` pages, or after a falsy
+    response, which is still yielded so the caller can report it.
+    Leaving the loop early cancels the outstanding request.
+    """
+
+    def __init__(self, fetch_page: Callable[[Optional[str]], Awaitable[Optional[Dict]]],
+                 next_cursor: Callable[[Dict], Optional[str]], max_pages: int,
+                 depth: int = PREFETCH_DEPTH, first_cursor: Optional[str] = None):
+        self.fetch_page = fetch_page
+        self.next_cursor = next_cursor
+        self.max_pages = max_pages
+        self.depth = max(0, depth)
+        self.first_cursor = first_cursor
+
+    async def _pages(self) -> AsyncIterator[Tuple[int, Any]]:
+        """Fetch pages in order, stopping at the end of the cursor chain"""
+        cursor = self.first_cursor
+        for page in range(self.max_pages):
+            if page > 0 and not cursor:
+                return
+            response = await self.fetch_page(cursor)
+            if not response:
+                yield page, response
+                return
+            cursor = self.next_cursor(response)
+            yield page, response
+
+    async def _produce(self, queue: asyncio.Queue) -> None:
+        try:
+            async for item in self._pages():
+                await queue.put(item)
+        except Exception as e:
+            # Hand the error to the consumer, which re-raises it in order
+            await queue.put(e)
+            return
+        await queue.put(_END)
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[int, Any]]:
+        if self.depth == 0:
+            async for item in self._pages():
+                yield item
+            return
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.depth)
+        producer = asyncio.create_task(self._produce(queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
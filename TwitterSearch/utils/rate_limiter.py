@@ -2,56 +2,114 @@
 
 import asyncio
 import time
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 
-class RateLimiter:
-    def __init__(self, calls_per_second: int = 10):
-        self.calls_per_second = calls_per_second
-        self.last_reset = time.time()
-        self.calls = 0
+class TokenBucket:
+    """
+    Token bucket that refills at ``rate`` tokens per second up to ``burst``.
+
+    Each caller reserves its token under the lock and then sleeps outside of
+    it, so waiters are served in arrival (FIFO) order without blocking each
+    other while they wait. The bucket may go negative: that is the backlog
+    of reservations already handed out.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
         self._lock = asyncio.Lock()
-    async def acquire(self):
-        """Control the rate of API calls"""
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available_tokens(self) -> float:
+        """Tokens available right now (negative while reservations are queued)"""
+        self._refill(time.monotonic())
+        return self._tokens
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate without losing tokens accrued so far"""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._refill(time.monotonic())
+        self.rate = rate
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """Take ``tokens`` tokens, waiting if needed. Returns the time waited."""
         async with self._lock:
-            current_time = time.time()
-            if current_time - self.last_reset >= 1:
-                self.calls = 0
-                self.last_reset = current_time
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
 
-            if self.calls >= self.calls_per_second:
-                wait_time = 1 - (current_time - self.last_reset)
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                self.calls = 0
-                self.last_reset = time.time()
+        if wait_time > 0:
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # Hand the reservation back so later waiters are not delayed
+                self._tokens += tokens
+                raise
 
-            self.calls += 1
+        self.acquired += 1
+        self.total_wait += wait_time
+        self.max_wait = max(self.max_wait, wait_time)
+        return wait_time
 
-# utils/decorators.py
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "total_wait": round(self.total_wait, 3),
+            "avg_wait": round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+            "max_wait": round(self.max_wait, 3)
+        }
 
-import asyncio
-import random
-from functools import wraps
-from typing import TypeVar, Callable, Any
-
-T = TypeVar('T')
-
-def retry_with_backoff(retries: int = 3, backoff_in_seconds: int = 1):
-    """Retry decorator with exponential backoff"""
-    def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> T:
-            retry_count = 0
-            while True:
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    if retry_count == retries:
-                        raise e
-                    wait_time = (backoff_in_seconds * (2 ** retry_count)) + random.uniform(0, 1)
-                    print(f"Attempt {retry_count + 1} failed. Retrying in {wait_time:.2f} seconds...")
-                    await asyncio.sleep(wait_time)
-                    retry_count += 1
-        return wrapper
-    return decorator
\ No newline at end of file
+
+class RateLimiter:
+    """
+    Shared token bucket plus optional per-endpoint buckets.
+
+    ``calls_per_second``/``burst`` bound the total request rate (the account
+    quota); ``endpoint_limits`` maps an endpoint name such as "search",
+    "comments" or "user" to its own ``(calls_per_second, burst)``.
+    """
+
+    def __init__(self, calls_per_second: float = 10, burst: Optional[int] = None,
+                 endpoint_limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.calls_per_second = calls_per_second
+        self.burst = burst or max(1, int(calls_per_second))
+        self._shared = TokenBucket(calls_per_second, self.burst)
+        self._buckets = {
+            endpoint: TokenBucket(rate, endpoint_burst)
+            for endpoint, (rate, endpoint_burst) in (endpoint_limits or {}).items()
+        }
+
+    def set_rate(self, calls_per_second: float) -> None:
+        """Change the shared request rate"""
+        self.calls_per_second = calls_per_second
+        self._shared.set_rate(calls_per_second)
+
+    async def acquire(self, endpoint: str = "default") -> float:
+        """Control the rate of API calls. Returns the time spent waiting."""
+        wait_time = 0.0
+        bucket = self._buckets.get(endpoint)
+        if bucket is not None:
+            wait_time += await bucket.acquire()
+        wait_time += await self._shared.acquire()
+        return wait_time
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Wait-time statistics for the shared bucket and every endpoint"""
+        stats = {"shared": self._shared.stats()}
+        for endpoint, bucket in self._buckets.items():
+            stats[endpoint] = bucket.stats()
+        return stats
@@ -0,0 +1,55 @@
+# utils/session_manager.py
+
+from typing import Optional
+
+import aiohttp
+
+from config.settings import (
+    HTTP_CONNECTION_LIMIT, HTTP_CONNECTIONS_PER_HOST, HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+)
+
+
+class SessionManager:
+    """
+    Owns one pooled aiohttp session for the lifetime of a crawler.
+
+    Connections are kept alive and reused across requests, and DNS answers
+    are cached, so TCP/TLS handshakes and lookups are paid once per
+    connection instead of once per request.
+    """
+
+    def __init__(self, limit: int = HTTP_CONNECTION_LIMIT, limit_per_host: int = HTTP_CONNECTIONS_PER_HOST,
+                 keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT, dns_cache_ttl: int = HTTP_DNS_CACHE_TTL,
+                 connect_timeout: float = HTTP_CONNECT_TIMEOUT, read_timeout: float = HTTP_READ_TIMEOUT):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and every pooled connection"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "SessionManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
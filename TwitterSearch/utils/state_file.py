@@ -0,0 +1,41 @@
+# utils/state_file.py
+
+import json
+import os
+from typing import Any, Callable, Optional
+
+
+def load_json_state(filepath: str, default: Any = None) -> Any:
+    """Read a JSON state file, returning ``default`` if it is missing or corrupt"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error reading {filepath}: {e}. Starting fresh.")
+        return default
+
+
+def save_json_state(filepath: str, data: Any, encoder_default: Optional[Callable[[Any], Any]] = None) -> bool:
+    """
+    Write a JSON state file atomically (temp file + fsync + replace)
+    ``encoder_default`` is passed to json.dump as ``default``.
+    Returns True if successful, False otherwise
+    """
+    directory = os.path.dirname(filepath)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    temp_file = f"{filepath}.tmp"
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=encoder_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, filepath)
+        return True
+    except Exception as e:
+        print(f"Error writing to {filepath}: {e}")
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        return False
@@ -0,0 +1,96 @@
+# utils/text_normalizer.py
+
+import html
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List
+
+from config.settings import TEXT_CACHE_SIZE
+
+_RETWEET_RE = re.compile(r'RT @\w+:')
+# "@name" -> "name" and "#tag" -> "tag": dropping the marker in front of a word
+# character is the same substitution without a capture group
+_MENTION_MARK_RE = re.compile(r'@(?=\w)')
+_HASHTAG_MARK_RE = re.compile(r'#(?=\w)')
+_URL_RE = re.compile(r'https?://\S+')
+_TCO_RE = re.compile(r'https://t\.co/\S+')
+
+# Zero-width and invisible characters. A precompiled character class is used
+# rather than str.translate, which is slow on non-ASCII text.
+_INVISIBLE_RE = re.compile(r'[\u200b-\u200f\u2028-\u202f\u205f-\u206f]')
+
+
+def _clean_tweet(text: Any) -> str:
+    """Clean text while preserving non-English characters"""
+    if not isinstance(text, str):
+        return ""
+    text = html.unescape(text)
+    # Each pattern only runs if the text can contain a match; the order is unchanged
+    if 'RT @' in text:
+        text = _RETWEET_RE.sub('', text)  # Remove retweet markers
+    if '@' in text:
+        text = _MENTION_MARK_RE.sub('', text)  # Remove '@' but keep the username
+    if 'http' in text:
+        text = _URL_RE.sub('', text)  # Remove URLs
+    if '#' in text:
+        text = _HASHTAG_MARK_RE.sub('', text)  # Remove '#' but keep the word
+    if not text.isascii():
+        text = _INVISIBLE_RE.sub('', text)
+    # re.sub(r'\s+', ' ', text).strip(): \s and str.isspace() match the same characters
+    return ' '.join(text.split())
+
+
+def _normalize(text: Any) -> str:
+    """Normalize text while preserving non-English characters"""
+    if not isinstance(text, str):
+        return ""
+    text = html.unescape(text)
+    if 'https://t.co/' in text:
+        text = _TCO_RE.sub('', text)
+    return ' '.join(text.split())
+
+
+# Profile name -> cleaning function. Each profile reproduces one of the
+# cleaners the scrapers used before exactly; see ScrapingUtils.
+PROFILES: Dict[str, Callable[[Any], str]] = {
+    "tweet": _clean_tweet,
+    "normalize": _normalize,
+}
+
+
+class TextNormalizer:
+    """
+    Text cleaner for one profile with a bounded LRU cache, so texts that
+    repeat (spam replies, retweets of the same tweet) are cleaned once.
+    """
+
+    def __init__(self, profile: str, cache_size: int = TEXT_CACHE_SIZE):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown text profile: {profile}")
+        self.profile = profile
+        self._clean = PROFILES[profile]
+        self._cached = lru_cache(maxsize=cache_size)(self._clean) if cache_size else self._clean
+
+    def clean(self, text: Any) -> str:
+        # Only strings are cached; anything else goes straight to the cleaner
+        if isinstance(text, str):
+            return self._cached(text)
+        return self._clean(text)
+
+    def clean_many(self, texts: Iterable[Any]) -> List[str]:
+        clean = self.clean
+        return [clean(text) for text in texts]
+
+    def cache_info(self):
+        return self._cached.cache_info() if hasattr(self._cached, "cache_info") else None
+
+
+_normalizers: Dict[str, TextNormalizer] = {}
+
+
+def get_normalizer(profile: str) -> TextNormalizer:
+    """Shared normalizer (and cache) for ``profile``"""
+    normalizer = _normalizers.get(profile)
+    if normalizer is None:
+        normalizer = _normalizers[profile] = TextNormalizer(profile)
+    return normalizer
@@ -0,0 +1,66 @@
+# utils/timestamps.py
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+TWITTER_TIME_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+OUTPUT_TIME_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+_WEEKDAYS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+# Month abbreviation -> (number, zero-padded number)
+_MONTHS = {name: (number, f"{number:02d}") for number, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)}
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class ParsedTimestamp(NamedTuple):
+    epoch: int  # seconds since 1970-01-01 UTC
+    formatted: str  # OUTPUT_TIME_FORMAT in the timestamp's own UTC offset
+
+
+def _slice_created_at(value: str) -> Optional[ParsedTimestamp]:
+    """
+    Parse Twitter's fixed-width ``created_at`` layout by position:
+
+        Tue Aug 06 02:54:02 +0000 2024
+        0   4   8  11 14 17 20    26
+
+    Returns None for anything that does not have exactly this layout.
+    """
+    if (len(value) != 30 or value[3] != " " or value[7] != " " or value[10] != " " or value[13] != ":"
+            or value[16] != ":" or value[19] != " " or value[25] != " " or value[20] not in "+-"):
+        return None
+    month = _MONTHS.get(value[4:7])
+    if month is None or value[0:3] not in _WEEKDAYS:
+        return None
+    day, clock, zone, year = value[8:10], value[11:19], value[20:25], value[26:30]
+    digits = day + clock[0:2] + clock[3:5] + clock[6:8] + zone[1:] + year
+    if (not (digits.isascii() and digits.isdigit()) or clock > "23:59:59" or clock[3] > "5" or clock[6] > "5"
+            or zone[1:3] > "23" or zone[3] > "5" or year < "1000"):
+        return None
+
+    # date() rejects days outside the month, as strptime does
+    days = date(int(year), month[0], int(day)).toordinal() - _EPOCH_ORDINAL
+    hms = int(digits[2:8])
+    offset = int(zone[1:3]) * 3600 + int(zone[3:5]) * 60
+    if zone[0] == "-":
+        offset = -offset
+    epoch = days * 86400 + (hms // 10000) * 3600 + (hms // 100 % 100) * 60 + hms % 100 - offset
+    return ParsedTimestamp(epoch, f"{day}-{month[1]}-{year} {clock}")
+
+
+@lru_cache(maxsize=4096)
+def parse_twitter_timestamp(value: str) -> ParsedTimestamp:
+    """
+    Parse a Twitter ``created_at`` string such as 'Tue Aug 06 02:54:02 +0000 2024'.
+
+    The fixed layout is sliced directly; other spellings that strptime
+    accepts go through strptime. Tweets posted in the same second share a
+    timestamp, so results are cached. Raises ValueError for invalid input.
+    """
+    parsed = _slice_created_at(value)
+    if parsed is not None:
+        return parsed
+    dt = datetime.strptime(value, TWITTER_TIME_FORMAT)
+    return ParsedTimestamp(int(dt.timestamp()), dt.strftime(OUTPUT_TIME_FORMAT))